@@ -0,0 +1,172 @@
+import queue
+import threading
+import tkinter as tk
+
+
+class TaskCancelled(Exception):
+    """Завдання було скасоване до завершення"""
+
+
+class LoadTask:
+    """
+    Завдання фонового завантаження.
+    Робочий потік повідомляє про прогрес через report_progress() і може
+    перевіряти скасування через check_cancelled().
+    """
+
+    def __init__(self, loader, func, args, kwargs, on_done, on_error, on_progress, name=None):
+        self.loader = loader
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.on_done = on_done
+        self.on_error = on_error
+        self.on_progress = on_progress
+        self.name = name or getattr(func, '__name__', 'task')
+        self._cancel_event = threading.Event()
+        self.finished = False
+
+    @property
+    def cancelled(self):
+        return self._cancel_event.is_set()
+
+    def cancel(self):
+        """Скасування завдання (результат не буде доставлено)"""
+        self._cancel_event.set()
+
+    def check_cancelled(self):
+        """Перевірка скасування з робочого потоку"""
+        if self.cancelled:
+            raise TaskCancelled(self.name)
+
+    def report_progress(self, message, value=None):
+        """Повідомлення про прогрес з робочого потоку"""
+        if not self.cancelled:
+            self.loader._results.put((self, 'progress', (message, value)))
+
+
+class BackgroundLoader:
+    """
+    Виконання запитів DatabaseManager у робочому потоці.
+
+    Завдання виконуються по черзі в одному потоці (підключення до бази даних
+    спільне), а результати, помилки та прогрес повертаються в потік Tk через
+    чергу, яку віджет опитує за допомогою after(). Таким чином всі обробники
+    on_done/on_error/on_progress викликаються тільки в головному потоці.
+    """
+
+    def __init__(self, widget, poll_interval=50):
+        self.widget = widget
+        self.poll_interval = poll_interval
+        self._jobs = queue.Queue()
+        self._results = queue.Queue()
+        self._pending = set()
+        self._poll_id = None
+        self._worker = None
+        self._closed = False
+
+    def submit(self, func, *args, on_done=None, on_error=None, on_progress=None,
+               pass_task=False, name=None, **kwargs):
+        """
+        Запуск функції у фоновому потоці.
+
+        Args:
+            func: Функція, що виконується у робочому потоці (без звернень до Tk)
+            on_done: Обробник результату (викликається в потоці Tk)
+            on_error: Обробник винятку (викликається в потоці Tk)
+            on_progress: Обробник прогресу (message, value) (в потоці Tk)
+            pass_task: Передати об'єкт LoadTask у функцію як аргумент task
+
+        Returns:
+            LoadTask: Завдання, яке можна скасувати
+        """
+        task = LoadTask(self, func, args, kwargs, on_done, on_error, on_progress, name)
+        if pass_task:
+            task.kwargs = dict(kwargs, task=task)
+        self._pending.add(task)
+        self._ensure_worker()
+        self._jobs.put(task)
+        self._schedule_poll()
+        return task
+
+    def cancel_all(self):
+        """Скасування всіх незавершених завдань"""
+        for task in list(self._pending):
+            task.cancel()
+
+    def close(self):
+        """Зупинка робочого потоку (наприклад, при закритті вікна)"""
+        self.cancel_all()
+        self._closed = True
+        self._jobs.put(None)
+        if self._poll_id is not None:
+            try:
+                self.widget.after_cancel(self._poll_id)
+            except tk.TclError:
+                pass
+            self._poll_id = None
+
+    @property
+    def busy(self):
+        return bool(self._pending)
+
+    def _ensure_worker(self):
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(target=self._run, name="BackgroundLoader", daemon=True)
+            self._worker.start()
+
+    def _run(self):
+        while True:
+            task = self._jobs.get()
+            if task is None:
+                return
+            if task.cancelled:
+                self._results.put((task, 'cancelled', None))
+                continue
+            try:
+                result = task.func(*task.args, **task.kwargs)
+                self._results.put((task, 'done', result))
+            except TaskCancelled:
+                self._results.put((task, 'cancelled', None))
+            except Exception as e:
+                print(f"Помилка фонового завдання {task.name}: {e}")
+                self._results.put((task, 'error', e))
+
+    def _schedule_poll(self):
+        if self._poll_id is None and not self._closed:
+            try:
+                self._poll_id = self.widget.after(self.poll_interval, self._poll)
+            except tk.TclError:
+                # Віджет вже знищено
+                self._poll_id = None
+
+    def _poll(self):
+        self._poll_id = None
+        while True:
+            try:
+                task, kind, payload = self._results.get_nowait()
+            except queue.Empty:
+                break
+            self._dispatch(task, kind, payload)
+
+        if self._pending:
+            self._schedule_poll()
+
+    def _dispatch(self, task, kind, payload):
+        if kind == 'progress':
+            if task.on_progress and not task.cancelled:
+                task.on_progress(*payload)
+            return
+
+        task.finished = True
+        self._pending.discard(task)
+        if task.cancelled or kind == 'cancelled':
+            return
+
+        try:
+            if kind == 'done' and task.on_done:
+                task.on_done(payload)
+            elif kind == 'error' and task.on_error:
+                task.on_error(payload)
+        except Exception as e:
+            print(f"Помилка в обробнику завдання {task.name}: {e}")
@@ -0,0 +1,327 @@
+"""
+Пакетне формування бланків замін з файлу JSON або CSV.
+
+Бланки зберігаються в ту саму структуру папок, що й з форми замін:
+Zaminy/<навчальний рік>/<NN-Місяць>/<день місяць>.docx. Довідкові дані
+завантажуються з бази один раз для всього пакета.
+
+З --workers N бланки формуються паралельно в N процесах: довідкові дані
+передаються кожному процесу один раз при запуску, шляхи до файлів
+визначаються заздалегідь, а звіт збирається в порядку днів вхідного файлу.
+
+Запуск з командного рядка:
+    python batch_generate.py days.json [--output Zaminy] [--year 2025-2026] [--db dataBase.mdb] [--workers 4]
+
+JSON - список днів або об'єкт {"academic_year": "2025-2026", "days": [...]}:
+    {"date": "2025-10-14", "week_type": "чисельником",
+     "duty_group": "31-Е", "duty_teacher": "...", "dorm_teacher": "...",
+     "replacements": [{"group": "11-Е", "lesson": "1", "discipline": "...", "audience": "5"}]}
+
+CSV - один рядок на заміну (поля дня беруться з першого рядка дати):
+    date;week_type;duty_group;duty_teacher;dorm_teacher;group;lesson;discipline;audience
+"""
+import argparse
+import csv
+import datetime
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from document_engine import (DocumentEngine, ReplacementDay, academic_year_for, default_base_date,
+                             format_date_text, output_path, parse_date_from_text, weekday_name)
+
+# Поля дня та заміни у вхідному файлі
+DAY_FIELDS = ("date", "weekday", "week_type", "duty_group", "duty_teacher", "dorm_teacher",
+              "edu_practice", "practice_type", "practice_info", "base_date")
+REPLACEMENT_FIELDS = ("group", "lesson", "discipline", "audience")
+
+DATE_FORMATS = ("%Y-%m-%d", "%d.%m.%Y")
+
+
+class BatchInputError(ValueError):
+    """Помилка у вхідному файлі пакетного формування"""
+
+
+class InvalidDay:
+    """
+    Запис вхідного файлу, з якого не вдалося сформувати день.
+    Потрапляє до звіту як помилка, не зупиняючи формування інших днів.
+    """
+
+    def __init__(self, date_text, error):
+        """
+        Args:
+            date_text (str): Дата з запису (як у файлі) або номер запису
+            error (str): Опис помилки
+        """
+        self.date_text = date_text
+        self.error = error
+
+
+def parse_date(value):
+    """Дата з рядка "2025-10-14", "14.10.2025" або "14 жовтня 2025 року\""""
+    if isinstance(value, datetime.date):
+        return value
+    value = str(value or "").strip()
+    for date_format in DATE_FORMATS:
+        try:
+            return datetime.datetime.strptime(value, date_format).date()
+        except ValueError:
+            continue
+    return parse_date_from_text(value)
+
+
+def day_from_record(record):
+    """
+    ReplacementDay з запису вхідного файлу.
+    Текст дати та день тижня формуються так само, як у головній формі.
+    """
+    date = parse_date(record.get("date") or record.get("date_text"))
+    if date is None:
+        raise BatchInputError(f"не вдалося розібрати дату {record.get('date') or record.get('date_text')!r}")
+    week_type = str(record.get("week_type") or "").strip()
+    if not week_type:
+        raise BatchInputError(f"не вказано тип тижня для {format_date_text(date)}")
+
+    weekday = str(record.get("weekday") or "").strip() or weekday_name(date)
+    base_date = parse_date(record["base_date"]) if record.get("base_date") else None
+    if base_date is None and weekday.lower() == "субота":
+        # Як у формі замін: цикл суботніх пар від першого понеділка вересня
+        base_date = default_base_date(date)
+
+    replacements = []
+    for replacement in record.get("replacements") or []:
+        values = {field: str(replacement.get(field) or "").strip() for field in REPLACEMENT_FIELDS}
+        if not values["group"] or not values["lesson"]:
+            raise BatchInputError(f"заміна без групи або номера пари для {format_date_text(date)}")
+        replacements.append(values)
+
+    return ReplacementDay(
+        date_text=format_date_text(date),
+        weekday=weekday,
+        week_type=week_type,
+        duty_group=str(record.get("duty_group") or ""),
+        duty_teacher=str(record.get("duty_teacher") or ""),
+        dorm_teacher=str(record.get("dorm_teacher") or ""),
+        replacements=replacements,
+        edu_practice=str(record.get("edu_practice") or ""),
+        practice_type=str(record.get("practice_type") or "Виробнича"),
+        practice_info=str(record.get("practice_info") or ""),
+        base_date=base_date
+    )
+
+
+def read_json(path):
+    """Записи днів та навчальний рік (якщо вказано) з файлу JSON"""
+    with open(path, "r", encoding="utf-8-sig") as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        return data.get("days") or [], data.get("academic_year")
+    return data, None
+
+
+def read_csv(path):
+    """Записи днів з файлу CSV: рядки однієї дати об'єднуються в один день"""
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        text = f.read()
+    try:
+        dialect = csv.Sniffer().sniff(text[:4096], delimiters=";,\t")
+    except csv.Error:
+        dialect = "excel"
+
+    days = {}
+    for row in csv.DictReader(text.splitlines(), dialect=dialect):
+        row = {str(key).strip().lower(): (value or "").strip() for key, value in row.items() if key}
+        if not any(row.values()):
+            continue
+        record = days.get(row.get("date"))
+        if record is None:
+            record = {field: row.get(field, "") for field in DAY_FIELDS}
+            record["replacements"] = []
+            days[row.get("date")] = record
+        if row.get("group"):
+            record["replacements"].append({field: row.get(field, "") for field in REPLACEMENT_FIELDS})
+    return list(days.values()), None
+
+
+def day_or_error(record, number):
+    """ReplacementDay з запису або InvalidDay, якщо запис містить помилку"""
+    if not isinstance(record, dict):
+        return InvalidDay(f"запис №{number}", "запис не є об'єктом дня")
+    try:
+        return day_from_record(record)
+    except (ValueError, TypeError, AttributeError) as e:
+        return InvalidDay(str(record.get("date") or record.get("date_text") or f"запис №{number}"), str(e))
+
+
+def load_days(path):
+    """
+    Дні з файлу JSON або CSV. Помилковий запис не зупиняє читання інших:
+    замість дня він повертається як InvalidDay.
+
+    Returns:
+        tuple: (список ReplacementDay та InvalidDay в порядку файлу,
+                навчальний рік з файлу або None)
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".json":
+        records, academic_year = read_json(path)
+    elif extension == ".csv":
+        records, academic_year = read_csv(path)
+    else:
+        raise BatchInputError(f"непідтримуваний формат файлу {extension or path}")
+    return [day_or_error(record, number) for number, record in enumerate(records, 1)], academic_year
+
+
+def day_output_path(day, replacements_dir, academic_year=None):
+    """Шлях до бланку дня; навчальний рік за замовчуванням визначається за датою"""
+    if not academic_year:
+        academic_year = academic_year_for(parse_date_from_text(day.date_text))
+    return output_path(replacements_dir, academic_year, day.date_text)
+
+
+def plan_outputs(days, replacements_dir, academic_year=None):
+    """
+    Шляхи до бланків всіх днів, визначені до формування.
+    Повторна дата не перезаписує вже сформований бланк, а стає помилкою,
+    тож результат не залежить від порядку завершення процесів. Помилкові
+    записи вхідного файлу (InvalidDay) одразу стають помилками звіту.
+
+    Returns:
+        list: Результати {"date_text", "path", "status", "error"} в порядку днів
+    """
+    report = []
+    planned = set()
+    for day in days:
+        result = {"date_text": day.date_text, "path": None, "status": "ok", "error": None}
+        if isinstance(day, InvalidDay):
+            result["status"] = "error"
+            result["error"] = day.error
+            report.append(result)
+            continue
+        try:
+            path = day_output_path(day, replacements_dir, academic_year)
+            if os.path.normcase(path) in planned:
+                raise BatchInputError(f"дата повторюється у файлі ({os.path.basename(path)})")
+            planned.add(os.path.normcase(path))
+            result["path"] = path
+        except Exception as e:
+            result["status"] = "error"
+            result["error"] = str(e)
+        report.append(result)
+    return report
+
+
+# Рушій процесу-виконавця: передається один раз при запуску процесу
+_worker_engine = None
+
+
+def _init_worker(engine):
+    global _worker_engine
+    _worker_engine = engine
+
+
+def _save_in_worker(day, path):
+    _worker_engine.save(day, path)
+    return path
+
+
+def generate_days(days, engine, replacements_dir, academic_year=None, workers=1):
+    """
+    Формування та збереження бланків для всіх днів.
+    Помилка одного дня не зупиняє інші.
+
+    Args:
+        workers (int): Кількість процесів (1 - формування в поточному процесі)
+
+    Returns:
+        list: Результати {"date_text", "path", "status" ("ok"/"error"), "error", "unknown_groups"}
+              в порядку днів
+    """
+    report = plan_outputs(days, replacements_dir, academic_year)
+    for day, result in zip(days, report):
+        result["unknown_groups"] = [] if isinstance(day, InvalidDay) else engine.unknown_groups(day)
+    pending = [(day, result) for day, result in zip(days, report) if result["status"] == "ok"]
+
+    if workers <= 1 or len(pending) <= 1:
+        for day, result in pending:
+            try:
+                engine.save(day, result["path"])
+            except Exception as e:
+                result["status"] = "error"
+                result["error"] = str(e)
+        return report
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(pending)),
+                             initializer=_init_worker, initargs=(engine,)) as executor:
+        futures = [(executor.submit(_save_in_worker, day, result["path"]), result) for day, result in pending]
+        for future, result in futures:
+            try:
+                future.result()
+            except Exception as e:
+                result["status"] = "error"
+                result["error"] = str(e)
+    return report
+
+
+def print_report(report):
+    for result in report:
+        if result["status"] == "ok":
+            print(f"{result['date_text']:24} збережено: {result['path']}")
+        else:
+            print(f"{result['date_text']:24} помилка: {result['error']}")
+        if result["unknown_groups"]:
+            print(f"{'':24} групи без відділення (не потрапили до бланку): {', '.join(result['unknown_groups'])}")
+    errors = sum(1 for result in report if result["status"] != "ok")
+    print(f"Сформовано бланків: {len(report) - errors}, помилок: {errors}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Пакетне формування бланків замін з файлу JSON або CSV")
+    parser.add_argument("input", help="Файл з днями замін (.json або .csv)")
+    parser.add_argument("--output", help="Папка замін (за замовчуванням Zaminy поруч з програмою)")
+    parser.add_argument("--year", help="Навчальний рік, наприклад 2025-2026 (за замовчуванням - за датою)")
+    parser.add_argument("--db", help="Шлях до бази даних (за замовчуванням dataBase.mdb)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Кількість процесів для паралельного формування (0 - за кількістю ядер)")
+    args = parser.parse_args(argv)
+
+    try:
+        days, file_year = load_days(args.input)
+    except (OSError, ValueError) as e:
+        print(f"Помилка читання файлу {args.input}: {e}")
+        return 2
+
+    # DatabaseManager імпортується тільки тут: решта модуля працює без бази та Tk
+    from db_backends import create_backend
+    from db_manager import DatabaseManager
+    # Без бази даних бланки не формуються: тестові дані DatabaseManager для них не підходять
+    try:
+        backend = create_backend(args.db) if args.db else DatabaseManager.create_default_backend()
+    except ValueError as e:
+        print(f"Помилка бази даних: {e}")
+        return 2
+    if not backend.exists() and not any(os.path.exists(path) for path in backend.candidate_paths()):
+        print(f"Файл бази даних не знайдено: {backend.db_path}")
+        return 2
+    
+    # Повідомлення DatabaseManager виводяться в консоль, а не у вікнах Tk
+    DatabaseManager.interactive = False
+    db = DatabaseManager(backend)
+    if not db.is_connected():
+        print(f"Не вдалося підключитися до бази даних {db.db_path}, бланки не сформовано")
+        return 2
+    engine = DocumentEngine.from_reference(db.load_reference_bundle())
+
+    replacements_dir = args.output or os.path.join(DatabaseManager.get_application_path(), "Zaminy")
+    workers = args.workers if args.workers > 0 else (os.cpu_count() or 1)
+    report = generate_days(days, engine, replacements_dir, args.year or file_year, workers)
+    print_report(report)
+    return 1 if any(result["status"] != "ok" for result in report) else 0
+
+
+if __name__ == "__main__":
+    # Потрібно для процесів-виконавців у зібраному EXE
+    multiprocessing.freeze_support()
+    raise SystemExit(main())
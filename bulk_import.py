@@ -0,0 +1,292 @@
+"""
+Масовий імпорт записів довідника з файлу CSV або XLSX.
+
+Файл спочатку повністю читається та перевіряється (порожні назви, повтори,
+вже наявні записи, невідомі відділення груп), і тільки потім всі нові
+записи додаються одним executemany в одній транзакції. Кеш скидається один
+раз після імпорту, а не після кожного запису.
+
+XLSX читається стандартними zipfile та ElementTree, без додаткових бібліотек.
+"""
+import csv
+import os
+import posixpath
+import re
+import zipfile
+import xml.etree.ElementTree as ET
+
+from db_schema import COLUMN_MAPPINGS
+
+IMPORT_EXTENSIONS = (".csv", ".xlsx")
+
+# Заголовки колонок файлу (без урахування регістру)
+NAME_HEADERS = ("назва", "name", "піб", "pib", "прізвище", "викладач", "дисципліна",
+                "група", "аудиторія", "номер", "number")
+DEPARTMENT_HEADERS = ("відділення", "department")
+
+# Колонка таблиці груп з ID відділення
+GROUP_DEPARTMENT_COLUMN = "Number Of Department"
+
+# Кількість помилок, що показуються користувачу
+MAX_REPORTED_ERRORS = 10
+
+_XLSX_NS = {
+    "main": "http://schemas.openxmlformats.org/spreadsheetml/2006/main",
+    "rel": "http://schemas.openxmlformats.org/package/2006/relationships",
+}
+_DOC_REL_ID = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}id"
+_CELL_COLUMN_RE = re.compile(r"[A-Z]+")
+
+
+class ImportFileError(ValueError):
+    """Файл не вдалося прочитати як таблицю"""
+
+
+class _SemicolonDialect(csv.excel):
+    # Excel з українською локаллю зберігає CSV з роздільником ;
+    delimiter = ";"
+
+
+def read_csv(path):
+    """Рядки файлу CSV (роздільник ; , або табуляція визначається автоматично)"""
+    for encoding in ("utf-8-sig", "cp1251"):
+        try:
+            with open(path, "r", encoding=encoding, newline="") as f:
+                text = f.read()
+            break
+        except UnicodeDecodeError:
+            continue
+    else:
+        raise ImportFileError("невідоме кодування файлу (очікується UTF-8 або Windows-1251)")
+
+    try:
+        dialect = csv.Sniffer().sniff(text[:4096], delimiters=";,\t")
+    except csv.Error:
+        dialect = _SemicolonDialect
+    return [row for row in csv.reader(text.splitlines(), dialect)]
+
+
+def _column_index(cell_ref):
+    """Номер колонки (з 0) за адресою клітинки, наприклад "C12" -> 2"""
+    match = _CELL_COLUMN_RE.match(cell_ref or "")
+    if not match:
+        return None
+    index = 0
+    for ch in match.group():
+        index = index * 26 + ord(ch) - ord("A") + 1
+    return index - 1
+
+
+def _first_sheet_path(archive):
+    """Шлях до першого аркуша книги в архіві XLSX"""
+    try:
+        workbook = ET.fromstring(archive.read("xl/workbook.xml"))
+        rels = ET.fromstring(archive.read("xl/_rels/workbook.xml.rels"))
+        sheet = workbook.find("main:sheets/main:sheet", _XLSX_NS)
+        targets = {rel.get("Id"): rel.get("Target") for rel in rels.findall("rel:Relationship", _XLSX_NS)}
+        target = targets[sheet.get(_DOC_REL_ID)]
+        if target.startswith("/"):
+            return target.lstrip("/")
+        return posixpath.normpath(posixpath.join("xl", target))
+    except (KeyError, AttributeError, ET.ParseError):
+        return "xl/worksheets/sheet1.xml"
+
+
+def _shared_strings(archive):
+    try:
+        root = ET.fromstring(archive.read("xl/sharedStrings.xml"))
+    except KeyError:
+        return []
+    # Рядок може складатися з кількох фрагментів з різним форматуванням
+    return ["".join(node.text or "" for node in item.iter(f"{{{_XLSX_NS['main']}}}t"))
+            for item in root.findall("main:si", _XLSX_NS)]
+
+
+def read_xlsx(path):
+    """Рядки першого аркуша файлу XLSX (значення клітинок як текст)"""
+    try:
+        with zipfile.ZipFile(path) as archive:
+            strings = _shared_strings(archive)
+            sheet = ET.fromstring(archive.read(_first_sheet_path(archive)))
+    except (zipfile.BadZipFile, KeyError, ET.ParseError) as e:
+        raise ImportFileError(f"файл не є книгою Excel (XLSX): {e}")
+
+    rows = []
+    for row in sheet.iterfind("main:sheetData/main:row", _XLSX_NS):
+        values = []
+        for cell in row.findall("main:c", _XLSX_NS):
+            cell_type = cell.get("t")
+            if cell_type == "inlineStr":
+                value = "".join(node.text or "" for node in cell.iter(f"{{{_XLSX_NS['main']}}}t"))
+            else:
+                value = cell.findtext("main:v", default="", namespaces=_XLSX_NS)
+                if cell_type == "s" and value:
+                    value = strings[int(value)]
+                elif cell_type in (None, "n") and value.endswith(".0"):
+                    # Номери аудиторій тощо зберігаються як числа
+                    value = value[:-2]
+
+            index = _column_index(cell.get("r"))
+            if index is None:
+                index = len(values)
+            values.extend([""] * (index + 1 - len(values)))
+            values[index] = value
+        rows.append(values)
+    return rows
+
+
+def read_table(path):
+    """Рядки файлу CSV або XLSX"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".csv":
+        return read_csv(path)
+    if extension == ".xlsx":
+        return read_xlsx(path)
+    raise ImportFileError(f"непідтримуваний формат файлу {extension or path}")
+
+
+def _find_column(header, names):
+    for index, cell in enumerate(header):
+        if cell in names:
+            return index
+    return None
+
+
+class ImportPlan:
+    """
+    Результат перевірки файлу: записи для додавання, пропущені рядки та помилки.
+    Номери рядків відповідають рядкам файлу (з 1).
+    """
+
+    def __init__(self, entity, path):
+        self.entity = entity
+        self.path = path
+        self.records = []
+        self.skipped = []
+        self.errors = []
+
+    @property
+    def is_valid(self):
+        return not self.errors
+
+    def summary(self):
+        """Текст для підтвердження імпорту користувачем"""
+        lines = [f"Файл: {os.path.basename(self.path)}",
+                 f"Нових записів: {len(self.records)}"]
+        if self.skipped:
+            lines.append(f"Пропущено (вже існують або повторюються): {len(self.skipped)}")
+        if self.errors:
+            lines.append(f"Помилок: {len(self.errors)}")
+            for line, message in self.errors[:MAX_REPORTED_ERRORS]:
+                lines.append(f"  рядок {line}: {message}")
+            if len(self.errors) > MAX_REPORTED_ERRORS:
+                lines.append(f"  ... та ще {len(self.errors) - MAX_REPORTED_ERRORS}")
+        return "\n".join(lines)
+
+
+def prepare_import(entity, rows, existing_names, departments=None, path=""):
+    """
+    Перевірка рядків файлу без звернення до бази даних.
+
+    Args:
+        entity (str): Довідник (department, groups, teachers, audiences, discipline)
+        rows (list): Рядки файлу; перший рядок може бути заголовком
+        existing_names (iterable): Назви, що вже є в таблиці
+        departments (dict): Назва відділення -> ID (потрібно для груп)
+        path (str): Шлях до файлу (для звіту)
+
+    Returns:
+        ImportPlan: records - кортежі значень для INSERT
+    """
+    plan = ImportPlan(entity, path)
+    seen = {str(name).strip().casefold() for name in existing_names if name}
+    departments = {str(name).strip().casefold(): dept_id for name, dept_id in (departments or {}).items()}
+
+    name_index, dept_index = 0, 1
+    first_line = 1
+    if rows:
+        header = [str(cell).strip().casefold() for cell in rows[0]]
+        found_name = _find_column(header, NAME_HEADERS)
+        found_dept = _find_column(header, DEPARTMENT_HEADERS)
+        if found_name is not None or found_dept is not None:
+            # Перший рядок - заголовок
+            name_index = found_name if found_name is not None else 0
+            dept_index = found_dept if found_dept is not None else (1 if name_index == 0 else 0)
+            first_line = 2
+
+    for line, row in enumerate(rows[first_line - 1:], first_line):
+        cells = [str(cell).strip() for cell in row]
+        if not any(cells):
+            continue
+        name = cells[name_index] if name_index < len(cells) else ""
+        if not name:
+            plan.errors.append((line, "порожня назва"))
+            continue
+
+        key = name.casefold()
+        if key in seen:
+            plan.skipped.append((line, name))
+            continue
+
+        if entity == "groups":
+            dept_name = cells[dept_index] if dept_index < len(cells) else ""
+            if not dept_name:
+                plan.errors.append((line, f"не вказано відділення групи {name}"))
+                continue
+            if dept_name.casefold() not in departments:
+                plan.errors.append((line, f"відділення \"{dept_name}\" не знайдено"))
+                continue
+            plan.records.append((name, departments[dept_name.casefold()]))
+        else:
+            plan.records.append((name,))
+        seen.add(key)
+
+    return plan
+
+
+def load_import(entity, path, db):
+    """
+    Читання та перевірка файлу (може виконуватися у фоновому потоці).
+    Наявні назви та відділення отримуються з бази одним запитом кожне.
+    """
+    rows = read_table(path)
+
+    existing = db.fetch_id_name_rows(entity)
+    if existing is None:
+        raise RuntimeError(f"не вдалося прочитати таблицю {entity}")
+
+    departments = None
+    if entity == "groups":
+        department_rows = db.fetch_id_name_rows("department")
+        if department_rows is None:
+            raise RuntimeError("не вдалося прочитати таблицю відділень")
+        departments = {name: dept_id for dept_id, name in department_rows if name}
+
+    return prepare_import(entity, rows, [name for _, name in existing], departments, path)
+
+
+def apply_import(plan, db):
+    """
+    Додавання записів плану одним executemany в одній транзакції та
+    одноразове скидання кешу таблиці.
+
+    Returns:
+        int: Кількість доданих записів
+    """
+    if not plan.is_valid:
+        raise ValueError("файл містить помилки, імпорт неможливий")
+    if not plan.records:
+        return 0
+
+    info = db.get_table_info(plan.entity) or COLUMN_MAPPINGS[plan.entity]
+    if plan.entity == "groups":
+        query = f"INSERT INTO [{info['table']}] ([{info['name']}], [{GROUP_DEPARTMENT_COLUMN}]) VALUES (?, ?)"
+    else:
+        query = f"INSERT INTO [{info['table']}] ([{info['name']}]) VALUES (?)"
+
+    with db.transaction() as cursor:
+        cursor.executemany(query, plan.records)
+
+    db.invalidate_table(plan.entity)
+    print(f"Імпортовано {len(plan.records)} записів у таблицю {info['table']}")
+    return len(plan.records)
@@ -0,0 +1,215 @@
+import hashlib
+import os
+import sqlite3
+
+# pyodbc потрібен лише для бази Access; на Linux-машинах без драйвера ODBC
+# програма може працювати з SQLite, тому імпорт не є обов'язковим.
+# Модуль завантажується при першому підключенні, а не під час запуску програми
+_pyodbc = None
+_pyodbc_loaded = False
+
+
+def load_pyodbc():
+    """Модуль pyodbc або None, якщо його не вдалося імпортувати"""
+    global _pyodbc, _pyodbc_loaded
+    if not _pyodbc_loaded:
+        try:
+            import pyodbc
+            _pyodbc = pyodbc
+        except ImportError:
+            _pyodbc = None
+        _pyodbc_loaded = True
+    return _pyodbc
+
+# Схема довідкових таблиць, спільна для Access та SQLite
+# (назви таблиць і колонок збігаються з dataBase.mdb)
+REFERENCE_SCHEMA = {
+    "department": [("ID", "INTEGER PRIMARY KEY"), ("Name", "TEXT")],
+    "groups": [("ID", "INTEGER PRIMARY KEY"), ("Name", "TEXT"), ("Number Of Department", "INTEGER")],
+    "teachers": [("ID", "INTEGER PRIMARY KEY"), ("PIB", "TEXT")],
+    "audiences": [("ID", "INTEGER PRIMARY KEY"), ("Number", "TEXT")],
+    "discpline": [("ID_discpline", "INTEGER PRIMARY KEY"), ("Name", "TEXT")],
+}
+
+# Розширення файлів для автоматичного вибору сховища
+ACCESS_EXTENSIONS = (".mdb", ".accdb")
+SQLITE_EXTENSIONS = (".sqlite", ".sqlite3", ".db")
+
+
+class DatabaseBackend:
+    """
+    Базовий інтерфейс сховища даних для DatabaseManager.
+    Кожна реалізація вміє відкрити підключення DB-API (cursor/commit/close)
+    до файлу бази даних та повідомити про помилку зрозумілою мовою.
+    """
+    name = "base"
+    default_filename = None
+    # Простий запит для перевірки, що підключення ще працює
+    health_query = "SELECT 1"
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+
+    def exists(self):
+        """Перевірка, чи існує файл бази даних"""
+        return os.path.exists(self.db_path)
+
+    def candidate_paths(self):
+        """Запасні шляхи, де може знаходитися файл бази даних"""
+        return []
+
+    def connect(self):
+        """Відкриття нового підключення до бази даних"""
+        raise NotImplementedError
+
+    def list_tables(self, conn):
+        """Отримання списку користувацьких таблиць"""
+        raise NotImplementedError
+
+    def limited_select(self, columns, clauses, limit):
+        """Запит SELECT, що повертає не більше limit рядків (синтаксис LIMIT)"""
+        return f"SELECT {columns} {clauses} LIMIT {int(limit)}"
+
+    def like_condition(self, column):
+        """Умова пошуку підрядка в колонці; параметр запиту - like_pattern(text)"""
+        return f"{column} LIKE ?"
+
+    def like_pattern(self, text):
+        """Шаблон LIKE для пошуку text в будь-якій частині значення"""
+        return f"%{text}%"
+
+    def describe_error(self, error):
+        """Текст повідомлення про помилку підключення для користувача"""
+        return f"Помилка підключення до бази даних: {error}"
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.db_path!r})"
+
+
+class AccessBackend(DatabaseBackend):
+    """Сховище Microsoft Access (.mdb/.accdb) через драйвер ODBC"""
+    name = "access"
+    default_filename = "dataBase.mdb"
+    driver = "Microsoft Access Driver (*.mdb, *.accdb)"
+
+    @property
+    def conn_str(self):
+        return f'DRIVER={{{self.driver}}};DBQ={self.db_path}'
+
+    def candidate_paths(self):
+        return [
+            os.path.join(os.path.dirname(self.db_path), "dataBase.accdb"),  # .accdb в тій же папці
+            os.path.abspath("dataBase.mdb"),  # В поточній папці
+            os.path.abspath("dataBase.accdb"),  # .accdb в поточній папці
+            os.path.join(os.path.expanduser("~"), "Desktop", "Crisco", "dataBase.mdb"),  # На робочому столі
+        ]
+
+    def connect(self):
+        pyodbc = load_pyodbc()
+        if pyodbc is None:
+            raise RuntimeError("Модуль pyodbc не встановлено")
+        return pyodbc.connect(self.conn_str)
+
+    def list_tables(self, conn):
+        cursor = conn.cursor()
+        tables = [row.table_name for row in cursor.tables(tableType="TABLE")]
+        cursor.close()
+        return tables
+
+    def limited_select(self, columns, clauses, limit):
+        # Access не підтримує LIMIT, кількість рядків задається через TOP
+        return f"SELECT TOP {int(limit)} {columns} {clauses}"
+
+    def like_pattern(self, text):
+        # Access порівнює без урахування регістру, а символи шаблону
+        # екрануються квадратними дужками
+        escaped = "".join(f"[{ch}]" if ch in "[%_" else ch for ch in text)
+        return f"%{escaped}%"
+
+    def describe_error(self, error):
+        if load_pyodbc() is None or f"DRIVER={{{self.driver}}}" in str(error):
+            return ("Драйвер Microsoft Access не знайдено. \n"
+                    "Перевірте, чи встановлено Microsoft Office або драйвер ODBC для Access.")
+        return super().describe_error(error)
+
+
+class SQLiteBackend(DatabaseBackend):
+    """
+    Вбудоване сховище SQLite з тією ж схемою таблиць, що й dataBase.mdb.
+    Не потребує драйвера ODBC і відкривається значно швидше за Access.
+    """
+    name = "sqlite"
+    default_filename = "dataBase.sqlite"
+
+    def candidate_paths(self):
+        return [
+            os.path.abspath("dataBase.sqlite"),  # В поточній папці
+            os.path.abspath("dataBase.db"),
+        ]
+
+    def connect(self):
+        # Підключення використовується і фоновим завантажувачем, доступ до нього
+        # серіалізує блокування DatabaseManager
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        # Вбудовані LOWER/LIKE SQLite не змінюють регістр кирилиці
+        conn.create_function("casefold", 1, lambda value: value.casefold() if isinstance(value, str) else value)
+        self.create_schema(conn)
+        return conn
+
+    def create_schema(self, conn):
+        """Створення довідкових таблиць, якщо їх ще немає"""
+        cursor = conn.cursor()
+        for table, columns in REFERENCE_SCHEMA.items():
+            columns_sql = ", ".join(f"[{name}] {col_type}" for name, col_type in columns)
+            cursor.execute(f"CREATE TABLE IF NOT EXISTS [{table}] ({columns_sql})")
+        conn.commit()
+        cursor.close()
+
+    def like_condition(self, column):
+        return f"casefold({column}) LIKE ? ESCAPE '\\'"
+
+    def like_pattern(self, text):
+        escaped = "".join(f"\\{ch}" if ch in "\\%_" else ch for ch in text.casefold())
+        return f"%{escaped}%"
+
+    def list_tables(self, conn):
+        cursor = conn.cursor()
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'")
+        tables = [row[0] for row in cursor.fetchall()]
+        cursor.close()
+        return tables
+
+
+def rows_checksum(rows):
+    """Контрольна сума вмісту таблиці, що не залежить від порядку рядків"""
+    digest = hashlib.sha1()
+    for line in sorted(repr(tuple(row)) for row in rows):
+        digest.update(line.encode("utf-8"))
+        digest.update(b"\n")
+    return digest.hexdigest()
+
+
+BACKENDS = {
+    AccessBackend.name: AccessBackend,
+    SQLiteBackend.name: SQLiteBackend,
+}
+
+
+def create_backend(db_path=None, backend_name=None, base_dir=None):
+    """
+    Створення сховища за назвою ("access"/"sqlite") або за розширенням файлу.
+    Якщо шлях не задано, використовується стандартна назва файлу в base_dir.
+    """
+    if not backend_name and db_path:
+        extension = os.path.splitext(db_path)[1].lower()
+        if extension in SQLITE_EXTENSIONS:
+            backend_name = SQLiteBackend.name
+    backend_name = (backend_name or AccessBackend.name).lower()
+
+    if backend_name not in BACKENDS:
+        raise ValueError(f"Невідомий тип сховища: {backend_name}")
+    backend_class = BACKENDS[backend_name]
+
+    if not db_path:
+        db_path = os.path.join(base_dir or os.getcwd(), backend_class.default_filename)
+    return backend_class(db_path)
@@ -0,0 +1,116 @@
+import time
+
+
+class CacheEntry:
+    """Значення в кеші разом з часом завантаження"""
+    __slots__ = ('value', 'loaded_at')
+
+    def __init__(self, value, loaded_at):
+        self.value = value
+        self.loaded_at = loaded_at
+
+
+class QueryCache:
+    """
+    Кеш результатів запитів з окремим записом для кожного ключа.
+
+    Кожен ключ (рядок або кортеж, де перший елемент - назва запиту)
+    пов'язується з таблицями, від яких залежить, щоб зміна таблиці в довіднику
+    скидала тільки залежні записи. Необов'язковий TTL обмежує час життя
+    запису, а лічильники влучань/промахів та часу завантаження доступні
+    через get_stats().
+    """
+
+    def __init__(self, default_ttl=None, clock=time.monotonic):
+        self.default_ttl = default_ttl
+        self._clock = clock
+        self._entries = {}
+        self._dependencies = {}
+        self._ttls = {}
+        self._stats = {}
+
+    @staticmethod
+    def _base_name(key):
+        return key[0] if isinstance(key, tuple) else key
+
+    def register(self, name, tables, ttl=None):
+        """Реєстрація залежності запиту від таблиць бази даних"""
+        self._dependencies[name] = frozenset(tables)
+        if ttl is not None:
+            self._ttls[name] = ttl
+
+    def _counters(self, name):
+        if name not in self._stats:
+            self._stats[name] = {'hits': 0, 'misses': 0, 'loads': 0, 'load_time': 0.0, 'invalidations': 0}
+        return self._stats[name]
+
+    def _is_fresh(self, name, entry):
+        ttl = self._ttls.get(name, self.default_ttl)
+        return ttl is None or self._clock() - entry.loaded_at < ttl
+
+    def get_or_load(self, key, loader):
+        """Отримання значення з кешу або завантаження через loader()"""
+        name = self._base_name(key)
+        counters = self._counters(name)
+
+        entry = self._entries.get(key)
+        if entry is not None and self._is_fresh(name, entry):
+            counters['hits'] += 1
+            return entry.value
+
+        counters['misses'] += 1
+        started = time.perf_counter()
+        value = loader()
+        counters['loads'] += 1
+        counters['load_time'] += time.perf_counter() - started
+
+        self._entries[key] = CacheEntry(value, self._clock())
+        return value
+
+    def peek(self, key):
+        """Значення з кешу без завантаження (None, якщо запису немає або він застарів)"""
+        entry = self._entries.get(key)
+        if entry is not None and self._is_fresh(self._base_name(key), entry):
+            return entry.value
+        return None
+
+    def invalidate(self, name=None):
+        """Скидання записів запиту (всіх ключів з цією назвою) або всього кешу"""
+        if name is None:
+            removed = list(self._entries)
+        else:
+            removed = [key for key in self._entries if self._base_name(key) == name]
+        for key in removed:
+            del self._entries[key]
+            self._counters(self._base_name(key))['invalidations'] += 1
+        return removed
+
+    def invalidate_tables(self, tables):
+        """Скидання записів, що залежать від будь-якої з вказаних таблиць"""
+        tables = set(tables)
+        names = [name for name, deps in self._dependencies.items() if deps & tables]
+        removed = []
+        for name in names:
+            removed.extend(self.invalidate(name))
+        return removed
+
+    def get_stats(self):
+        """Статистика кешу по кожному запиту та загальна"""
+        per_key = {name: dict(counters) for name, counters in self._stats.items()}
+        for name, counters in per_key.items():
+            requests = counters['hits'] + counters['misses']
+            counters['hit_rate'] = counters['hits'] / requests if requests else 0.0
+            counters['cached'] = sum(1 for key in self._entries if self._base_name(key) == name)
+
+        totals = {'hits': 0, 'misses': 0, 'loads': 0, 'load_time': 0.0, 'invalidations': 0}
+        for counters in self._stats.values():
+            for field in totals:
+                totals[field] += counters[field]
+        requests = totals['hits'] + totals['misses']
+        totals['hit_rate'] = totals['hits'] / requests if requests else 0.0
+        totals['cached'] = len(self._entries)
+        return {'keys': per_key, 'total': totals}
+
+    def reset_stats(self):
+        """Обнулення лічильників"""
+        self._stats = {}
@@ -0,0 +1,129 @@
+import threading
+import time
+from contextlib import contextmanager
+
+
+class ConnectionManager:
+    """
+    Єдине підключення до бази даних, яким володіє DatabaseManager.
+
+    Інші модулі (довідник, головне вікно) не відкривають власних підключень,
+    а позичають курсор через borrow() або transaction(). Перед видачею курсора
+    підключення перевіряється простим запитом (не частіше ніж раз на
+    health_check_interval секунд), а втрачене підключення відкривається заново.
+    """
+
+    # Мінімальний інтервал між перевірками підключення, секунди
+    health_check_interval = 30.0
+
+    def __init__(self, backend, lock=None, clock=time.monotonic):
+        self.backend = backend
+        self.lock = lock or threading.RLock()
+        self.conn = None
+        self.cursor = None
+        self.reconnects = 0
+        self._clock = clock
+        self._last_check = 0.0
+
+    def is_open(self):
+        return self.conn is not None and self.cursor is not None
+
+    def open(self):
+        """Відкриття нового підключення (попереднє закривається). Винятки не перехоплюються"""
+        with self.lock:
+            self.close()
+            self.conn = self.backend.connect()
+            self.cursor = self.conn.cursor()
+            self._last_check = self._clock()
+            return self.conn
+
+    def close(self):
+        """Закриття підключення"""
+        with self.lock:
+            if self.conn is None:
+                return False
+            try:
+                if self.cursor is not None:
+                    self.cursor.close()
+            except Exception:
+                # Курсор втраченого підключення вже недійсний
+                pass
+            try:
+                self.conn.close()
+                return True
+            except Exception as e:
+                print(f"Помилка закриття підключення: {e}")
+                return False
+            finally:
+                self.conn = None
+                self.cursor = None
+
+    def is_healthy(self):
+        """Перевірка, що підключення працює (виконується простий запит)"""
+        with self.lock:
+            if not self.is_open():
+                return False
+            try:
+                cursor = self.conn.cursor()
+                cursor.execute(self.backend.health_query)
+                cursor.fetchall()
+                cursor.close()
+                self._last_check = self._clock()
+                return True
+            except Exception as e:
+                print(f"Підключення до бази даних не відповідає: {e}")
+                return False
+
+    def ensure(self, force_check=False):
+        """
+        Відкрите та працююче підключення; за потреби виконується перепідключення.
+        Винятки підключення передаються викликачу.
+        """
+        with self.lock:
+            if self.is_open():
+                recently_checked = self._clock() - self._last_check < self.health_check_interval
+                if (recently_checked and not force_check) or self.is_healthy():
+                    return self.conn
+                print("Підключення до бази даних втрачено, перепідключення...")
+                self.reconnects += 1
+            return self.open()
+
+    def reconnect(self):
+        """Примусове перепідключення після помилки запиту"""
+        with self.lock:
+            self.reconnects += 1
+            return self.open()
+
+    @contextmanager
+    def borrow(self):
+        """Окремий курсор спільного підключення на час блоку with"""
+        with self.lock:
+            cursor = self.ensure().cursor()
+            try:
+                yield cursor
+            finally:
+                try:
+                    cursor.close()
+                except Exception:
+                    pass
+
+    @contextmanager
+    def transaction(self):
+        """Курсор для змін: commit після блоку with, rollback у разі винятку"""
+        with self.lock:
+            conn = self.ensure()
+            cursor = conn.cursor()
+            try:
+                yield cursor
+                conn.commit()
+            except Exception:
+                try:
+                    conn.rollback()
+                except Exception as e:
+                    print(f"Помилка скасування змін: {e}")
+                raise
+            finally:
+                try:
+                    cursor.close()
+                except Exception:
+                    pass
@@ -1,187 +1,438 @@
 import os
 import sys
-import pyodbc
-import sqlite3
+import threading
 from tkinter import messagebox
+from db_backends import REFERENCE_SCHEMA, create_backend, rows_checksum
+from db_cache import QueryCache
+from db_connection import ConnectionManager
+from db_schema import COLUMN_MAPPINGS, SCHEMA_CACHE_FILE, resolve_schema
+from reference_data import ReferenceBundle
+
+# Стандартні дані, які використовуються, якщо не вдасться отримати дані з бази
+DEFAULT_DEPARTMENTS = {
+    1: "Загальноосвітньої підготовки",
+    2: "Економічне",
+    3: "Інформаційних технологій",
+    4: "Будівельне",
+    5: "Земельно-правове"
+}
+
+DEFAULT_GROUPS = {
+    "Загальноосвітньої підготовки": ["11-М", "11-Ф", "21-П", "31-О", "22-К"],
+    "Економічне": ["11-Е", "21-Е", "31-Е"],
+    "Земельно-правове": ["11-З", "21-З", "31-З"],
+    "Будівельне": ["11-Б", "21-Б", "31-Б"]
+}
+
+# Таблиці, від яких залежить кожен кешований запит
+CACHE_DEPENDENCIES = {
+    'departments': ('department', 'groups'),
+    'groups': ('department', 'groups'),
+    'groups_by_department': ('department', 'groups'),
+    'group_departments': ('groups',),
+    'teachers': ('teachers',),
+    'audiences': ('audiences',),
+    'disciplines': ('discpline',),
+    'department_structure': ('department', 'groups'),
+    'reference_bundle': tuple(REFERENCE_SCHEMA)
+}
+
+# Таблиці довідників, що відкриваються у формі "Довідник"
+HANDBOOK_TABLES = {
+    'department': 'department',
+    'groups': 'groups',
+    'teachers': 'teachers',
+    'audiences': 'audiences',
+    'discipline': 'discpline'
+}
+
+# Сторінки довідника (ключ: назва, ID останнього запису попередньої сторінки, розмір)
+# та результати пошуку в базі (ключ: назва, текст запиту)
+CACHE_DEPENDENCIES.update({
+    f"{entity}_{kind}": (table,)
+    for entity, table in HANDBOOK_TABLES.items()
+    for kind in ('page', 'search')
+})
+
+# Довідник (для визначеної схеми) за назвою таблиці в REFERENCE_SCHEMA
+SIGNATURE_ENTITIES = {table: entity for entity, table in HANDBOOK_TABLES.items()}
+
+# Альтернативні назви таблиць, які використовуються у формах
+TABLE_ALIASES = {
+    'discipline': 'discpline',
+    'disciplines': 'discpline',
+    'Дисципліни': 'discpline'
+}
+
+# Кількість рядків, що отримуються з курсора за один виклик fetchmany
+FETCH_BATCH_SIZE = 500
+
+# Кількість записів на одній сторінці довідника
+PAGE_SIZE = 200
+
+# Таблиці до цієї кількості рядків при "Оновити дані" перевіряються за
+# вмістом; більші - тільки запитом COUNT/MAX, якщо повна перевірка не запитана
+SIGNATURE_FULL_CHECK_ROWS = 500
+
+DEFAULT_TEACHERS = [
+    "Петров П.П.", "Іванов І.І.", "Сидоров С.С.", 
+    "Ковальчук О.В.", "Шевченко Т.Г.", "Мельник А.М."
+]
 
 class DatabaseManager:
     """
     Клас для управління підключенням до бази даних та виконання запитів.
     Реалізує патерн Singleton для забезпечення єдиного підключення до бази даних.
+    Сховище (Access або SQLite) задається об'єктом backend з модуля db_backends.
     """
     _instance = None
+    _instance_lock = threading.RLock()
+    
+    # Функції, які викликаються зі списком змінених таблиць (наприклад, SearchService)
+    _change_listeners = []
+    
+    # False - повідомлення тільки виводяться в консоль (запуск без вікон, наприклад batch_generate)
+    interactive = True
     
-    def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super(DatabaseManager, cls).__new__(cls)
-            cls._instance._initialized = False
+    def __new__(cls, backend=None):
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = super(DatabaseManager, cls).__new__(cls)
+                cls._instance._initialized = False
         return cls._instance
     
-    def __init__(self):
-        if self._initialized:
-            return
-            
-        self._initialized = True
-        self.conn = None
-        self.cursor = None
-        
-        # Кеш для часто використовуваних даних
-        self._cache = {
-            'departments': None,
-            'groups': None,
-            'teachers': None,
-            'audiences': None,
-            'disciplines': None,
-            'department_structure': None
-        }
-        self._cache_valid = False
+    def __init__(self, backend=None):
+        # Ініціалізація може відбуватися у фоновому потоці, тому інші потоки
+        # чекають на її завершення замість того, щоб отримати напівготовий об'єкт
+        with self._instance_lock:
+            if self._initialized:
+                return
+            self._setup(backend)
+            self._initialized = True
+    
+    def _setup(self, backend):
+        """Ініціалізація підключення та кешу"""
+        # Спільне підключення використовується з потоку Tk та з фонового
+        # завантажувача, тому запити виконуються під блокуванням
+        self.lock = threading.RLock()
+        
+        # Повідомлення, які не можна показати з фонового потоку
+        self._pending_messages = []
+        
+        # Кеш для часто використовуваних даних (окремий запис для кожного ключа).
+        # Змінна середовища CRISCO_CACHE_TTL задає час життя запису в секундах
+        self._cache = QueryCache(default_ttl=self._get_cache_ttl())
+        for cache_key, tables in CACHE_DEPENDENCIES.items():
+            self._cache.register(cache_key, tables)
+        
+        # Відбитки таблиць для виявлення змін під час оновлення
+        self._table_signatures = {}
+        self.last_changed_tables = []
+        
+        # Фактичні назви таблиць і колонок (визначаються після підключення)
+        self.schema = {}
+        
+        if backend is None:
+            backend = self.create_default_backend()
+        
+        # Єдине підключення, яке позичають всі модулі програми
+        self.connections = ConnectionManager(backend, lock=self.lock)
+        
+        print(f"Шлях до бази даних: {self.db_path} (сховище: {self.backend.name})")
+        self.connect()
+    
+    @staticmethod
+    def get_application_path():
+        """Папка програми (поруч з EXE-файлом або скриптом)"""
+        # Спочатку пробуємо отримати шлях до EXE-файлу (для скомпільованої програми)
+        if getattr(sys, 'frozen', False):
+            # Якщо програма скомпільована в EXE
+            return os.path.dirname(sys.executable)
+        # Якщо програма запущена з Python
+        return os.path.dirname(os.path.abspath(__file__))
+    
+    @classmethod
+    def create_default_backend(cls):
+        """
+        Вибір сховища за замовчуванням.
+        Змінні середовища CRISCO_DB_BACKEND ("access"/"sqlite") та CRISCO_DB_PATH
+        дозволяють перейти на SQLite там, де немає драйвера Access.
+        """
+        backend_name = os.environ.get("CRISCO_DB_BACKEND")
+        db_path = os.environ.get("CRISCO_DB_PATH")
         
         # Визначаємо шлях до бази даних відносно EXE-файлу або скрипта
         try:
-            # Спочатку пробуємо отримати шлях до EXE-файлу (для скомпільованої програми)
-            if getattr(sys, 'frozen', False):
-                # Якщо програма скомпільована в EXE
-                application_path = os.path.dirname(sys.executable)
-            else:
-                # Якщо програма запущена з Python
-                application_path = os.path.dirname(os.path.abspath(__file__))
-            
-            self.db_path = os.path.join(application_path, "dataBase.mdb")
+            application_path = cls.get_application_path()
         except Exception as e:
             print(f"Помилка при визначенні шляху до бази даних: {e}")
-            # Використовуємо старий метод як запасний варіант
-            self.db_path = os.path.abspath("dataBase.mdb")
+            # Використовуємо поточну папку як запасний варіант
+            application_path = os.path.abspath(".")
         
-        print(f"Шлях до бази даних: {self.db_path}")
-        self.conn_str = f'DRIVER={{Microsoft Access Driver (*.mdb, *.accdb)}};DBQ={self.db_path}'
-        self.connect()
+        return create_backend(db_path, backend_name, base_dir=application_path)
+    
+    @staticmethod
+    def _get_cache_ttl():
+        """Час життя записів кешу з налаштувань (None - без обмеження)"""
+        ttl = os.environ.get("CRISCO_CACHE_TTL")
+        if not ttl:
+            return None
+        try:
+            return float(ttl)
+        except ValueError:
+            print(f"Неправильне значення CRISCO_CACHE_TTL: {ttl}")
+            return None
+    
+    @property
+    def backend(self):
+        return self.connections.backend
+    
+    @backend.setter
+    def backend(self, backend):
+        self.connections.backend = backend
+    
+    @property
+    def conn(self):
+        return self.connections.conn
+    
+    @property
+    def cursor(self):
+        return self.connections.cursor
+    
+    @property
+    def db_path(self):
+        return self.backend.db_path
+    
+    @property
+    def conn_str(self):
+        """Рядок підключення ODBC (тільки для сховища Access)"""
+        return getattr(self.backend, 'conn_str', None)
+    
+    def use_backend(self, backend):
+        """Перемикання на інше сховище (наприклад, на SQLite-знімок)"""
+        with self.lock:
+            self.close()
+            self._invalidate_cache()
+            self.backend = backend
+            print(f"Перемикання сховища: {self.backend.name}, шлях: {self.db_path}")
+            return self.connect()
+    
+    def _notify(self, kind, title, message):
+        """
+        Показ повідомлення користувачу. У фоновому потоці вікна Tk створювати
+        не можна, тому повідомлення відкладається до pop_pending_messages().
+        """
+        if not self.interactive:
+            print(f"{title}: {message}")
+            return
+        if threading.current_thread() is not threading.main_thread():
+            self._pending_messages.append((kind, title, message))
+            return
+        if kind == "warning":
+            messagebox.showwarning(title, message)
+        else:
+            messagebox.showerror(title, message)
+    
+    def pop_pending_messages(self):
+        """Відкладені повідомлення (kind, title, message) з фонового потоку"""
+        messages, self._pending_messages = self._pending_messages, []
+        return messages
+    
+    def show_pending_messages(self):
+        """Показ відкладених повідомлень (викликається в потоці Tk)"""
+        for kind, title, message in self.pop_pending_messages():
+            self._notify(kind, title, message)
     
     def connect(self):
         """Підключення до бази даних"""
+        with self.lock:
+            return self._connect()
+    
+    def _connect(self):
         # Спочатку перевіряємо, чи існує файл бази даних
-        if not os.path.exists(self.db_path):
+        if not self.backend.exists():
             # Спробуємо знайти базу даних в інших можливих місцях
-            possible_paths = [
-                os.path.join(os.path.dirname(self.db_path), "dataBase.accdb"),  # Спробуємо .accdb в тій же папці
-                os.path.abspath("dataBase.mdb"),  # Спробуємо в поточній папці
-                os.path.abspath("dataBase.accdb"),  # Спробуємо .accdb в поточній папці
-                os.path.join(os.path.expanduser("~"), "Desktop", "Crisco", "dataBase.mdb"),  # На робочому столі
-            ]
-            
-            for path in possible_paths:
+            for path in self.backend.candidate_paths():
                 if os.path.exists(path):
-                    self.db_path = path
-                    self.conn_str = f'DRIVER={{Microsoft Access Driver (*.mdb, *.accdb)}};DBQ={self.db_path}'
+                    self.backend.db_path = path
                     print(f"Знайдено базу даних за шляхом: {self.db_path}")
                     break
             else:
                 # Якщо базу даних не знайдено, повідомляємо про це
-                messagebox.showwarning("Попередження", 
-                                      "Файл бази даних не знайдено. \n"
-                                      "Програма буде працювати з тестовими даними.")
+                self._notify("warning", "Попередження", 
+                             "Файл бази даних не знайдено. \n"
+                             "Програма буде працювати з тестовими даними.")
                 print(f"Файл бази даних не знайдено: {self.db_path}")
         
-        # Спробуємо підключитися до бази даних за допомогою pyodbc
+        # Спробуємо підключитися до бази даних через вибране сховище
         try:
-            self.conn = pyodbc.connect(self.conn_str)
-            self.cursor = self.conn.cursor()
+            self.connections.open()
             print("Успішне підключення до бази даних")
+            self._load_schema()
             return True
         except Exception as e:
             print(f"Помилка підключення до бази даних: {e}")
             
             # Якщо не вдалося підключитися до бази даних, повідомляємо про це тільки один раз
-            if "DRIVER={Microsoft Access Driver (*.mdb, *.accdb)}" in str(e):
-                messagebox.showerror("Помилка", 
-                                   "Драйвер Microsoft Access не знайдено. \n"
-                                   "Перевірте, чи встановлено Microsoft Office або драйвер ODBC для Access.\n"
-                                   "Програма буде працювати з тестовими даними.")
-            else:
-                messagebox.showerror("Помилка", f"Помилка підключення до бази даних: {e}\n"
-                                                    "Програма буде працювати з тестовими даними.")
+            self._notify("error", "Помилка", 
+                         f"{self.backend.describe_error(e)}\n"
+                         "Програма буде працювати з тестовими даними.")
             
-            self.conn = None
-            self.cursor = None
+            self.connections.close()
             return False
     
+    def _load_schema(self):
+        """Визначення таблиць і колонок (з кешу schema_cache.json, якщо база не змінилася)"""
+        cache_path = os.path.join(self.get_application_path(), SCHEMA_CACHE_FILE)
+        try:
+            self.schema = resolve_schema(self.backend, self.conn, cache_path)
+        except Exception as e:
+            print(f"Помилка при визначенні схеми бази даних: {e}")
+            self.schema = {}
+    
+    def get_table_info(self, entity):
+        """
+        Таблиця та колонки довідника (department, groups, teachers, audiences, discipline).
+        
+        Returns:
+            dict: {"table", "id", "name"} або None, якщо таблицю не знайдено
+        """
+        return self.schema.get(entity)
+    
     def is_connected(self):
         """Перевірка, чи є активне підключення до бази даних"""
-        return self.conn is not None and self.cursor is not None
+        return self.connections.is_open()
+    
+    def borrow(self):
+        """
+        Курсор спільного підключення для інших модулів (блок with).
+        Підключення перевіряється і, якщо воно втрачене, відкривається заново.
+        """
+        return self.connections.borrow()
+    
+    def transaction(self):
+        """Курсор для змін у базі даних: commit після блоку with, rollback при помилці"""
+        return self.connections.transaction()
     
     def execute_query(self, query, params=None):
-        """Виконання запиту до бази даних"""
-        if not self.is_connected():
-            if not self.connect():
+        """
+        Виконання запиту до бази даних.
+        Курсор спільний, тому код, що читає результати з поверненого курсора,
+        має виконуватися під блокуванням self.lock.
+        """
+        with self.lock:
+            if not self.is_connected():
+                if not self.connect():
+                    return None
+            
+            try:
+                return self._execute(query, params)
+            except Exception as e:
+                print(f"Помилка виконання запиту: {e}")
+            
+            # Помилка могла виникнути через втрачене підключення (наприклад,
+            # файл бази на мережевому диску) - тоді перепідключаємося і повторюємо
+            if self.connections.is_healthy():
                 return None
-        
-        try:
-            if params:
-                self.cursor.execute(query, params)
-            else:
-                self.cursor.execute(query)
-            return self.cursor
-        except Exception as e:
-            print(f"Помилка виконання запиту: {e}")
-            return None
+            try:
+                self.connections.reconnect()
+                print("Підключення до бази даних відновлено")
+                return self._execute(query, params)
+            except Exception as e:
+                print(f"Помилка виконання запиту після перепідключення: {e}")
+                return None
+    
+    def _execute(self, query, params):
+        if params:
+            self.cursor.execute(query, params)
+        else:
+            self.cursor.execute(query)
+        return self.cursor
     
     def fetch_all(self, query, params=None):
         """Виконання запиту та отримання всіх результатів"""
-        cursor = self.execute_query(query, params)
-        if cursor:
-            try:
-                return cursor.fetchall()
-            except Exception as e:
-                print(f"Помилка отримання результатів: {e}")
-        return []
+        with self.lock:
+            cursor = self.execute_query(query, params)
+            if cursor:
+                try:
+                    return cursor.fetchall()
+                except Exception as e:
+                    print(f"Помилка отримання результатів: {e}")
+            return []
     
     def fetch_one(self, query, params=None):
         """Виконання запиту та отримання одного результату"""
-        cursor = self.execute_query(query, params)
-        if cursor:
-            try:
-                return cursor.fetchone()
-            except Exception as e:
-                print(f"Помилка отримання результату: {e}")
-        return None
+        with self.lock:
+            cursor = self.execute_query(query, params)
+            if cursor:
+                try:
+                    return cursor.fetchone()
+                except Exception as e:
+                    print(f"Помилка отримання результату: {e}")
+            return None
     
     def commit(self):
         """Збереження змін у базі даних"""
-        if self.is_connected():
-            try:
-                self.conn.commit()
-                return True
-            except Exception as e:
-                print(f"Помилка збереження змін: {e}")
-        return False
+        with self.lock:
+            if self.is_connected():
+                try:
+                    self.conn.commit()
+                    return True
+                except Exception as e:
+                    print(f"Помилка збереження змін: {e}")
+            return False
     
     def close(self):
         """Закриття підключення до бази даних"""
-        if self.is_connected():
-            try:
-                self.cursor.close()
-                self.conn.close()
-                self.conn = None
-                self.cursor = None
-                return True
-            except Exception as e:
-                print(f"Помилка закриття підключення: {e}")
-        return False
+        return self.connections.close()
     
     def _invalidate_cache(self):
         """Очищення кешу"""
-        self._cache_valid = False
-        for key in self._cache:
-            self._cache[key] = None
+        self._cache.invalidate()
+        self._table_signatures = {}
+        self._notify_tables_changed(list(REFERENCE_SCHEMA))
+    
+    @classmethod
+    def add_change_listener(cls, listener):
+        """
+        Реєстрація функції listener(tables), яка викликається після скидання
+        кешу для змінених таблиць. Може викликатися з фонового потоку.
+        """
+        if listener not in cls._change_listeners:
+            cls._change_listeners.append(listener)
+    
+    @classmethod
+    def remove_change_listener(cls, listener):
+        if listener in cls._change_listeners:
+            cls._change_listeners.remove(listener)
+    
+    def _notify_tables_changed(self, tables):
+        for listener in list(self._change_listeners):
+            try:
+                listener(tables)
+            except Exception as e:
+                print(f"Помилка в обробнику змін таблиць: {e}")
     
     def _get_cached_or_fetch(self, cache_key, fetch_func):
         """Отримання даних з кешу або завантаження з БД"""
-        if self._cache_valid and self._cache[cache_key] is not None:
-            return self._cache[cache_key]
-        
-        data = fetch_func()
-        self._cache[cache_key] = data
-        self._cache_valid = True
-        return data
+        with self.lock:
+            return self._cache.get_or_load(cache_key, fetch_func)
+    
+    def invalidate_table(self, table):
+        """
+        Скидання кешованих даних, що залежать від таблиці
+        (викликається після змін у довіднику)
+        """
+        table = TABLE_ALIASES.get(table, table)
+        with self.lock:
+            removed = self._cache.invalidate_tables([table])
+        print(f"Кеш для таблиці {table} очищено: {len(removed)} записів")
+        self._notify_tables_changed([table])
+        return removed
+    
+    def get_cache_stats(self):
+        """Статистика кешу: влучання, промахи та час завантаження для кожного запиту"""
+        return self._cache.get_stats()
     
     def get_departments(self):
         """Отримання списку відділень з таблиці department"""
@@ -190,13 +441,7 @@ class DatabaseManager:
     def _fetch_departments(self):
         """Завантаження відділень з БД"""
         # Стандартні назви відділень, які будуть використані, якщо не вдасться отримати дані з бази
-        default_dept_names = {
-            1: "Загальноосвітньої підготовки",
-            2: "Економічне",
-            3: "Інформаційних технологій",
-            4: "Будівельне",
-            5: "Земельно-правове"
-        }
+        default_dept_names = DEFAULT_DEPARTMENTS
         
         print("Отримання списку відділень...")
         
@@ -267,6 +512,11 @@ class DatabaseManager:
     
     def get_groups_by_department(self, department):
         """Отримання списку груп за відділенням"""
+        return self._get_cached_or_fetch(('groups_by_department', department),
+                                         lambda: self._fetch_groups_by_department(department))
+    
+    def _fetch_groups_by_department(self, department):
+        """Завантаження груп відділення з БД"""
         try:
             # Спочатку отримуємо ID відділення з бази даних за його назвою
             dept_id = None
@@ -322,6 +572,10 @@ class DatabaseManager:
     
     def get_all_groups(self):
         """Отримання словника груп за відділеннями"""
+        return self._get_cached_or_fetch('groups', self._fetch_all_groups)
+    
+    def _fetch_all_groups(self):
+        """Завантаження словника груп за відділеннями з БД"""
         try:
             # Спочатку отримуємо актуальні назви відділень з бази даних
             dept_id_to_name = {}
@@ -394,81 +648,193 @@ class DatabaseManager:
             print(f"Помилка при отриманні груп: {e}")
         
         # Якщо не вдалося отримати дані, використовуємо тестові дані
-        return {
-            "Загальноосвітньої підготовки": ["11-М", "11-Ф", "21-П", "31-О", "22-К"],
-            "Економічне": ["11-Е", "21-Е", "31-Е"],
-            "Земельно-правове": ["11-З", "21-З", "31-З"],
-            "Будівельне": ["11-Б", "21-Б", "31-Б"]
-        }
+        return {dept: list(groups) for dept, groups in DEFAULT_GROUPS.items()}
     
     def get_audiences(self):
         """Отримання списку аудиторій"""
-        try:
-            rows = self.fetch_all("SELECT Number FROM audiences")
-            if rows:
-                return [str(row[0]) for row in rows]
-        except Exception as e:
-            print(f"Помилка при отриманні аудиторій: {e}")
-        return []
+        return self._get_cached_or_fetch('audiences', self._fetch_audiences)
+    
+    def _fetch_audiences(self):
+        """Завантаження аудиторій з БД"""
+        return [str(name) for name in self._fetch_names('audiences')]
     
     def get_disciplines(self):
         """Отримання списку дисциплін з бази даних"""
-        # Спробуємо різні варіанти таблиць і запитів для отримання дисциплін
-        try:
-            # Спочатку спробуємо таблицю discpline
-            print("Спроба отримати дані з таблиці discpline...")
-            cursor = self.execute_query("SELECT Name FROM discpline WHERE Name IS NOT NULL AND Name <> '' ORDER BY Name")
-            if cursor:
-                disciplines = [row.Name for row in cursor.fetchall()]
-                if disciplines and len(disciplines) > 0:
-                    print(f"Знайдено {len(disciplines)} дисциплін в таблиці discpline")
-                    print(f"Перші 5 дисциплін: {disciplines[:5] if len(disciplines) >= 5 else disciplines}")
-                    return sorted(disciplines)
-        except Exception as e:
-            print(f"Помилка при отриманні дисциплін з таблиці discpline: {e}")
+        return self._get_cached_or_fetch('disciplines', self._fetch_disciplines)
+    
+    def _fetch_disciplines(self):
+        """Завантаження дисциплін з БД"""
+        disciplines = self._fetch_names('discipline', non_empty=True)
+        if disciplines:
+            print(f"Знайдено {len(disciplines)} дисциплін в таблиці {self.get_table_info('discipline')['table']}")
+            return sorted(disciplines)
         
-        try:
-            # Спробуємо таблицю discipline
-            print("Спроба отримати дані з таблиці discipline...")
-            cursor = self.execute_query("SELECT Name FROM discipline WHERE Name IS NOT NULL AND Name <> '' ORDER BY Name")
-            if cursor:
-                disciplines = [row.Name for row in cursor.fetchall()]
-                if disciplines and len(disciplines) > 0:
-                    print(f"Знайдено {len(disciplines)} дисциплін в таблиці discipline")
-                    print(f"Перші 5 дисциплін: {disciplines[:5] if len(disciplines) >= 5 else disciplines}")
-                    return sorted(disciplines)
-        except Exception as e:
-            print(f"Помилка при отриманні дисциплін з таблиці discipline: {e}")
+        # Якщо не вдалося отримати дисципліни з бази даних, повертаємо стандартний список
+        print("Не вдалося отримати дисципліни з бази даних, використовуємо стандартний список")
+        return self.get_default_disciplines()
+    
+    def _fetch_names(self, entity, non_empty=False):
+        """
+        Значення колонки з назвами довідника одним запитом до визначеної таблиці.
+        Повертає порожній список, якщо таблицю не знайдено.
+        """
+        info = self.get_table_info(entity)
+        if info is None:
+            return []
         
-        try:
-            # Спробуємо таблицю disciplines
-            print("Спроба отримати дані з таблиці disciplines...")
-            cursor = self.execute_query("SELECT Name FROM disciplines WHERE Name IS NOT NULL AND Name <> '' ORDER BY Name")
-            if cursor:
-                disciplines = [row.Name for row in cursor.fetchall()]
-                if disciplines and len(disciplines) > 0:
-                    print(f"Знайдено {len(disciplines)} дисциплін в таблиці disciplines")
-                    print(f"Перші 5 дисциплін: {disciplines[:5] if len(disciplines) >= 5 else disciplines}")
-                    return sorted(disciplines)
-        except Exception as e:
-            print(f"Помилка при отриманні дисциплін з таблиці disciplines: {e}")
+        name = f"[{info['name']}]"
+        query = f"SELECT {name} FROM [{info['table']}]"
+        if non_empty:
+            query += f" WHERE {name} IS NOT NULL AND {name} <> '' ORDER BY {name}"
+        rows = self.fetch_batched(query)
+        if rows is None:
+            print(f"Помилка при отриманні даних з таблиці {info['table']}")
+            return []
+        return [row[0] for row in rows]
+    
+    def fetch_batched(self, query, params=None, batch_size=FETCH_BATCH_SIZE):
+        """
+        Виконання запиту та отримання результатів порціями через fetchmany.
+        Повертає список кортежів або None у разі помилки.
+        """
+        with self.lock:
+            cursor = self.execute_query(query, params)
+            if cursor is None:
+                return None
+            try:
+                rows = []
+                while True:
+                    batch = cursor.fetchmany(batch_size)
+                    if not batch:
+                        break
+                    rows.extend(tuple(row) for row in batch)
+                return rows
+            except Exception as e:
+                print(f"Помилка отримання результатів: {e}")
+                return None
+    
+    def fetch_id_name_rows(self, entity):
+        """
+        Пари (ID, назва) довідника для списків у формах.
+        Вибираються тільки колонки ID та назви (за визначеною схемою або
+        стандартними назвами COLUMN_MAPPINGS), а не SELECT *.
+        
+        Returns:
+            list: Пари (ID, назва) або None, якщо дані не вдалося отримати
+        """
+        if not self.is_connected():
+            return None
+        info = self.get_table_info(entity) or COLUMN_MAPPINGS.get(entity)
+        if info is None:
+            print(f"Невідомий довідник: {entity}")
+            return None
+        
+        id_column = info["id"] or COLUMN_MAPPINGS.get(entity, {}).get("id", "ID")
+        rows = self.fetch_batched(f"SELECT [{id_column}], [{info['name']}] FROM [{info['table']}]")
+        if rows is None:
+            return None
+        return [(row[0], row[1] if row[1] else "") for row in rows]
+    
+    def fetch_id_name_page(self, entity, after_id=None, limit=PAGE_SIZE):
+        """
+        Сторінка пар (ID, назва) довідника, впорядкованих за ID (keyset-пагінація).
+        Наступна сторінка запитується з after_id, рівним ID останнього запису
+        попередньої, тому час отримання сторінки не залежить від її номера.
+        Сторінки кешуються до зміни таблиці.
         
+        Args:
+            entity (str): Довідник (department, groups, teachers, audiences, discipline)
+            after_id: ID останнього запису попередньої сторінки (None - перша сторінка)
+            limit (int): Кількість записів на сторінці
+            
+        Returns:
+            list: Пари (ID, назва) або None, якщо дані не вдалося отримати
+        """
+        if not self.is_connected():
+            return None
         try:
-            # Спробуємо таблицю Дисципліни
-            print("Спроба отримати дані з таблиці Дисципліни...")
-            cursor = self.execute_query("SELECT Назва FROM Дисципліни WHERE Назва IS NOT NULL AND Назва <> '' ORDER BY Назва")
-            if cursor:
-                disciplines = [row.Назва for row in cursor.fetchall()]
-                if disciplines and len(disciplines) > 0:
-                    print(f"Знайдено {len(disciplines)} дисциплін в таблиці Дисципліни")
-                    print(f"Перші 5 дисциплін: {disciplines[:5] if len(disciplines) >= 5 else disciplines}")
-                    return sorted(disciplines)
-        except Exception as e:
-            print(f"Помилка при отриманні дисциплін з таблиці Дисципліни: {e}")
+            return self._get_cached_or_fetch((f"{entity}_page", after_id, limit),
+                                             lambda: self._fetch_id_name_page(entity, after_id, limit))
+        except RuntimeError as e:
+            print(f"Помилка при отриманні сторінки довідника {entity}: {e}")
+            return None
+    
+    def _id_name_columns(self, entity):
+        """Таблиця та колонки ID і назви довідника (в квадратних дужках) для запитів"""
+        info = self.get_table_info(entity) or COLUMN_MAPPINGS.get(entity)
+        if info is None:
+            raise RuntimeError(f"невідомий довідник {entity}")
+        id_column = info["id"] or COLUMN_MAPPINGS.get(entity, {}).get("id", "ID")
+        return f"[{info['table']}]", f"[{id_column}]", f"[{info['name']}]"
+    
+    def _fetch_id_name_page(self, entity, after_id, limit):
+        table, id_column, name_column = self._id_name_columns(entity)
+        clauses = f"FROM {table}"
+        params = None
+        if after_id is not None:
+            clauses += f" WHERE {id_column} > ?"
+            params = (after_id,)
+        clauses += f" ORDER BY {id_column}"
         
-        # Якщо не вдалося отримати дисципліни з жодної таблиці, повертаємо стандартний список
-        print("Не вдалося отримати дисципліни з бази даних, використовуємо стандартний список")
-        return self.get_default_disciplines()
+        query = self.backend.limited_select(f"{id_column}, {name_column}", clauses, limit)
+        rows = self.fetch_batched(query, params)
+        if rows is None:
+            # Помилки не кешуються
+            raise RuntimeError(f"не вдалося прочитати таблицю {table}")
+        return [(row[0], row[1] if row[1] else "") for row in rows]
+    
+    def search_id_name_rows(self, entity, text):
+        """
+        Пари (ID, назва) записів довідника, назва яких містить text
+        (без урахування регістру), впорядковані за ID.
+        
+        Пошук виконується запитом LIKE у базі даних, тож таблицю не потрібно
+        завантажувати повністю. Результат кешується для кожного тексту запиту;
+        якщо вже є результат для початку запиту (користувач дописує текст),
+        він фільтрується без звернення до бази.
+        
+        Returns:
+            list: Пари (ID, назва) або None, якщо дані не вдалося отримати
+        """
+        needle = str(text).strip().casefold()
+        if not needle:
+            return self.fetch_id_name_rows(entity)
+        if not self.is_connected():
+            return None
+        
+        name = f"{entity}_search"
+        with self.lock:
+            prefix_rows = None
+            for length in range(len(needle) - 1, 0, -1):
+                cached = self._cache.peek((name, needle[:length]))
+                if cached is not None:
+                    prefix_rows = cached
+                    break
+            
+            def load():
+                if prefix_rows is not None:
+                    return [row for row in prefix_rows if needle in row[1].casefold()]
+                return self._search_id_name_rows(entity, needle)
+            
+            try:
+                return self._cache.get_or_load((name, needle), load)
+            except RuntimeError as e:
+                print(f"Помилка пошуку в довіднику {entity}: {e}")
+                return None
+    
+    def _search_id_name_rows(self, entity, needle):
+        table, id_column, name_column = self._id_name_columns(entity)
+        query = (f"SELECT {id_column}, {name_column} FROM {table} "
+                 f"WHERE {self.backend.like_condition(name_column)} ORDER BY {id_column}")
+        rows = self.fetch_batched(query, (self.backend.like_pattern(needle),))
+        if rows is None:
+            raise RuntimeError(f"не вдалося виконати пошук у таблиці {table}")
+        return [(row[0], row[1] if row[1] else "") for row in rows]
+    
+    def invalidate_pages(self, entity):
+        """Скидання кешованих сторінок та результатів пошуку довідника (після змін у ньому)"""
+        with self.lock:
+            return self._cache.invalidate(f"{entity}_page") + self._cache.invalidate(f"{entity}_search")
     
     def get_default_disciplines(self):
         """Отримання стандартного списку дисциплін"""
@@ -482,6 +848,10 @@ class DatabaseManager:
     
     def get_group_departments(self):
         """Отримання словника ID відділень груп"""
+        return self._get_cached_or_fetch('group_departments', self._fetch_group_departments)
+    
+    def _fetch_group_departments(self):
+        """Завантаження словника ID відділень груп з БД"""
         try:
             # Спробуємо отримати дані з таблиці groups
             rows = self.fetch_all("SELECT Name, [Number Of Department] FROM groups")
@@ -496,31 +866,158 @@ class DatabaseManager:
             "11-Е": 2, "21-Е": 2, "31-Е": 2
         }
     
-    def refresh_data(self):
-        """Оновлення даних з бази даних (очищення кешу)"""
+    def reference_source(self, table):
+        """
+        Фактична таблиця та колонки довідкової таблиці REFERENCE_SCHEMA (за схемою,
+        визначеною після підключення): ID, назва та додаткові колонки зі схеми
+        (відділення групи), в порядку колонок REFERENCE_SCHEMA.
+        """
+        columns = [name for name, _ in REFERENCE_SCHEMA[table]]
+        info = self.get_table_info(SIGNATURE_ENTITIES.get(table, table))
+        if info is None:
+            return table, columns
+        return info['table'], [info['id'] or columns[0], info['name']] + columns[2:]
+    
+    def probe_table(self, table):
+        """
+        Швидка перевірка таблиці одним агрегатним запитом: (кількість рядків, максимальний ID).
+        Повертає None, якщо таблицю не вдалося прочитати.
+        """
+        real_table, columns = self.reference_source(table)
+        row = self.fetch_one(f"SELECT COUNT(*), MAX([{columns[0]}]) FROM [{real_table}]")
+        if row is None:
+            return None
+        return (row[0], row[1])
+    
+    def table_checksum(self, table):
+        """Контрольна сума вмісту таблиці (читаються всі рядки) або None у разі помилки"""
+        real_table, columns = self.reference_source(table)
+        columns_sql = ", ".join(f"[{name}]" for name in columns)
+        rows = self.fetch_batched(f"SELECT {columns_sql} FROM [{real_table}]")
+        if rows is None:
+            print(f"Помилка при читанні таблиці {real_table}")
+            return None
+        return rows_checksum(rows)
+    
+    def _fetch_signed_rows(self, table):
+        """
+        Рядки таблиці (ID, назва та додаткові колонки зі схеми) одним запитом.
+        З тих самих рядків запам'ятовується відбиток таблиці (кількість рядків,
+        максимальний ID, контрольна сума), тож окремого читання для початку
+        відліку змін не потрібно. Повертає None, якщо таблицю не вдалося прочитати.
+        """
+        real_table, columns = self.reference_source(table)
+        columns_sql = ", ".join(f"[{name}]" for name in columns)
+        rows = self.fetch_batched(f"SELECT {columns_sql} FROM [{real_table}]")
+        if rows is None:
+            print(f"Помилка при читанні таблиці {real_table}")
+            return None
+        ids = [row[0] for row in rows if row[0] is not None]
+        with self.lock:
+            self._table_signatures[table] = (len(rows), max(ids) if ids else None, rows_checksum(rows))
+        return rows
+    
+    def detect_changes(self, tables=None, verify=()):
+        """
+        Порівняння таблиць з попередньою перевіркою.
+        
+        Для кожної таблиці виконується запит COUNT(*)/MAX(ID). Якщо кількість
+        рядків або максимальний ID змінилися, таблиця змінена; її вміст не
+        читається, а повний відбиток береться з рядків наступного завантаження
+        довідкових даних. Якщо вони збігаються, вміст (а з ним і перейменування)
+        перевіряється контрольною сумою тільки для таблиць з verify та для
+        невеликих таблиць (до SIGNATURE_FULL_CHECK_ROWS рядків); інші вважаються
+        незмінними без читання.
+        
+        Args:
+            tables: Таблиці для перевірки (за замовчуванням всі довідкові)
+            verify: Таблиці, вміст яких перевіряється незалежно від розміру
+        
+        Returns:
+            list: Назви змінених таблиць (таблиці без попереднього відбитка
+                  вважаються зміненими) або None, якщо жодну таблицю не вдалося прочитати
+        """
+        tables = tables or list(REFERENCE_SCHEMA)
+        changed = []
+        readable = False
+        for table in tables:
+            probe = self.probe_table(table)
+            if probe is None:
+                continue
+            readable = True
+            
+            previous = self._table_signatures.get(table)
+            if previous is None or previous[:2] != probe:
+                # Вміст не читаємо: контрольна сума невідома до наступного завантаження
+                self._table_signatures[table] = probe + (None,)
+                changed.append(table)
+                continue
+            
+            if table not in verify and probe[0] > SIGNATURE_FULL_CHECK_ROWS:
+                continue
+            checksum = self.table_checksum(table)
+            if checksum is None:
+                continue
+            if previous[2] is not None and previous[2] != checksum:
+                changed.append(table)
+            self._table_signatures[table] = probe + (checksum,)
+        
+        if not readable:
+            return None
+        return changed
+    
+    def refresh_data(self, full=False):
+        """
+        Оновлення даних з бази даних.
+        Перезавантажуються тільки таблиці, вміст яких змінився; якщо змін немає,
+        кеш і підключення залишаються без змін.
+        
+        Args:
+            full (bool): Перевіряти вміст всіх таблиць, а не тільки невеликих (див. detect_changes)
+        """
+        with self.lock:
+            return self._refresh_data(full)
+    
+    def _refresh_data(self, full=False):
         print("Оновлення даних з бази даних...")
         
-        # Очищаємо кеш
-        self._invalidate_cache()
+        # Якщо не було підключення, спробуємо підключитися
+        if not self.is_connected():
+            self._invalidate_cache()
+            self.last_changed_tables = list(REFERENCE_SCHEMA)
+            return self.connect()
         
-        # Перепідключаємося до бази даних для отримання свіжих даних
-        if self.is_connected():
+        changed = self.detect_changes(verify=list(REFERENCE_SCHEMA) if full else ())
+        if changed is None:
+            # Таблиці не читаються - перепідключаємося до бази даних
+            print("Не вдалося перевірити зміни, перепідключення до бази даних...")
+            self._invalidate_cache()
+            self.last_changed_tables = list(REFERENCE_SCHEMA)
             try:
                 # Закриваємо поточне підключення
                 self.close()
                 # Відкриваємо нове підключення
-                self.connect()
-                print("Дані успішно оновлено")
-                return True
+                return self.connect()
             except Exception as e:
                 print(f"Помилка при оновленні даних: {e}")
                 return False
+        
+        self.last_changed_tables = changed
+        if changed:
+            self._cache.invalidate_tables(changed)
+            print(f"Змінені таблиці: {', '.join(changed)}")
+            self._notify_tables_changed(changed)
         else:
-            # Якщо не було підключення, спробуємо підключитися
-            return self.connect()
+            print("Змін у базі даних не виявлено")
+        print("Дані успішно оновлено")
+        return True
     
     def get_department_structure(self):
         """Отримання повної структури відділень з ID та назвами для динамічної генерації бланку"""
+        return self._get_cached_or_fetch('department_structure', self._fetch_department_structure)
+    
+    def _fetch_department_structure(self):
+        """Завантаження структури відділень з БД"""
         print("Отримання структури відділень...")
         
         # Стандартна структура відділень
@@ -585,16 +1082,64 @@ class DatabaseManager:
 
     def get_teachers(self):
         """Отримання списку викладачів"""
-        try:
-            # Прямий запит до таблиці teachers
-            rows = self.fetch_all("SELECT PIB FROM teachers")
-            if rows:
-                return [row[0] for row in rows]
-        except Exception as e:
-            print(f"Помилка отримання викладачів: {e}")
+        return self._get_cached_or_fetch('teachers', self._fetch_teachers)
+    
+    def _fetch_teachers(self):
+        """Завантаження викладачів з БД"""
+        teachers = self._fetch_names('teachers')
+        if teachers:
+            return teachers
         
         # Якщо не вдалося отримати дані, повертаємо тестові дані
-        return [
-            "Петров П.П.", "Іванов І.І.", "Сидоров С.С.", 
-            "Ковальчук О.В.", "Шевченко Т.Г.", "Мельник А.М."
-        ]
+        return list(DEFAULT_TEACHERS)
+    
+    def load_reference_bundle(self):
+        """
+        Завантаження всіх довідкових таблиць одним проходом.
+        Замість окремих запитів для кожного відділення виконується сталий набір
+        запитів (по одному на таблицю), а всі похідні словники будуються в пам'яті.
+        
+        Returns:
+            ReferenceBundle: Незмінний набір довідкових даних, спільний для всіх форм
+        """
+        return self._get_cached_or_fetch('reference_bundle', self._fetch_reference_bundle)
+    
+    def _fetch_reference_bundle(self):
+        """Завантаження набору довідкових даних з БД"""
+        print("Завантаження довідкових даних...")
+        
+        department_rows = []
+        group_rows = []
+        teachers = []
+        audiences = []
+        disciplines = []
+        
+        if self.is_connected():
+            # З тих самих рядків запам'ятовуються відбитки таблиць, з якими
+            # порівнює наступне "Оновити дані" (_fetch_signed_rows)
+            try:
+                department_rows = sorted((row[0], row[1]) for row in self._fetch_signed_rows('department') or [])
+                group_rows = [(self.fix_group_name(row[1]), row[2])
+                              for row in self._fetch_signed_rows('groups') or []]
+                teachers = [row[1] for row in self._fetch_signed_rows('teachers') or [] if row[1]]
+                audiences = [str(row[1]) for row in self._fetch_signed_rows('audiences') or []]
+                disciplines = [row[1] for row in self._fetch_signed_rows('discpline') or [] if row[1]]
+            except Exception as e:
+                print(f"Помилка при завантаженні довідкових даних: {e}")
+        
+        # Для порожніх таблиць використовуємо ті ж запасні дані, що й окремі методи
+        if not department_rows:
+            department_rows = list(DEFAULT_DEPARTMENTS.items())
+        if not group_rows:
+            dept_ids = {name: dept_id for dept_id, name in department_rows}
+            for dept_name, groups in DEFAULT_GROUPS.items():
+                if dept_name in dept_ids:
+                    group_rows.extend((group, dept_ids[dept_name]) for group in groups)
+        if not teachers:
+            teachers = list(DEFAULT_TEACHERS)
+        if not disciplines:
+            disciplines = self.get_default_disciplines()
+        
+        bundle = ReferenceBundle(department_rows, group_rows, teachers, audiences, sorted(disciplines))
+        print(f"Довідкові дані завантажено: {bundle}")
+        return bundle
@@ -0,0 +1,187 @@
+"""
+Визначення фактичних назв довідкових таблиць та їх колонок.
+
+Замість перебору можливих назв таблиць при кожному запуску схема
+визначається один раз і зберігається у файлі schema_cache.json разом з часом
+зміни та розміром файлу бази даних. Поки файл бази не змінився, наступні
+запуски одразу виконують один точний запит до потрібної таблиці.
+"""
+import json
+import os
+
+SCHEMA_CACHE_FILE = "schema_cache.json"
+
+# Версія формату файлу кешу (збільшується при зміні SCHEMA_CANDIDATES)
+SCHEMA_CACHE_VERSION = 1
+
+# Можливі назви таблиць та колонок для кожного довідника.
+# Таблиці перевіряються в порядку списку, потім - за ключовими словами в назві
+SCHEMA_CANDIDATES = {
+    "department": {
+        "tables": ["department", "Відділення"],
+        "keywords": ["відділ", "depart"],
+        "id": ["ID"],
+        "name": ["Name", "Назва"]
+    },
+    "groups": {
+        "tables": ["groups", "Групи"],
+        "keywords": ["груп", "group"],
+        "id": ["ID"],
+        "name": ["Name", "Назва"]
+    },
+    "teachers": {
+        "tables": ["teachers", "Викладачі", "Викладач", "Преподаватели"],
+        "keywords": ["виклад", "teacher", "препод"],
+        "id": ["ID"],
+        "name": ["PIB", "Name", "Прізвище", "ПІБ", "Викладач", "Назва"]
+    },
+    "audiences": {
+        "tables": ["audiences", "Аудиторії"],
+        "keywords": ["аудит", "audienc"],
+        "id": ["ID"],
+        "name": ["Number", "Номер", "Name"]
+    },
+    "discipline": {
+        "tables": ["discpline", "discipline", "disciplines", "Дисципліни"],
+        "keywords": ["дисципл", "discip", "discp"],
+        "id": ["ID_discpline", "ID"],
+        "name": ["Name", "Назва"]
+    }
+}
+
+# Стандартні таблиці та колонки ID/назви кожного довідника (перші кандидати),
+# використовуються, якщо схему бази даних не вдалося визначити
+COLUMN_MAPPINGS = {
+    entity: {"table": spec["tables"][0], "id": spec["id"][0], "name": spec["name"][0]}
+    for entity, spec in SCHEMA_CANDIDATES.items()
+}
+
+
+def schema_cache_key(db_path):
+    """Ключ кешу: шлях, час зміни та розмір файлу бази даних"""
+    try:
+        stat = os.stat(db_path)
+    except OSError:
+        return None
+    return {
+        "path": os.path.abspath(db_path),
+        "mtime": stat.st_mtime,
+        "size": stat.st_size,
+        "version": SCHEMA_CACHE_VERSION
+    }
+
+
+def _match_column(columns, candidates):
+    """Назва колонки з columns, що збігається з кандидатом (без урахування регістру)"""
+    by_lower = {str(column).lower(): column for column in columns}
+    for candidate in candidates:
+        if candidate.lower() in by_lower:
+            return by_lower[candidate.lower()]
+    return None
+
+
+def _match_table(tables, spec):
+    by_lower = {str(table).lower(): table for table in tables}
+    for candidate in spec["tables"]:
+        if candidate.lower() in by_lower:
+            return by_lower[candidate.lower()]
+    for table in tables:
+        table_lower = str(table).lower()
+        if any(keyword in table_lower for keyword in spec["keywords"]):
+            return table
+    return None
+
+
+def table_columns(conn, table):
+    """Назви колонок таблиці (запит без рядків)"""
+    cursor = conn.cursor()
+    try:
+        cursor.execute(f"SELECT * FROM [{table}] WHERE 1=0")
+        return [column[0] for column in cursor.description]
+    finally:
+        cursor.close()
+
+
+def discover_schema(backend, conn):
+    """
+    Визначення таблиць і колонок для всіх довідників.
+
+    Returns:
+        dict: {довідник: {"table", "id", "name"}}; довідники, для яких не
+              знайдено таблицю, у результат не потрапляють
+    """
+    tables = backend.list_tables(conn)
+    print(f"Доступні таблиці: {tables}")
+
+    schema = {}
+    for entity, spec in SCHEMA_CANDIDATES.items():
+        table = _match_table(tables, spec)
+        if table is None:
+            print(f"Не знайдено таблицю для довідника {entity}")
+            continue
+        try:
+            columns = table_columns(conn, table)
+        except Exception as e:
+            print(f"Помилка при читанні колонок таблиці {table}: {e}")
+            continue
+
+        name_column = _match_column(columns, spec["name"])
+        if name_column is None:
+            # Якщо не знайдено відповідної колонки, використовуємо другу (після ID) або першу
+            name_column = columns[1] if len(columns) > 1 else columns[0]
+            print(f"Не знайдено колонку з назвами в таблиці {table}, використовуємо {name_column}")
+        schema[entity] = {
+            "table": table,
+            "id": _match_column(columns, spec["id"]),
+            "name": name_column
+        }
+    return schema
+
+
+class SchemaCache:
+    """Збереження визначеної схеми у файлі JSON"""
+
+    def __init__(self, path):
+        self.path = path
+
+    def load(self, key):
+        """Збережена схема або None, якщо файл бази даних змінився"""
+        if key is None or not os.path.exists(self.path):
+            return None
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Не вдалося прочитати кеш схеми: {e}")
+            return None
+        if data.get("key") != key:
+            return None
+        return data.get("schema")
+
+    def save(self, key, schema):
+        if key is None:
+            return False
+        try:
+            with open(self.path, "w", encoding="utf-8") as f:
+                json.dump({"key": key, "schema": schema}, f, ensure_ascii=False, indent=2)
+            return True
+        except OSError as e:
+            # Наприклад, папка програми доступна тільки для читання
+            print(f"Не вдалося зберегти кеш схеми: {e}")
+            return False
+
+
+def resolve_schema(backend, conn, cache_path):
+    """
+    Схема бази даних з кешу, або визначена заново, якщо файл бази змінився.
+    """
+    cache = SchemaCache(cache_path)
+    key = schema_cache_key(backend.db_path)
+    schema = cache.load(key)
+    if schema is not None:
+        print("Схему бази даних взято з кешу")
+        return schema
+
+    schema = discover_schema(backend, conn)
+    cache.save(key, schema)
+    return schema
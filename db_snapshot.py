@@ -0,0 +1,141 @@
+"""
+Знімок довідкових таблиць з dataBase.mdb у локальний файл SQLite.
+
+Перший запуск копіює всі таблиці, наступні (re-sync) порівнюють кількість
+рядків і контрольну суму кожної таблиці з попереднім знімком та
+перезаписують тільки ті таблиці, що змінилися.
+
+Запуск з командного рядка:
+    python db_snapshot.py [--source dataBase.mdb] [--snapshot dataBase.sqlite] [--full]
+"""
+import argparse
+import datetime
+import os
+from db_backends import REFERENCE_SCHEMA, SQLiteBackend, create_backend, rows_checksum
+from db_manager import DatabaseManager
+
+# Службова таблиця з інформацією про останню синхронізацію кожної таблиці
+SNAPSHOT_META_TABLE = "_snapshot_meta"
+
+
+def default_snapshot_path():
+    """Стандартний шлях до знімка (поруч з програмою)"""
+    return os.path.join(DatabaseManager.get_application_path(), SQLiteBackend.default_filename)
+
+
+class SnapshotImporter:
+    """Копіювання довідкових таблиць з DatabaseManager у знімок SQLite"""
+
+    def __init__(self, source=None, snapshot_path=None):
+        self.source = source or DatabaseManager()
+        self.snapshot_path = snapshot_path or default_snapshot_path()
+        self.backend = SQLiteBackend(self.snapshot_path)
+
+    def _open_snapshot(self):
+        conn = self.backend.connect()
+        conn.execute(f"CREATE TABLE IF NOT EXISTS [{SNAPSHOT_META_TABLE}] ("
+                     "table_name TEXT PRIMARY KEY, row_count INTEGER, "
+                     "checksum TEXT, synced_at TEXT)")
+        conn.commit()
+        return conn
+
+    def read_meta(self, conn):
+        """Кількість рядків та контрольні суми з попередньої синхронізації"""
+        rows = conn.execute(f"SELECT table_name, row_count, checksum FROM [{SNAPSHOT_META_TABLE}]").fetchall()
+        return {row[0]: (row[1], row[2]) for row in rows}
+
+    def read_source_table(self, table):
+        """
+        Читання таблиці з джерела: фактична таблиця та колонки за схемою, визначеною
+        DatabaseManager, в порядку колонок знімка
+        """
+        source_table, columns = self.source.reference_source(table)
+        columns_sql = ", ".join(f"[{name}]" for name in columns)
+        return self.source.fetch_batched(f"SELECT {columns_sql} FROM [{source_table}]")
+
+    def sync(self, full=False, tables=None):
+        """
+        Синхронізація знімка з джерелом.
+
+        Args:
+            full (bool): Перезаписати всі таблиці незалежно від контрольних сум
+            tables (list): Таблиці для синхронізації (за замовчуванням - всі довідкові)
+
+        Returns:
+            dict: Результат для кожної таблиці: {"status", "rows", "checksum"},
+                  де status - "copied", "unchanged" або "error"
+        """
+        tables = tables or list(REFERENCE_SCHEMA)
+        report = {}
+        conn = self._open_snapshot()
+        try:
+            meta = self.read_meta(conn)
+            for table in tables:
+                rows = self.read_source_table(table)
+                if rows is None:
+                    print(f"Не вдалося прочитати таблицю {table} з джерела, знімок не змінено")
+                    report[table] = {"status": "error", "rows": None, "checksum": None}
+                    continue
+
+                checksum = rows_checksum(rows)
+                if not full and meta.get(table) == (len(rows), checksum):
+                    report[table] = {"status": "unchanged", "rows": len(rows), "checksum": checksum}
+                    continue
+
+                self._write_table(conn, table, rows, checksum)
+                print(f"Таблицю {table} скопійовано у знімок: {len(rows)} рядків")
+                report[table] = {"status": "copied", "rows": len(rows), "checksum": checksum}
+        finally:
+            conn.close()
+        return report
+
+    def _write_table(self, conn, table, rows, checksum):
+        """Перезапис однієї таблиці знімка в окремій транзакції"""
+        columns = [name for name, _ in REFERENCE_SCHEMA[table]]
+        columns_sql = ", ".join(f"[{name}]" for name in columns)
+        placeholders = ", ".join("?" for _ in columns)
+        with conn:
+            conn.execute(f"DELETE FROM [{table}]")
+            conn.executemany(f"INSERT INTO [{table}] ({columns_sql}) VALUES ({placeholders})", rows)
+            conn.execute(f"INSERT OR REPLACE INTO [{SNAPSHOT_META_TABLE}] "
+                         "(table_name, row_count, checksum, synced_at) VALUES (?, ?, ?, ?)",
+                         (table, len(rows), checksum, datetime.datetime.now().isoformat(timespec="seconds")))
+
+
+def sync_snapshot(source=None, snapshot_path=None, full=False):
+    """Синхронізація знімка з базою даних (див. SnapshotImporter.sync)"""
+    return SnapshotImporter(source, snapshot_path).sync(full=full)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Знімок довідкових таблиць бази даних у файл SQLite")
+    parser.add_argument("--source", help="Шлях до бази даних-джерела (за замовчуванням dataBase.mdb)")
+    parser.add_argument("--snapshot", help="Шлях до файлу знімка (за замовчуванням dataBase.sqlite)")
+    parser.add_argument("--full", action="store_true", help="Скопіювати всі таблиці без перевірки змін")
+    args = parser.parse_args(argv)
+
+    try:
+        backend = create_backend(args.source) if args.source else DatabaseManager.create_default_backend()
+    except ValueError as e:
+        print(f"Помилка бази даних: {e}")
+        return 2
+    if not backend.exists() and not any(os.path.exists(path) for path in backend.candidate_paths()):
+        print(f"Файл бази даних-джерела не знайдено: {backend.db_path}")
+        return 2
+
+    # Повідомлення DatabaseManager виводяться в консоль, а не у вікнах Tk
+    DatabaseManager.interactive = False
+    source = DatabaseManager(backend)
+    if not source.is_connected():
+        print(f"Не вдалося підключитися до бази даних-джерела {source.db_path}, знімок не змінено")
+        return 2
+    report = sync_snapshot(source, args.snapshot, full=args.full)
+
+    for table, result in report.items():
+        rows = result["rows"] if result["rows"] is not None else "-"
+        print(f"{table:12} {result['status']:10} рядків: {rows}")
+    return 1 if any(result["status"] == "error" for result in report.values()) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
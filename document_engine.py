@@ -0,0 +1,720 @@
+"""
+Формування бланку замін (.docx) без графічного інтерфейсу.
+
+Дані бланку передаються звичайним об'єктом ReplacementDay, а довідкові дані
+(структура відділень та відповідність група -> відділення) - один раз при
+створенні DocumentEngine. Модуль не залежить від Tk, тому бланки можна
+формувати з форми замін, з пакетних скриптів та з окремих процесів.
+"""
+import datetime
+import functools
+import io
+import os
+import re
+from types import SimpleNamespace
+from xml.sax.saxutils import escape
+
+MONTHS_UA = {
+    'січня': 1, 'лютого': 2, 'березня': 3, 'квітня': 4,
+    'травня': 5, 'червня': 6, 'липня': 7, 'серпня': 8,
+    'вересня': 9, 'жовтня': 10, 'листопада': 11, 'грудня': 12
+}
+
+# Папки місяців у папці навчального року (Zaminy/<рік>/<NN-Місяць>)
+MONTH_FOLDERS = {
+    "січня": "01-Січень", "лютого": "02-Лютий", "березня": "03-Березень",
+    "квітня": "04-Квітень", "травня": "05-Травень", "червня": "06-Червень",
+    "липня": "07-Липень", "серпня": "08-Серпень", "вересня": "09-Вересень",
+    "жовтня": "10-Жовтень", "листопада": "11-Листопад", "грудня": "12-Грудень"
+}
+
+# Назви місяців у родовому відмінку ("14 жовтня") за номером місяця
+MONTH_NAMES = sorted(MONTHS_UA, key=MONTHS_UA.get)
+
+WEEKDAY_NAMES = ["понеділок", "вівторок", "середа", "четвер", "п'ятниця", "субота", "неділя"]
+
+WEEKDAYS_UA = dict(enumerate(WEEKDAY_NAMES[:5]))
+
+# Відділення, заміни якого займають всю ширину таблиці
+GENERAL_EDU_NAME = "Загальноосвітньої підготовки"
+
+# Ширина колонок таблиці замін (група, пара, предмет - двічі), см
+COLUMN_WIDTHS_CM = (1.5, 1.0, 6.5, 1.5, 1.0, 6.5)
+
+# python-docx імпортується тільки при формуванні першого бланку,
+# щоб не сповільнювати запуск програми
+_docx = None
+
+
+def load_docx():
+    """Класи та функції python-docx, потрібні для бланку"""
+    global _docx
+    if _docx is None:
+        from docx import Document
+        from docx.shared import Pt, Cm, Emu
+        from docx.enum.text import WD_ALIGN_PARAGRAPH
+        from docx.oxml import parse_xml
+        from docx.oxml.ns import nsdecls
+        _docx = SimpleNamespace(Document=Document, Pt=Pt, Cm=Cm, Emu=Emu,
+                                WD_ALIGN_PARAGRAPH=WD_ALIGN_PARAGRAPH,
+                                parse_xml=parse_xml, nsdecls=nsdecls)
+    return _docx
+
+
+# Заготовка бланку (.docx в пам'яті): стилі, поля сторінки, гриф
+# "ЗАТВЕРДЖУЮ" та заголовок. Однакова для всіх бланків, тому будується
+# один раз на процес, а кожен новий бланк завантажується з неї.
+_skeleton = None
+
+
+def document_skeleton():
+    """Байти заготовки бланку (див. DocumentEngine.new_document)"""
+    global _skeleton
+    if _skeleton is None:
+        d = load_docx()
+        doc = d.Document()
+
+        # Встановлюємо шрифт для всього документа
+        font = doc.styles['Normal'].font
+        font.name = 'Times New Roman'
+        font.size = d.Pt(12)
+
+        # Налаштовуємо поля сторінки
+        for section in doc.sections:
+            section.top_margin = d.Cm(1)
+            section.bottom_margin = d.Cm(1)
+            section.left_margin = d.Cm(1.5)
+            section.right_margin = d.Cm(1.5)
+
+        _add_letterhead(doc)
+        _add_title(doc, "Зміни до розкладу занять")
+
+        buffer = io.BytesIO()
+        doc.save(buffer)
+        _skeleton = buffer.getvalue()
+    return _skeleton
+
+
+def format_date_text(date):
+    """Дата словами, як у головній формі: "14 жовтня 2025 року\""""
+    return f"{date.day} {MONTH_NAMES[date.month - 1]} {date.year} року"
+
+
+def weekday_name(date):
+    return WEEKDAY_NAMES[date.weekday()]
+
+
+def academic_year_for(date):
+    """Навчальний рік дати у форматі папки: "2025-2026\""""
+    start = date.year if date.month >= 9 else date.year - 1
+    return f"{start}-{start + 1}"
+
+
+def parse_date_from_text(date_text, year=None):
+    """
+    Дата з тексту формату "день місяць [рік року]".
+    Якщо рік у тексті не вказано, використовується year або поточний рік.
+    """
+    try:
+        date_parts = date_text.split()
+        if len(date_parts) >= 2:
+            day = int(date_parts[0])
+            month_name = date_parts[1].rstrip(',')
+
+            if month_name in MONTHS_UA:
+                if len(date_parts) >= 3 and date_parts[2].isdigit():
+                    year = int(date_parts[2])
+                return datetime.date(year or datetime.date.today().year, MONTHS_UA[month_name], day)
+        return None
+    except (ValueError, AttributeError):
+        return None
+
+
+def default_base_date(target_date):
+    """Перший понеділок вересня навчального року, до якого належить target_date"""
+    current_year = target_date.year
+    if target_date.month < 9:  # Якщо до вересня, то попередній навчальний рік
+        current_year -= 1
+    base_date = datetime.date(current_year, 9, 1)
+    while base_date.weekday() != 0:  # 0 = понеділок
+        base_date += datetime.timedelta(days=1)
+    return base_date
+
+
+def saturday_schedule_day(target_date, base_date=None):
+    """
+    День тижня, за розкладом якого проводяться суботні пари.
+    Цикл: понеділок → вівторок → середа → четвер → п'ятниця → знову понеділок,
+    один крок на кожен тиждень від базової дати.
+    """
+    if base_date is None:
+        base_date = default_base_date(target_date)
+    weeks_passed = (target_date - base_date).days // 7
+    return WEEKDAYS_UA[weeks_passed % 5]
+
+
+def document_filename(date_text):
+    """Назва файлу бланку у форматі "день місяць.docx\""""
+    date_parts = date_text.split()
+    if len(date_parts) >= 2:
+        return f"{date_parts[0]} {date_parts[1]}.docx"
+    return f"{date_text}.docx"
+
+
+def output_path(replacements_dir, academic_year, date_text, create=True):
+    """
+    Шлях до файлу бланку: <replacements_dir>/<навчальний рік>/<NN-Місяць>/<день місяць>.docx.
+    Якщо місяць не розпізнано, файл зберігається в папці навчального року.
+    """
+    year_dir = os.path.join(replacements_dir, academic_year)
+    date_parts = date_text.split()
+    month_folder = MONTH_FOLDERS.get(date_parts[1], "") if len(date_parts) >= 2 else ""
+    target_dir = os.path.join(year_dir, month_folder) if month_folder else year_dir
+    if create:
+        os.makedirs(target_dir, exist_ok=True)
+    return os.path.join(target_dir, document_filename(date_text))
+
+
+def replacement_text(discipline, audience):
+    """Текст комірки предмета: "дисципліна, ауд. N\""""
+    audience = audience.strip()
+    if discipline and audience:
+        return f"{discipline}, ауд. {audience}"
+    if discipline:
+        return discipline
+    if audience:
+        return f"ауд. {audience}"
+    return ""
+
+
+class ReplacementDay:
+    """
+    Дані одного бланку замін.
+
+    Заміни - словники з ключами group, lesson, discipline та audience
+    (як у списку замін форми).
+    """
+
+    def __init__(self, date_text, weekday, week_type, duty_group="", duty_teacher="",
+                 dorm_teacher="", replacements=None, edu_practice="", practice_type="Виробнича",
+                 practice_info="", base_date=None):
+        """
+        Args:
+            date_text (str): Дата, наприклад "14 жовтня 2025 року"
+            weekday (str): День тижня ("субота" для суботніх замін)
+            week_type (str): Тип тижня (чисельник/знаменник)
+            duty_group, duty_teacher, dorm_teacher (str): Чергові
+            replacements (list): Заміни
+            edu_practice, practice_type, practice_info (str): Дані про практику
+            base_date (datetime.date): Перший понеділок циклу суботніх пар
+        """
+        self.date_text = date_text
+        self.weekday = weekday
+        self.week_type = week_type
+        self.duty_group = duty_group
+        self.duty_teacher = duty_teacher
+        self.dorm_teacher = dorm_teacher
+        self.replacements = [dict(replacement) for replacement in replacements or []]
+        self.edu_practice = edu_practice
+        self.practice_type = practice_type
+        self.practice_info = practice_info
+        self.base_date = base_date
+
+    @property
+    def is_saturday(self):
+        return bool(self.weekday) and self.weekday.lower() == "субота"
+
+    @property
+    def filename(self):
+        return document_filename(self.date_text)
+
+    def date_line(self):
+        """Рядок з датою та типом тижня під заголовком бланку"""
+        date_parts = self.date_text.split()
+        short_date = f"{date_parts[0]} {date_parts[1]}" if len(date_parts) >= 2 else self.date_text
+
+        # Суботні пари проводяться за розкладом одного з днів тижня
+        if self.is_saturday and self.base_date is not None:
+            target_date = parse_date_from_text(self.date_text)
+            if target_date:
+                schedule_day = saturday_schedule_day(target_date, self.base_date)
+                return f"на {short_date}, суботу, за {schedule_day}\nзаняття за {self.week_type.lower()}"
+        return f"на {short_date}, {self.weekday}\nнавчання за {self.week_type.lower()}"
+
+    def to_dict(self):
+        """Дані бланку у вигляді словника (для JSON та передачі між процесами)"""
+        return {
+            "date_text": self.date_text,
+            "weekday": self.weekday,
+            "week_type": self.week_type,
+            "duty_group": self.duty_group,
+            "duty_teacher": self.duty_teacher,
+            "dorm_teacher": self.dorm_teacher,
+            "replacements": [dict(replacement) for replacement in self.replacements],
+            "edu_practice": self.edu_practice,
+            "practice_type": self.practice_type,
+            "practice_info": self.practice_info,
+            "base_date": self.base_date.strftime("%d.%m.%Y") if self.base_date else None
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        data = dict(data)
+        base_date = data.pop("base_date", None)
+        if isinstance(base_date, str) and base_date:
+            base_date = datetime.datetime.strptime(base_date, "%d.%m.%Y").date()
+        return cls(base_date=base_date or None, **data)
+
+
+class DocumentEngine:
+    """
+    Побудова бланку замін python-docx за даними ReplacementDay.
+
+    Довідкові дані зберігаються як звичайні словники та кортежі, тому
+    об'єкт можна передати в інший процес.
+    """
+
+    def __init__(self, department_structure, group_to_department):
+        """
+        Args:
+            department_structure: Відділення (словники з ключами id, name, order, has_groups)
+            group_to_department: Словник назва групи -> назва відділення
+        """
+        self.department_structure = tuple(dict(dept) for dept in department_structure)
+        self.group_to_department = dict(group_to_department)
+
+    @classmethod
+    def from_reference(cls, reference):
+        """Рушій для набору довідкових даних ReferenceBundle"""
+        return cls(reference.department_structure, reference.group_to_department)
+
+    @property
+    def departments(self):
+        return [dept["name"] for dept in self.department_structure]
+
+    def bucket(self, replacements):
+        """
+        Розподіл замін по відділеннях за словником група -> відділення.
+
+        Returns:
+            tuple: (словник відділення -> заміни, групи без відділення)
+        """
+        dept_replacements = {dept: [] for dept in self.departments}
+        unknown_groups = []
+        for replacement in replacements:
+            group = replacement["group"]
+            dept = self.group_to_department.get(group)
+            if dept in dept_replacements:
+                dept_replacements[dept].append(replacement)
+            elif group not in unknown_groups:
+                unknown_groups.append(group)
+        return dept_replacements, unknown_groups
+
+    def unknown_groups(self, day):
+        """Групи, заміни яких не потраплять до бланку (відділення невідоме)"""
+        return self.bucket(day.replacements)[1]
+
+    def build(self, day):
+        """
+        Документ Word з бланком замін.
+        Заміни для груп без відділення до бланку не потрапляють.
+
+        Raises:
+            ValueError: Немає відділень у довідкових даних
+        """
+        if not self.department_structure:
+            raise ValueError("Немає відділень у базі даних")
+
+        doc = self.new_document()
+        _add_title(doc, day.date_line())
+        dept_replacements, _ = self.bucket(day.replacements)
+        self._add_main_table(doc, day, dept_replacements)
+        return doc
+
+    def save(self, day, path):
+        """Формування бланку та збереження у файл path"""
+        self.build(day).save(path)
+        return path
+
+    def save_to_dir(self, day, replacements_dir, academic_year):
+        """Збереження бланку в папку місяця навчального року (див. output_path)"""
+        return self.save(day, output_path(replacements_dir, academic_year, day.date_text))
+
+    @staticmethod
+    def new_document():
+        """Новий документ з заготовки: гриф та заголовок вже додані"""
+        return load_docx().Document(io.BytesIO(document_skeleton()))
+
+    def _ordered_departments(self):
+        """Відділення загальноосвітньої підготовки та інші відділення за порядком"""
+        ordered_departments = []
+        general_edu_dept = None
+        for dept_info in sorted(self.department_structure, key=lambda x: x["order"]):
+            if GENERAL_EDU_NAME in dept_info["name"]:
+                general_edu_dept = dept_info["name"]
+            else:
+                ordered_departments.append(dept_info["name"])
+        return general_edu_dept, ordered_departments
+
+    @staticmethod
+    def _flatten(replacements):
+        """
+        Заміни, згруповані за групами (групи за алфавітом); назва групи
+        вказується тільки в першому рядку групи.
+        """
+        grouped = {}
+        for repl in replacements:
+            grouped.setdefault(repl["group"], []).append(repl)
+        return grouped, [
+            {
+                'group': group_name if idx == 0 else '',
+                'lesson': repl['lesson'],
+                'discipline': repl.get('discipline', ''),
+                'audience': repl.get('audience', '')
+            }
+            for group_name in sorted(grouped)
+            for idx, repl in enumerate(grouped[group_name])
+        ]
+
+    def _add_main_table(self, doc, day, dept_replacements):
+        general_edu_dept, ordered_departments = self._ordered_departments()
+
+        # Розраховуємо кількість рядків для таблиці
+        total_rows = 0
+
+        # Рядки для Загальноосвітньої підготовки
+        if general_edu_dept:
+            total_rows += 1  # Заголовок
+            total_rows += max(1, len(dept_replacements.get(general_edu_dept, [])))  # Мінімум 1 порожній рядок
+
+        # Рядки для інших відділень (по 2 в рядку)
+        num_departments = len(ordered_departments)
+        num_rows = (num_departments + 1) // 2
+        for row_idx in range(num_rows):
+            total_rows += 1  # Заголовки
+            pair = ordered_departments[row_idx * 2:row_idx * 2 + 2]
+            max_repls = max(len(dept_replacements.get(dept_name, [])) for dept_name in pair)
+            total_rows += max(1, max_repls)
+
+        # Рядки для практик та чергових
+        total_rows += 5  # 2 для практик + 3 для чергових
+
+        table = _MainTable(total_rows, [int(width * 567) for width in COLUMN_WIDTHS_CM])
+
+        current_row = 0
+        if general_edu_dept:
+            current_row = self._fill_general_edu(table, current_row, general_edu_dept,
+                                                 dept_replacements.get(general_edu_dept, []))
+        for row_idx in range(num_rows):
+            pair = ordered_departments[row_idx * 2:row_idx * 2 + 2]
+            current_row = self._fill_department_pair(table, current_row, pair, dept_replacements)
+        self._fill_footer(table, current_row, day)
+        table.insert_into(doc)
+
+    def _fill_general_edu(self, table, current_row, dept_name, replacements):
+        """Відділення загальноосвітньої підготовки: групи по черзі в лівій і правій частині"""
+        header_cell = table.merge(current_row, 0, 5)
+        _add_text_to_cell(header_cell, dept_name, bold=True, gray_fill=True)
+        _add_borders(header_cell, top=True, bottom=True, left=True, right=True)
+        current_row += 1
+
+        grouped, _ = self._flatten(replacements)
+        if grouped:
+            # Розподіляємо групи по колонках (ліва та права частина)
+            sorted_groups = sorted(grouped)
+            sides = [
+                self._flatten([repl for group in sorted_groups[0::2] for repl in grouped[group]])[1],
+                self._flatten([repl for group in sorted_groups[1::2] for repl in grouped[group]])[1]
+            ]
+
+            for row_idx in range(max(len(side) for side in sides)):
+                for side_idx, side in enumerate(sides):
+                    start_col = side_idx * 3
+                    if row_idx < len(side):
+                        repl = side[row_idx]
+
+                        group_cell = table.cell(current_row, start_col)
+                        _add_text_to_cell(group_cell, repl['group'])
+                        _add_borders(group_cell, left=True)
+
+                        _add_text_to_cell(table.cell(current_row, start_col + 1), repl['lesson'])
+
+                        text_cell = table.cell(current_row, start_col + 2)
+                        _add_text_to_cell(text_cell, replacement_text(repl['discipline'], repl['audience']),
+                                          align_left=True)
+                        _add_borders(text_cell, right=True)
+                    else:
+                        # Порожні комірки
+                        for col in range(start_col, start_col + 3):
+                            cell = table.cell(current_row, col)
+                            _add_text_to_cell(cell, "")
+                            if col == start_col:
+                                _add_borders(cell, left=True)
+                            elif col == start_col + 2:
+                                _add_borders(cell, right=True)
+                current_row += 1
+        else:
+            # Порожній рядок
+            for col in range(6):
+                cell = table.cell(current_row, col)
+                _add_text_to_cell(cell, "")
+                _add_borders(cell, left=col in (0, 3), right=col in (2, 5))
+            current_row += 1
+
+        self._add_bottom_border(table, current_row - 1)
+        return current_row
+
+    def _fill_department_pair(self, table, current_row, pair, dept_replacements):
+        """Два відділення поруч: заголовки та заміни кожного у своїй половині таблиці"""
+        for col_idx, dept_name in enumerate(pair):
+            start_col = col_idx * 3
+            header_cell = table.merge(current_row, start_col, start_col + 2)
+            _add_text_to_cell(header_cell, dept_name, bold=True, gray_fill=True)
+            _add_borders(header_cell, top=True, bottom=True, left=True, right=True)
+        current_row += 1
+
+        dept_repls_list = [[], []]
+        for col_idx, dept_name in enumerate(pair):
+            dept_repls_list[col_idx] = self._flatten(dept_replacements.get(dept_name, []))[1]
+        max_repls = max(len(flat_list) for flat_list in dept_repls_list)
+
+        for repl_idx in range(max(1, max_repls)):
+            for col_idx in range(2):
+                start_col = col_idx * 3
+
+                if repl_idx < len(dept_repls_list[col_idx]):
+                    repl = dept_repls_list[col_idx][repl_idx]
+
+                    group_cell = table.cell(current_row, start_col)
+                    _add_text_to_cell(group_cell, repl['group'])
+                    _add_borders(group_cell, left=True, right=True)
+
+                    lesson_cell = table.cell(current_row, start_col + 1)
+                    _add_text_to_cell(lesson_cell, repl['lesson'])
+                    _add_borders(lesson_cell, right=True)
+
+                    text_cell = table.cell(current_row, start_col + 2)
+                    _add_text_to_cell(text_cell, replacement_text(repl['discipline'], repl['audience']),
+                                      align_left=True)
+                    _add_borders(text_cell, right=True)
+                else:
+                    # Порожні комірки
+                    for sub_col in range(3):
+                        cell = table.cell(current_row, start_col + sub_col)
+                        _add_text_to_cell(cell, "")
+                        _add_borders(cell, left=sub_col == 0, right=True)
+            current_row += 1
+
+        self._add_bottom_border(table, current_row - 1)
+        return current_row
+
+    @staticmethod
+    def _add_bottom_border(table, row):
+        for col in range(6):
+            _add_borders(table.cell(row, col), bottom=True, left=col in (0, 3), right=col in (2, 5))
+
+    def _fill_footer(self, table, current_row, day):
+        """Рядки практик та чергових"""
+        # Практики
+        for start_col, text in ((0, "НАВЧАЛЬНА ПРАКТИКА"), (3, "ВИРОБНИЧА ПРАКТИКА")):
+            cell = table.merge(current_row, start_col, start_col + 2)
+            _add_text_to_cell(cell, text, bold=True, gray_fill=True)
+            _add_borders(cell, top=True, bottom=True, left=True, right=True)
+        current_row += 1
+
+        for start_col in (0, 3):
+            cell = table.merge(current_row, start_col, start_col + 2)
+            _add_text_to_cell(cell, "--------")
+            _add_borders(cell, top=True, bottom=True, left=True, right=True)
+        current_row += 1
+
+        # Чергові
+        for text in (f"Чергова група: {day.duty_group}",
+                     f"Черговий викладач: {day.duty_teacher}",
+                     f"Черговий викладач у гуртожитках: {day.dorm_teacher}"):
+            cell = table.merge(current_row, 0, 5)
+            _add_text_to_cell(cell, text, bold=False, align_left=True)
+            _add_borders(cell, top=True, bottom=True, left=True, right=True)
+            current_row += 1
+
+
+def _add_letterhead(doc):
+    """Гриф "ЗАТВЕРДЖУЮ" у правій частині таблиці без меж"""
+    d = load_docx()
+
+    header_table = doc.add_table(rows=1, cols=2)
+    header_table.style = 'Normal Table'
+
+    for row in header_table.rows:
+        for cell in row.cells:
+            tcPr = cell._tc.get_or_add_tcPr()
+            tcBorders = tcPr.first_child_found_in("w:tcBorders")
+            if tcBorders:
+                tcBorders.getparent().remove(tcBorders)
+
+    right_cell = header_table.rows[0].cells[1]
+    lines = [("ЗАТВЕРДЖУЮ", True),
+             ("Заступник директора з навчальної роботи", False),
+             ("Балдич Л. В.", False)]
+    for index, (text, bold) in enumerate(lines):
+        para = right_cell.paragraphs[0] if index == 0 else right_cell.add_paragraph()
+        para.alignment = d.WD_ALIGN_PARAGRAPH.RIGHT
+        run = para.add_run(text)
+        if bold:
+            run.bold = True
+        run.font.size = d.Pt(8)
+        para.paragraph_format.space_after = d.Pt(0)
+        para.paragraph_format.line_spacing = 1.0
+
+
+def _add_title(doc, text):
+    """Рядок заголовка бланку (назва або дата)"""
+    d = load_docx()
+    para = doc.add_paragraph()
+    para.alignment = d.WD_ALIGN_PARAGRAPH.CENTER
+    run = para.add_run(text)
+    run.bold = True
+    run.font.size = d.Pt(15)
+    para.paragraph_format.space_after = d.Pt(3)
+    para.paragraph_format.line_spacing = 1.0
+
+
+# Готові фрагменти WordprocessingML для основної таблиці
+_TBL_PR = ('<w:tblPr><w:tblStyle w:val="{style}"/><w:tblW w:type="auto" w:w="0"/>'
+           '<w:tblLayout w:type="fixed"/>'
+           '<w:tblLook w:firstColumn="1" w:firstRow="1" w:lastColumn="0" w:lastRow="0"'
+           ' w:noHBand="0" w:noVBand="1" w:val="04A0"/><w:tblW w:w="0" w:type="auto"/></w:tblPr>')
+_BORDER_ON = '<w:{side} w:val="single" w:sz="4" w:space="0" w:color="000000"/>'
+_BORDER_OFF = '<w:{side} w:val="nil"/>'
+_CELL_CENTER = '<w:vAlign w:val="center"/>'
+_GRAY_FILL = '<w:shd w:fill="D3D3D3"/>'
+_PARAGRAPH = '<w:p><w:pPr><w:jc w:val="{align}"/></w:pPr><w:r><w:rPr>{bold}<w:sz w:val="22"/></w:rPr>'
+_RUN_BREAKS = re.compile(r"([\t\r\n])")
+
+
+class _Cell:
+    """Комірка основної таблиці: текст, форматування та межі"""
+
+    __slots__ = ("column", "span", "text", "bold", "gray_fill", "align_left", "borders")
+
+    def __init__(self, column):
+        self.column = column
+        self.span = 1
+        self.text = None  # None - комірка без тексту (порожній абзац)
+        self.bold = False
+        self.gray_fill = False
+        self.align_left = False
+        self.borders = []
+
+
+class _MainTable:
+    """
+    Основна таблиця бланку, що записується одразу в WordprocessingML.
+
+    Комірки заповнюються так само, як у таблиці python-docx (cell, merge),
+    але XML всієї таблиці складається з готових фрагментів і додається в
+    документ одним елементом. Створення окремих OxmlElement та parse_xml для
+    кожної комірки, а також пошук комірки через table.cell() (перебір усієї
+    таблиці) не потрібні. Фрагменти відтворюють розмітку, яку формував
+    python-docx, тому документ не змінюється.
+    """
+
+    def __init__(self, rows, col_widths):
+        self.col_widths = col_widths
+        self.rows = [[_Cell(col) for col in range(len(col_widths))] for _ in range(rows)]
+
+    def cell(self, row, col):
+        # Колонка всередині об'єднаної комірки належить цій комірці
+        while self.rows[row][col] is None:
+            col -= 1
+        return self.rows[row][col]
+
+    def merge(self, row, first_col, last_col):
+        """Об'єднання комірок рядка з first_col по last_col включно"""
+        cell = self.cell(row, first_col)
+        for col in range(cell.column + cell.span, last_col + 1):
+            self.rows[row][col] = None
+        cell.span = last_col - cell.column + 1
+        return cell
+
+    def to_xml(self, style_id, cell_width):
+        """
+        XML елемента w:tbl.
+
+        Args:
+            style_id (str): Ідентифікатор стилю таблиці
+            cell_width (int): Початкова ширина комірки (twips), як у doc.add_table
+        """
+        parts = [f'<w:tbl {load_docx().nsdecls("w")}>', _TBL_PR.format(style=style_id), '<w:tblGrid>']
+        parts.extend(f'<w:gridCol w:w="{width}"/>' for width in self.col_widths)
+        parts.append('</w:tblGrid>')
+        for row in self.rows:
+            parts.append('<w:tr>')
+            for cell in row:
+                if cell is not None:
+                    self._cell_xml(parts, cell, cell_width)
+            parts.append('</w:tr>')
+        parts.append('</w:tbl>')
+        return "".join(parts)
+
+    def _cell_xml(self, parts, cell, cell_width):
+        parts.append(f'<w:tc><w:tcPr><w:tcW w:type="dxa" w:w="{cell_width * cell.span}"/>'
+                     f'<w:tcW w:w="{self.col_widths[cell.column]}" w:type="dxa"/>')
+        if cell.span > 1:
+            parts.append(f'<w:gridSpan w:val="{cell.span}"/>')
+        if cell.text is not None:
+            parts.append(_CELL_CENTER)
+            if cell.gray_fill:
+                parts.append(_GRAY_FILL)
+        parts.extend(cell.borders)
+        parts.append('</w:tcPr>')
+
+        if cell.text is None:
+            parts.append('<w:p/></w:tc>')
+            return
+        parts.append(_PARAGRAPH.format(align="left" if cell.align_left else "center",
+                                       bold="<w:b/>" if cell.bold else ""))
+        # Табуляція та перенос рядка - окремі елементи, як у python-docx
+        for chunk in _RUN_BREAKS.split(cell.text):
+            if chunk == "\t":
+                parts.append('<w:tab/>')
+            elif chunk in ("\r", "\n"):
+                parts.append('<w:br/>')
+            elif chunk:
+                space = ' xml:space="preserve"' if len(chunk.strip()) < len(chunk) else ''
+                parts.append(f'<w:t{space}>{escape(chunk)}</w:t>')
+        parts.append('</w:r></w:p></w:tc>')
+
+    def insert_into(self, doc):
+        """Додавання таблиці в кінець документа (перед параметрами розділу)"""
+        d = load_docx()
+        section = doc.sections[-1]
+        block_width = section.page_width - section.left_margin - section.right_margin
+        cell_width = d.Emu(block_width // len(self.col_widths)).twips
+
+        tbl = d.parse_xml(self.to_xml(doc.styles['Table Grid'].style_id, cell_width))
+        body = doc.element.body
+        if body.sectPr is not None:
+            body.sectPr.addprevious(tbl)
+        else:
+            body.append(tbl)
+        return tbl
+
+
+@functools.lru_cache(maxsize=None)
+def _borders_xml(top, bottom, left, right):
+    borders_xml = '<w:tcBorders>'
+    for side, enabled in (("top", top), ("bottom", bottom), ("left", left), ("right", right)):
+        borders_xml += (_BORDER_ON if enabled else _BORDER_OFF).format(side=side)
+    return borders_xml + '</w:tcBorders>'
+
+
+def _add_borders(cell, top=False, bottom=False, left=False, right=False):
+    cell.borders.append(_borders_xml(top, bottom, left, right))
+
+
+def _add_text_to_cell(cell, text, bold=False, gray_fill=False, align_left=False):
+    cell.text = text
+    cell.bold = bold
+    cell.align_left = align_left
+    cell.gray_fill = gray_fill
@@ -1,8 +1,13 @@
 import tkinter as tk
-from tkinter import ttk, messagebox
-import pyodbc
-import os
-from db_manager import DatabaseManager
+from tkinter import ttk, messagebox, filedialog
+from db_manager import DatabaseManager, PAGE_SIZE
+from db_schema import COLUMN_MAPPINGS
+from background_loader import BackgroundLoader
+from bulk_import import load_import, apply_import, GROUP_DEPARTMENT_COLUMN
+from search_index import SearchSession, normalize
+from search_service import SearchService, HANDBOOK_INDEX_KEY
+from ui_utils import Debouncer
+from virtual_list import VirtualList
 
 # Константи для стилю
 APP_BG_COLOR = "#f0f0f0"  # Світло-сірий фон
@@ -16,6 +21,7 @@ DEFAULT_FONT = (FONT_FAMILY, 10)  # Звичайний шрифт
 HEADER_FONT = (FONT_FAMILY, 12, "bold")  # Шрифт для заголовків
 BUTTON_FONT = (FONT_FAMILY, 12, "bold")  # Шрифт для кнопок
 PADDING = 10  # Стандартний відступ
+TYPING_DELAY = 250  # Пауза в наборі (мс) перед пошуком у базі даних
 
 class HandbookForm(tk.Toplevel):
     def __init__(self, parent):
@@ -38,21 +44,25 @@ class HandbookForm(tk.Toplevel):
         self.style.configure('Treeview', font=DEFAULT_FONT, rowheight=25)
         self.style.configure('Treeview.Heading', font=BUTTON_FONT)
         
-        # Connect to database
-        self.db_path = os.path.abspath("dataBase.mdb")
-        self.conn_str = f'DRIVER={{Microsoft Access Driver (*.mdb, *.accdb)}};DBQ={self.db_path}'
-        
         # Current active table
         self.current_table = None
         self.current_data = []
+        self.filtered_data = []
+        
+        # Індекс назв поточної таблиці для фільтра
+        self.search_session = None
         
-        # Назви колонок для різних таблиць
-        self.column_mappings = {
-            "department": {"id": "ID", "name": "Name"},
-            "discipline": {"id": "ID_discpline", "name": "Name"},
-            "groups": {"id": "ID", "name": "Name"},
-            "teachers": {"id": "ID", "name": "PIB"}
-        }
+        # ID останнього завантаженого запису, якщо в таблиці є ще сторінки
+        self.next_after_id = None
+        
+        # Завантаження таблиць виконується у фоновому потоці
+        self.loader = BackgroundLoader(self)
+        self.load_task = None
+        self.search_task = None
+        self.debouncer = Debouncer(self, delay=TYPING_DELAY)
+        
+        # Назви колонок для різних таблиць (спільні з DatabaseManager)
+        self.column_mappings = COLUMN_MAPPINGS
         
         self.create_widgets()
     
@@ -120,20 +130,23 @@ class HandbookForm(tk.Toplevel):
         self.search_var.trace("w", self.filter_list)
         ttk.Entry(search_frame, textvariable=self.search_var, width=40, font=DEFAULT_FONT).pack(side=tk.LEFT, padx=5, fill=tk.X, expand=True)
         
+        # Пошук запитом до бази даних: таблиця не завантажується повністю,
+        # наступні сторінки отримуються тільки при прокрутці до кінця списку
+        self.server_search_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(search_frame, text="Шукати в базі даних", variable=self.server_search_var,
+                        command=self.refresh_list).pack(side=tk.LEFT, padx=5)
+        
         # Список елементів
         list_frame = ttk.Frame(right_panel)
         list_frame.pack(fill=tk.BOTH, expand=True, pady=PADDING)
         
         # Збільшуємо розмір шрифту для елементів списку
         list_font = (FONT_FAMILY, 12)  # Збільшений шрифт для списку
-        self.item_listbox = tk.Listbox(list_frame, width=50, height=20, font=list_font, 
-                                     bg='white', selectbackground=BUTTON_BG_COLOR, selectforeground='white')
-        self.item_listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        
-        # Скролбар для списку
-        scrollbar = ttk.Scrollbar(list_frame, orient=tk.VERTICAL, command=self.item_listbox.yview)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        self.item_listbox.config(yscrollcommand=scrollbar.set)
+        # Відображаються тільки видимі рядки, записи (ID, назва) зберігаються в пам'яті
+        self.item_listbox = VirtualList(list_frame, rows=20, text=lambda item: item[1], on_end=self.load_next_page,
+                                       width=50, font=list_font, bg='white',
+                                       selectbackground=BUTTON_BG_COLOR, selectforeground='white')
+        self.item_listbox.pack(fill=tk.BOTH, expand=True)
         
         # Кнопки для операцій CRUD
         button_frame = ttk.Frame(right_panel)
@@ -159,83 +172,176 @@ class HandbookForm(tk.Toplevel):
                               relief=tk.RAISED, borderwidth=2, padx=15, pady=8,  # Збільшено відступи
                               command=self.delete_item)
         delete_btn.pack(side=tk.LEFT, padx=10)  # Збільшено відступ між кнопками
+        
+        # Кнопка імпорту записів з файлу CSV/XLSX
+        import_btn = tk.Button(button_frame, text="Імпорт...", 
+                              bg=BUTTON_BG_COLOR, fg=BUTTON_FG_COLOR, font=BUTTON_FONT,
+                              relief=tk.RAISED, borderwidth=2, padx=15, pady=8,
+                              command=self.import_items)
+        import_btn.pack(side=tk.LEFT, padx=10)
     
     def load_table(self, table_name):
         self.current_table = table_name
         self.search_var.set("")  # Clear search field
         self.refresh_list()
     
-    def refresh_list(self):
+    def refresh_list(self, reload=False):
+        """
+        Завантаження записів поточної таблиці сторінками по PAGE_SIZE:
+        перша сторінка відображається одразу, решта довантажується у фоні.
+        
+        Args:
+            reload (bool): Скинути кешовані сторінки (після змін у таблиці)
+        """
         if not self.current_table:
             return
+        
+        # Результат попереднього завантаження вже не потрібен
+        for task in (self.load_task, self.search_task):
+            if task is not None:
+                task.cancel()
+        self.debouncer.cancel_all()
+        
+        if reload:
+            DatabaseManager().invalidate_pages(self.current_table)
+            SearchService().invalidate(HANDBOOK_INDEX_KEY.format(self.current_table))
+        
+        # Очищаємо список перед завантаженням нових даних
+        self.current_data = []
+        self.filtered_data = []
+        self.search_session = None
+        self.next_after_id = None
+        self.item_listbox.show_message("Завантаження...")
+        
+        self._request_page(self.current_table, None)
+    
+    def _request_page(self, table_name, after_id):
+        self.load_task = self.loader.submit(self._load_page, table_name, after_id, pass_task=True,
+                                            on_done=lambda rows: self._on_page_loaded(table_name, after_id, rows),
+                                            on_error=self._on_rows_error,
+                                            name=f"load_{table_name}")
+    
+    def _load_page(self, table_name, after_id, task):
+        """
+        Виконується у фоновому потоці: повертає пари (ID, назва) записів
+        з ID більшим за after_id. Вибираються тільки колонки ID та назви, а не SELECT *.
+        """
+        rows = DatabaseManager().fetch_id_name_page(table_name, after_id, PAGE_SIZE)
+        if rows is None:
+            raise RuntimeError(f"не вдалося прочитати таблицю {table_name}")
+        task.check_cancelled()
+        return rows
+    
+    def _on_page_loaded(self, table_name, after_id, rows):
+        # Користувач вже перейшов до іншої таблиці
+        if table_name != self.current_table:
+            return
+        
+        self.next_after_id = rows[-1][0] if len(rows) == PAGE_SIZE else None
+        if self.next_after_id is None:
+            print(f"Завантажено {len(self.current_data) + len(rows)} записів з таблиці {table_name}")
+        elif not self.server_search_var.get():
+            # Наступна сторінка запитується одразу, поки відображається поточна
+            self._request_page(table_name, self.next_after_id)
+        
+        if after_id is None:
+            self.current_data = list(rows)
+            # Спільний індекс: при повторному відкритті довідника сторінки вже проіндексовані
+            index = SearchService().get_page_index(table_name, self.current_data, 0)
+            self.search_session = SearchSession(index)
             
-        try:
-            conn = pyodbc.connect(self.conn_str)
-            cursor = conn.cursor()
-            
-            # Очищаємо список перед завантаженням нових даних
-            self.item_listbox.delete(0, tk.END)
-            
-            # Отримуємо назви колонок для поточної таблиці
-            id_col_name = self.column_mappings.get(self.current_table, {}).get("id", "ID")
-            name_col_name = self.column_mappings.get(self.current_table, {}).get("name", "Name")
-            
-            # Виконуємо запит
-            cursor.execute(f"SELECT * FROM [{self.current_table}]")
-            rows = cursor.fetchall()
-            columns = [column[0] for column in cursor.description]
-            
-            print(f"Стовпці таблиці {self.current_table}: {columns}")
-            
-            # Знаходимо індекси колонок ID та Name
-            id_col = None
-            name_col = None
-            
-            for i, col in enumerate(columns):
-                if col == id_col_name:
-                    id_col = i
-                elif col == name_col_name:
-                    name_col = i
-            
-            # Використовуємо знайдені індекси або значення за замовчуванням
-            if id_col is None:
-                id_col = 0
-            if name_col is None:
-                name_col = 1
-            
-            # Друкуємо інформацію про колонки
-            print(f"Використовуємо колонку ID: {id_col} ({columns[id_col] if id_col < len(columns) else 'unknown'})")
-            print(f"Використовуємо колонку Name: {name_col} ({columns[name_col] if name_col < len(columns) else 'unknown'})")
-            
-            # Створюємо дані та заповнюємо список
-            self.current_data = []
-            self.filtered_data = []  # Очищаємо відфільтровані дані
-            
-            for row in rows:
-                if len(row) > max(id_col, name_col):
-                    item_id = row[id_col]
-                    item_name = row[name_col] if row[name_col] else ""
-                    self.current_data.append((item_id, item_name))
-                    self.item_listbox.insert(tk.END, item_name)
-            
-            conn.close()
-        except Exception as e:
-            print(f"Помилка при завантаженні даних: {e}")
-            messagebox.showerror("Помилка", f"Помилка при завантаженні даних: {e}")
+            # Застосовуємо текст пошуку, введений під час завантаження
+            self.filter_list()
+            return
+        
+        offset = len(self.current_data)
+        self.current_data.extend(rows)
+        index = SearchService().get_page_index(table_name, self.current_data, offset)
+        if index is not self.search_session.index:
+            # Таблиця змінилася під час завантаження, індекс побудовано заново
+            self.search_session = SearchSession(index)
+        new_ids = range(offset, len(self.current_data))
+        
+        if self.server_search_var.get():
+            # Результати пошуку в базі даних вже повні
+            if self.filtered_data is self.current_data:
+                self.item_listbox.refresh()
+            return
+        
+        if self.filtered_data is not self.current_data:
+            # До результатів пошуку додаються тільки нові записи, що йому відповідають
+            search_text = self.search_var.get()
+            self.filtered_data.extend(self.current_data[i] for i in new_ids
+                                      if self.search_session.index.contains(i, search_text))
+            # Попередні збіги сесії вже неповні
+            self.search_session.reset()
+        
+        self.item_listbox.refresh()
+    
+    def load_next_page(self):
+        """Довантаження наступної сторінки при прокрутці до кінця списку (пошук у базі даних)"""
+        if (self.next_after_id is None or self.filtered_data is not self.current_data
+                or (self.load_task is not None and not self.load_task.finished)):
+            return
+        self._request_page(self.current_table, self.next_after_id)
+    
+    def _on_rows_error(self, error):
+        # Вже завантажені сторінки залишаються у списку
+        if not self.current_data:
+            self.item_listbox.set_items([])
+        print(f"Помилка при завантаженні даних: {error}")
+        messagebox.showerror("Помилка", f"Помилка при завантаженні даних: {error}")
+    
+    def destroy(self):
+        self.debouncer.cancel_all()
+        self.loader.close()
+        super().destroy()
     
     def filter_list(self, *args):
-        search_text = self.search_var.get().lower()
+        # Перша сторінка ще завантажується, фільтр застосується після її отримання
+        if self.search_session is None:
+            return
         
-        self.item_listbox.delete(0, tk.END)
+        search_text = self.search_var.get()
         
-        # Створюємо новий список для відфільтрованих даних
-        self.filtered_data = []
+        if not normalize(search_text):
+            self.debouncer.cancel("server_search")
+            if self.search_task is not None:
+                self.search_task.cancel()
+            self.filtered_data = self.current_data
+        elif self.server_search_var.get():
+            # Запит до бази даних виконується після паузи в наборі
+            self.debouncer.call("server_search", self._start_server_search)
+            return
+        else:
+            # Номери записів з індексу, у порядку таблиці
+            # (спільний індекс може містити ще не відображені сторінки)
+            matches = self.search_session.matches(search_text)
+            self.filtered_data = [self.current_data[i] for i in sorted(matches) if i < len(self.current_data)]
         
-        for item in self.current_data:
-            # Для всіх таблиць просто шукаємо в назві
-            if search_text in item[1].lower():
-                self.filtered_data.append(item)
-                self.item_listbox.insert(tk.END, item[1])
+        self.item_listbox.set_items(self.filtered_data)
+    
+    def _start_server_search(self):
+        if self.search_task is not None:
+            self.search_task.cancel()
+        
+        table_name = self.current_table
+        search_text = self.search_var.get()
+        self.search_task = self.loader.submit(
+            lambda: DatabaseManager().search_id_name_rows(table_name, search_text),
+            on_done=lambda rows: self._on_server_search_done(table_name, search_text, rows),
+            on_error=self._on_rows_error,
+            name=f"search_{table_name}")
+    
+    def _on_server_search_done(self, table_name, search_text, rows):
+        # Таблицю або текст пошуку вже змінено
+        if table_name != self.current_table or search_text != self.search_var.get():
+            return
+        if rows is None:
+            messagebox.showerror("Помилка", "Не вдалося виконати пошук у базі даних")
+            return
+        self.filtered_data = rows
+        self.item_listbox.set_items(self.filtered_data)
     
     def add_item(self):
         if not self.current_table:
@@ -247,34 +353,30 @@ class HandbookForm(tk.Toplevel):
         
         if dialog.result:
             try:
-                conn = pyodbc.connect(self.conn_str)
-                cursor = conn.cursor()
+                # Відділення перевіряється до початку транзакції: повідомлення
+                # не повинно показуватися, поки утримується блокування бази даних
+                dept_id = None
+                if self.current_table == "groups":
+                    dept_id = self._find_department_id(dialog.result[1])
+                    if dept_id is None:
+                        messagebox.showerror("Помилка", "Відділення не знайдено")
+                        return
                 
-                # Отримуємо назву колонки Name для поточної таблиці
-                name_col_name = self.column_mappings.get(self.current_table, {}).get("name", "Name")
+                # Таблиця та колонки з визначеної схеми бази даних
+                table, id_column, name_column = self._table_columns()
                 
-                if self.current_table == "groups":
-                    # Отримуємо ID відділення
-                    cursor.execute("SELECT ID FROM [department] WHERE Name = ?", (dialog.result[1],))
-                    dept_row = cursor.fetchone()
-                    if dept_row and len(dept_row) > 0:
-                        dept_id = dept_row[0]
-                        
+                with DatabaseManager().transaction() as cursor:
+                    if self.current_table == "groups":
                         # Додаємо запис з відділенням
-                        cursor.execute(f"INSERT INTO [{self.current_table}] ({name_col_name}, [Number Of Department]) VALUES (?, ?)", 
+                        cursor.execute(f"INSERT INTO {table} ({name_column}, [{GROUP_DEPARTMENT_COLUMN}]) VALUES (?, ?)", 
                                       (dialog.result[0], dept_id))
                     else:
-                        messagebox.showerror("Помилка", "Відділення не знайдено")
-                else:
-                    # Додаємо запис без відділення
-                    cursor.execute(f"INSERT INTO [{self.current_table}] ({name_col_name}) VALUES (?)", 
-                                  (dialog.result[0],))
-                
-                conn.commit()
-                conn.close()
+                        # Додаємо запис без відділення
+                        cursor.execute(f"INSERT INTO {table} ({name_column}) VALUES (?)", 
+                                      (dialog.result[0],))
                 
                 # Оновлюємо список
-                self.refresh_list()
+                self.refresh_list(reload=True)
                 
                 # Автоматично оновлюємо дані для всіх важливих таблиць
                 if self.current_table in ["department", "groups", "teachers", "audiences", "discpline", "discipline", "disciplines"]:
@@ -325,43 +427,28 @@ class HandbookForm(tk.Toplevel):
         if self.current_table == "groups":
             try:
                 # Отримуємо назву відділення для групи
-                conn = pyodbc.connect(self.conn_str)
-                cursor = conn.cursor()
-                
-                # Отримуємо дані про групу з бази даних
-                cursor.execute(f"SELECT * FROM [{self.current_table}] WHERE ID = {item_id}")
-                row = cursor.fetchone()
-                
-                # Отримуємо назву групи безпосередньо з бази даних
-                # Це гарантує, що ми використовуємо правильну назву групи
-                group_name = ""
-                if row and len(row) > 1:  # Перевіряємо, що є колонка з назвою
-                    # Знаходимо індекс колонки Name
-                    columns = [column[0] for column in cursor.description]
-                    name_col = None
-                    for i, col in enumerate(columns):
-                        if col == "Name":
-                            name_col = i
-                            break
+                table, id_column, name_column = self._table_columns()
+                dept_table, dept_id_column, dept_name_column = self._table_columns("department")
+                with DatabaseManager().borrow() as cursor:
+                    # Отримуємо назву групи та ID відділення безпосередньо з бази даних
+                    # Це гарантує, що ми використовуємо правильну назву групи
+                    cursor.execute(f"SELECT {name_column}, [{GROUP_DEPARTMENT_COLUMN}] FROM {table} WHERE {id_column} = ?",
+                                   (item_id,))
+                    row = cursor.fetchone()
                     
-                    if name_col is not None and name_col < len(row):
-                        group_name = row[name_col] if row[name_col] else ""
-                    else:
-                        group_name = row[1] if row[1] else ""  # За замовчуванням беремо другу колонку
-                
-                dept_name = ""
-                if row:
-                    # Знаходимо колонку з ID відділення (третя колонка)
-                    dept_id = row[2] if len(row) > 2 else None
-                    
-                    # Якщо є ID відділення, отримуємо його назву
-                    if dept_id:
-                        cursor.execute(f"SELECT Name FROM [department] WHERE ID = {dept_id}")
-                        dept_row = cursor.fetchone()
-                        if dept_row and len(dept_row) > 0:
-                            dept_name = dept_row[0]
-                
-                conn.close()
+                    group_name = ""
+                    dept_name = ""
+                    if row:
+                        group_name = row[0] if row[0] else ""
+                        dept_id = row[1]
+                        
+                        # Якщо є ID відділення, отримуємо його назву
+                        if dept_id:
+                            cursor.execute(f"SELECT {dept_name_column} FROM {dept_table} WHERE {dept_id_column} = ?",
+                                           (dept_id,))
+                            dept_row = cursor.fetchone()
+                            if dept_row and len(dept_row) > 0:
+                                dept_name = dept_row[0]
                 
                 # Використовуємо назву групи з бази даних, а не з фільтрованого списку
                 print(f"Використовуємо назву групи з бази даних: '{group_name}'")
@@ -375,44 +462,33 @@ class HandbookForm(tk.Toplevel):
         
         if dialog.result:
             try:
-                conn = pyodbc.connect(self.conn_str)
-                cursor = conn.cursor()
+                # Відділення перевіряється до початку транзакції (див. add_item)
+                dept_id = None
+                if self.current_table == "groups" and len(dialog.result) > 1:
+                    dept_id = self._find_department_id(dialog.result[1])
+                    if dept_id is None:
+                        messagebox.showerror("Помилка", "Відділення не знайдено")
+                        return
                 
-                # Отримуємо назву колонки Name для поточної таблиці
-                name_col_name = self.column_mappings.get(self.current_table, {}).get("name", "Name")
-                id_col_name = self.column_mappings.get(self.current_table, {}).get("id", "ID")
+                # Таблиця та колонки з визначеної схеми бази даних
+                table, id_column, name_column = self._table_columns()
                 
-                print(f"Редагування запису: таблиця={self.current_table}, ID={item_id}")
+                print(f"Редагування запису: таблиця={table}, ID={item_id}")
                 print(f"Нові дані: {dialog.result}")
-                print(f"Назва колонки для імені: {name_col_name}")
-                print(f"Назва колонки для ID: {id_col_name}")
                 
-                # Використовуємо прямий SQL-запит без параметрів
-                if self.current_table == "groups" and len(dialog.result) > 1:
-                    # Отримуємо ID відділення
-                    cursor.execute(f"SELECT ID FROM [department] WHERE Name = '{dialog.result[1]}'")
-                    dept_row = cursor.fetchone()
-                    
-                    if dept_row and len(dept_row) > 0:
-                        dept_id = dept_row[0]
-                        
+                # Значення передаються параметрами запиту (назви можуть містити апостроф)
+                with DatabaseManager().transaction() as cursor:
+                    if dept_id is not None:
                         # Оновлюємо запис з відділенням
-                        query = f"UPDATE [{self.current_table}] SET {name_col_name} = '{dialog.result[0]}', [Number Of Department] = {dept_id} WHERE {id_col_name} = {item_id}"
-                        print(f"SQL-запит: {query}")
-                        cursor.execute(query)
+                        cursor.execute(f"UPDATE {table} SET {name_column} = ?, [{GROUP_DEPARTMENT_COLUMN}] = ? WHERE {id_column} = ?",
+                                       (dialog.result[0], dept_id, item_id))
                     else:
-                        messagebox.showerror("Помилка", "Відділення не знайдено")
-                else:
-                    # Оновлюємо запис без відділення
-                    query = f"UPDATE [{self.current_table}] SET {name_col_name} = '{dialog.result[0]}' WHERE {id_col_name} = {item_id}"
-                    print(f"SQL-запит: {query}")
-                    cursor.execute(query)
-                
-                conn.commit()
-                conn.close()
+                        # Оновлюємо запис без відділення
+                        cursor.execute(f"UPDATE {table} SET {name_column} = ? WHERE {id_column} = ?",
+                                       (dialog.result[0], item_id))
                 
                 # Оновлюємо список
-                self.refresh_list()
+                self.refresh_list(reload=True)
                 
                 # Автоматично оновлюємо дані для всіх важливих таблиць
                 if self.current_table in ["department", "groups", "teachers", "audiences", "discpline", "discipline", "disciplines"]:
@@ -433,6 +509,26 @@ class HandbookForm(tk.Toplevel):
                 print(f"Помилка при оновленні запису: {e}")
                 messagebox.showerror("Помилка", f"Помилка при оновленні запису: {e}")
     
+    def _find_department_id(self, dept_name):
+        """ID відділення за назвою або None, якщо відділення не знайдено"""
+        table, id_column, name_column = self._table_columns("department")
+        with DatabaseManager().borrow() as cursor:
+            cursor.execute(f"SELECT {id_column} FROM {table} WHERE {name_column} = ?", (dept_name,))
+            dept_row = cursor.fetchone()
+        if dept_row and len(dept_row) > 0:
+            return dept_row[0]
+        return None
+    
+    def _table_columns(self, entity=None):
+        """
+        Таблиця та колонки ID і назви довідника (в квадратних дужках) з визначеної
+        схеми бази даних; стандартні назви - якщо схему не вдалося визначити
+        """
+        entity = entity or self.current_table
+        info = DatabaseManager().get_table_info(entity) or self.column_mappings[entity]
+        id_column = info["id"] or self.column_mappings[entity]["id"]
+        return f"[{info['table']}]", f"[{id_column}]", f"[{info['name']}]"
+    
     def delete_item(self):
         if not self.current_table:
             return
@@ -457,9 +553,6 @@ class HandbookForm(tk.Toplevel):
         item_id = data_source[selected_index][0]
         item_name = data_source[selected_index][1]
         
-        # Отримуємо назву колонки ID для поточної таблиці
-        id_col_name = self.column_mappings.get(self.current_table, {}).get("id", "ID")
-        
         print(f"Видалення: вибрано запис №{selected_index}, ID={item_id}, назва='{item_name}'")
         
         # Підтвердження видалення
@@ -467,19 +560,13 @@ class HandbookForm(tk.Toplevel):
             return
             
         try:
-            conn = pyodbc.connect(self.conn_str)
-            cursor = conn.cursor()
-            
-            # Видаляємо запис
-            query = f"DELETE FROM [{self.current_table}] WHERE {id_col_name} = {item_id}"
-            print(f"SQL-запит: {query}")
-            cursor.execute(query)
-            
-            conn.commit()
-            conn.close()
+            # Видаляємо запис (таблиця та колонка ID з визначеної схеми)
+            table, id_column, name_column = self._table_columns()
+            with DatabaseManager().transaction() as cursor:
+                cursor.execute(f"DELETE FROM {table} WHERE {id_column} = ?", (item_id,))
             
             # Оновлюємо список
-            self.refresh_list()
+            self.refresh_list(reload=True)
             
             # Автоматично оновлюємо дані для всіх важливих таблиць
             if self.current_table in ["department", "groups", "teachers", "audiences", "discpline", "discipline", "disciplines"]:
@@ -500,14 +587,68 @@ class HandbookForm(tk.Toplevel):
             print(f"Помилка при видаленні запису: {e}")
             messagebox.showerror("Помилка", f"Помилка при видаленні запису: {e}")
     
-    def refresh_main_app_data(self):
-        """Оновлення даних у головній програмі після змін у довіднику"""
+    def import_items(self):
+        """Масове додавання записів поточної таблиці з файлу CSV або XLSX"""
+        if not self.current_table:
+            messagebox.showinfo("Інформація", "Спочатку виберіть категорію")
+            return
+        
+        path = filedialog.askopenfilename(
+            parent=self,
+            title="Імпорт записів",
+            filetypes=[("Таблиці", "*.csv *.xlsx"), ("CSV", "*.csv"), ("Excel", "*.xlsx")])
+        if not path:
+            return
+        
+        # Файл читається та перевіряється у фоновому потоці
+        table_name = self.current_table
+        self.loader.submit(load_import, table_name, path, DatabaseManager(),
+                           on_done=lambda plan: self._on_import_checked(table_name, plan),
+                           on_error=self._on_import_error,
+                           name=f"import_{table_name}")
+    
+    def _on_import_checked(self, table_name, plan):
+        if not plan.is_valid:
+            messagebox.showerror("Помилка", "Файл містить помилки, записи не додано.\n\n" + plan.summary(), parent=self)
+            return
+        if not plan.records:
+            messagebox.showinfo("Інформація", "Нових записів для додавання немає.\n\n" + plan.summary(), parent=self)
+            return
+        if not messagebox.askyesno("Підтвердження", plan.summary() + "\n\nДодати записи?", parent=self):
+            return
+        
+        self.loader.submit(apply_import, plan, DatabaseManager(),
+                           on_done=lambda count: self._on_import_done(table_name, count),
+                           on_error=self._on_import_error,
+                           name=f"import_{table_name}")
+    
+    def _on_import_done(self, table_name, count):
+        # Кеш таблиці вже скинуто один раз після імпорту
+        if table_name == self.current_table:
+            self.refresh_list(reload=True)
+        self.refresh_main_app_data(invalidate=False)
+        messagebox.showinfo("Інформація", f"Імпортовано записів: {count}", parent=self)
+    
+    def _on_import_error(self, error):
+        print(f"Помилка при імпорті записів: {error}")
+        messagebox.showerror("Помилка", f"Помилка при імпорті записів: {error}", parent=self)
+    
+    def refresh_main_app_data(self, invalidate=True):
+        """
+        Оновлення даних у головній програмі після змін у довіднику
+        
+        Args:
+            invalidate (bool): Скинути кеш поточної таблиці (False - кеш вже скинуто)
+        """
         try:
             # Створюємо DatabaseManager для оновлення даних
             db = DatabaseManager()
             
-            # Оновлюємо дані в базі даних
-            if db.refresh_data():
+            # Скидаємо кеш тільки для зміненої таблиці, інші дані лишаються в кеші
+            if invalidate:
+                db.invalidate_table(self.current_table)
+            
+            if db.is_connected():
                 print("Дані головної програми успішно оновлено з довідника")
                 
                 # Якщо головна програма має метод оновлення, викликаємо його
@@ -619,21 +760,10 @@ class ItemDialog(tk.Toplevel):
         """Get list of departments from database"""
         departments = []
         try:
-            conn = pyodbc.connect(self.parent.conn_str)
-            cursor = conn.cursor()
-            cursor.execute("SELECT * FROM [department]")
-            rows = cursor.fetchall()
-            columns = [column[0] for column in cursor.description]
-            
-            # Find Name column
-            name_col = 1  # Default to second column
-            for i, col in enumerate(columns):
-                if col.lower() == 'name':
-                    name_col = i
-                    break
-            
-            departments = [row[name_col] for row in rows if row[name_col]]
-            conn.close()
+            rows = DatabaseManager().fetch_id_name_rows("department")
+            if rows is None:
+                raise RuntimeError("немає підключення до бази даних")
+            departments = [name for _, name in rows if name]
         except Exception as e:
             messagebox.showerror("Помилка", f"Помилка при отриманні списку відділень: {e}")
         return departments
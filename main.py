@@ -1,17 +1,28 @@
+from startup_timer import StartupTimer
+
+# Вимірювання часу запуску починається до всіх інших імпортів
+STARTUP = StartupTimer()
+
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, simpledialog
 from tkcalendar import Calendar, DateEntry
 import datetime
 import locale
-import pyodbc
 import os
 import sys
 import shutil
-from final_handbook_fix import HandbookForm
-from replacement_form import ReplacementForm
 from db_manager import DatabaseManager
+from document_engine import academic_year_for, format_date_text, weekday_name
+from background_loader import BackgroundLoader
+from search_index import SearchSession
+from search_service import SearchService
+from ui_utils import Debouncer, sync_listbox
 import re
 
+# Форми довідника та замін (а з ними docx) та pyodbc імпортуються при першому
+# використанні, щоб головне вікно з'являлося якомога швидше
+STARTUP.mark("Імпорт модулів")
+
 # Константи для стилю
 APP_BG_COLOR = "#f0f0f0"  # Світло-сірий фон
 HEADER_BG_COLOR = "#4a6984"  # Темно-синій для заголовків
@@ -24,6 +35,8 @@ DEFAULT_FONT = (FONT_FAMILY, 10)  # Звичайний шрифт
 HEADER_FONT = (FONT_FAMILY, 12, "bold")  # Шрифт для заголовків
 BUTTON_FONT = (FONT_FAMILY, 12, "bold")  # Шрифт для кнопок (збільшено розмір до 12)
 PADDING = 10  # Стандартний відступ
+TYPING_DELAY = 150  # Пауза в наборі (мс), після якої оновлюється автозаповнення
+VALIDATION_DELAY = 50  # Затримка (мс) для об'єднання перевірок обов'язкових полів
 
 # Set locale to Ukrainian
 try:
@@ -56,12 +69,15 @@ class MainApplication(tk.Tk):
         # Встановлюємо початкову ширину вікна
         self.window_width = 1000  # Збільшено з 800 до 1000
         
-        # Connect to database
-        self.db_path = os.path.abspath("dataBase.mdb")
-        self.conn_str = f'DRIVER={{Microsoft Access Driver (*.mdb, *.accdb)}};DBQ={self.db_path}'
+        # Initialize data (список викладачів завантажується у фоновому потоці
+        # після відображення вікна, див. start_background_loading)
+        self.teachers_list = []
+        self.reference = None
+        self.loader = BackgroundLoader(self)
+        self.refresh_task = None
         
-        # Initialize data
-        self.teachers_list = self.get_teachers_from_db()
+        # Серії натискань клавіш об'єднуються в одне оновлення
+        self.debouncer = Debouncer(self, delay=TYPING_DELAY)
         
         # Створюємо папку Zaminy, якщо вона не існує
         # Визначаємо шлях до папки програми
@@ -96,106 +112,64 @@ class MainApplication(tk.Tk):
         self.academic_year_var = tk.StringVar(value=self.current_academic_year)
         
         self.create_widgets()
+        STARTUP.mark("Створення віджетів")
+        
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+        # Дані завантажуються тільки після першого відображення вікна
+        self.after_idle(self._on_first_paint)
     
-    def get_teachers_from_db(self):
-        try:
-            conn = pyodbc.connect(self.conn_str)
-            cursor = conn.cursor()
-            # Try to find all tables in the database
-            try:
-                cursor.execute("SELECT Name FROM MSysObjects WHERE Type=1 AND Flags=0")
-                tables = [row[0] for row in cursor.fetchall()]
-                print(f"Доступні таблиці: {tables}")
-                
-                # Try to find a table that might contain teachers
-                teacher_table = None
-                for table in tables:
-                    table_str = str(table).lower()
-                    if 'виклад' in table_str or 'teacher' in table_str or 'препод' in table_str:
-                        teacher_table = table
-                        break
-                
-                if teacher_table:
-                    print(f"Знайдено таблицю викладачів: {teacher_table}")
-                    cursor.execute(f"SELECT * FROM [{teacher_table}]")
-                else:
-                    # If no teacher table found, try common names with square brackets
-                    try:
-                        cursor.execute("SELECT * FROM [teachers]")
-                    except:
-                        try:
-                            cursor.execute("SELECT * FROM [Викладачі]")
-                        except:
-                            try:
-                                cursor.execute("SELECT * FROM [Викладач]")
-                            except:
-                                try:
-                                    cursor.execute("SELECT * FROM [Преподаватели]")
-                                except Exception as e:
-                                    print(f"Не вдалося знайти таблицю викладачів: {e}")
-                                    return []
-            except Exception as e:
-                print(f"Помилка при пошуку таблиць: {e}")
-                # Try common names with square brackets as fallback
-                try:
-                    cursor.execute("SELECT * FROM [teachers]")
-                except:
-                    try:
-                        cursor.execute("SELECT * FROM [Викладачі]")
-                    except:
-                        try:
-                            cursor.execute("SELECT * FROM [Викладач]")
-                        except Exception as e:
-                            print(f"Не вдалося знайти таблицю викладачів: {e}")
-                            return []
-            rows = cursor.fetchall()
-            # Get the column names from cursor description
-            columns = [column[0] for column in cursor.description]
-            print(f"Доступні колонки: {columns}")
-            
-            # Try to find the appropriate column for teacher names
-            name_column = None
-            for i, col in enumerate(columns):
-                col_lower = col.lower() if isinstance(col, str) else str(col).lower()
-                print(f"Перевірка колонки: {col} (індекс {i})")
-                if col_lower in ['name', 'прізвище', 'pib', 'піб', 'викладач', 'назва']:
-                    name_column = i
-                    print(f"Знайдено колонку з іменами викладачів: {col} (індекс {i})")
-                    break
-            
-            if name_column is not None:
-                teachers = []
-                for row in rows:
-                    if len(row) > name_column:
-                        teacher_name = row[name_column]
-                        print(f"Додавання викладача: {teacher_name}")
-                        teachers.append(teacher_name)
-            else:
-                # If we can't find a suitable column, use the first one
-                print("Не знайдено відповідної колонки, використовуємо першу колонку")
-                teachers = []
-                for row in rows:
-                    if len(row) > 0:
-                        teacher_name = row[0]
-                        print(f"Додавання викладача (перша колонка): {teacher_name}")
-                        teachers.append(teacher_name)
-            
-            print(f"Загальна кількість викладачів: {len(teachers)}")
-            print(f"Перші 5 викладачів: {teachers[:5] if len(teachers) >= 5 else teachers}")
-                
-            conn.close()
-            return teachers
-        except Exception as e:
-            print(f"Помилка підключення до бази даних: {e}")
-            return []
+    def _on_first_paint(self):
+        STARTUP.mark("Перше відображення вікна")
+        self.start_background_loading()
+    
+    def set_status(self, message):
+        """Текст у рядку стану внизу вікна"""
+        self.status_var.set(message)
+    
+    def start_background_loading(self):
+        """Завантаження даних з бази даних без блокування вікна"""
+        self.set_status("Завантаження даних з бази даних...")
+        self.loader.submit(self._load_initial_data, pass_task=True,
+                           on_done=self._on_initial_data_loaded,
+                           on_error=self._on_initial_data_error,
+                           on_progress=lambda message, value: self.set_status(message),
+                           name="initial_data")
+    
+    def _load_initial_data(self, task):
+        """Виконується у фоновому потоці: без звернень до віджетів Tk"""
+        task.report_progress("Підключення до бази даних...")
+        db = DatabaseManager()
+        task.check_cancelled()
+        
+        # Викладачі входять до набору довідкових даних, окремий запит не потрібен
+        task.report_progress("Завантаження довідкових даних...")
+        return db.load_reference_bundle()
+    
+    def _on_initial_data_loaded(self, reference):
+        self.reference = reference
+        self.teachers_list = reference.teachers
+        DatabaseManager().show_pending_messages()
+        self.update_main_form_widgets()
+        self.set_status(f"Дані завантажено. Викладачів: {len(self.teachers_list)}")
+        STARTUP.mark("Завантаження даних")
+        STARTUP.report()
+    
+    def _on_initial_data_error(self, error):
+        DatabaseManager().show_pending_messages()
+        self.set_status("Не вдалося завантажити дані з бази даних")
+        STARTUP.mark("Завантаження даних (помилка)")
+        STARTUP.report()
+        messagebox.showerror("Помилка", f"Помилка при завантаженні даних: {error}")
+    
+    def on_close(self):
+        """Закриття програми з зупинкою фонового завантаження"""
+        self.debouncer.cancel_all()
+        self.loader.close()
+        self.destroy()
     
     def get_current_academic_year(self):
         # Визначаємо поточний навчальний рік
-        now = datetime.datetime.now()
-        if now.month >= 9:  # Якщо поточний місяць вересень або пізніше
-            return f"{now.year}-{now.year + 1}"
-        else:
-            return f"{now.year - 1}-{now.year}"
+        return academic_year_for(datetime.date.today())
     
     def get_last_academic_year(self):
         # Визначаємо останній створений навчальний рік
@@ -448,6 +422,11 @@ class MainApplication(tk.Tk):
         header_label = ttk.Label(header_frame, text="Програма для ведення замін", style='Header.TLabel')
         header_label.pack(pady=PADDING)
         
+        # Рядок стану (прогрес фонового завантаження)
+        self.status_var = tk.StringVar(value="")
+        status_label = ttk.Label(self, textvariable=self.status_var, anchor=tk.W)
+        status_label.pack(fill=tk.X, side=tk.BOTTOM, padx=PADDING)
+        
         # Головний контейнер
         self.main_container = ttk.Frame(self)
         self.main_container.pack(fill=tk.BOTH, expand=True, padx=PADDING, pady=PADDING)
@@ -473,10 +452,10 @@ class MainApplication(tk.Tk):
         handbook_btn.pack(fill=tk.X, padx=PADDING, pady=PADDING)
         
         # Кнопка оновлення даних
-        refresh_btn = tk.Button(buttons_frame, text="Оновити дані", command=self.refresh_database_data, 
+        self.refresh_btn = tk.Button(buttons_frame, text="Оновити дані", command=self.refresh_database_data, 
                                bg="#e67e22", fg=BUTTON_FG_COLOR, font=BUTTON_FONT,
                                relief=tk.RAISED, borderwidth=2, padx=10, pady=5)
-        refresh_btn.pack(fill=tk.X, padx=PADDING, pady=(0, PADDING//2))
+        self.refresh_btn.pack(fill=tk.X, padx=PADDING, pady=(0, PADDING//2))
         
         # Кнопка для переходу до форми замін (спочатку неактивна)
         self.replacement_btn = tk.Button(buttons_frame, text="Бланк замін", command=self.open_replacement_form, 
@@ -492,7 +471,7 @@ class MainApplication(tk.Tk):
         # Радіокнопки для вибору типу тижня
         self.week_type = tk.StringVar(value="чисельником")
         # Додаємо перевірку полів при зміні типу тижня
-        self.week_type.trace_add("write", lambda *args: self.check_required_fields())
+        self.week_type.trace_add("write", lambda *args: self.schedule_required_fields_check())
         ttk.Radiobutton(week_frame, text="Чисельником", variable=self.week_type, value="чисельником").pack(side=tk.LEFT, padx=PADDING)
         ttk.Radiobutton(week_frame, text="Знаменником", variable=self.week_type, value="знаменником").pack(side=tk.LEFT, padx=PADDING)
         
@@ -537,7 +516,7 @@ class MainApplication(tk.Tk):
         ttk.Label(duty_group_frame, text="Чергова група:").grid(row=0, column=0, sticky=tk.W, padx=5)
         self.duty_group = tk.StringVar()
         # Додаємо перевірку полів при зміні чергової групи
-        self.duty_group.trace_add("write", lambda *args: self.check_required_fields())
+        self.duty_group.trace_add("write", lambda *args: self.schedule_required_fields_check())
         ttk.Entry(duty_group_frame, textvariable=self.duty_group, width=20, font=DEFAULT_FONT).grid(row=0, column=1, sticky=tk.W, padx=5)
         
         # Черговий викладач з автозаповненням
@@ -547,7 +526,7 @@ class MainApplication(tk.Tk):
         ttk.Label(duty_teacher_frame, text="Черговий викладач:").grid(row=0, column=0, sticky=tk.W, padx=5)
         self.duty_teacher = tk.StringVar()
         # Додаємо перевірку полів при зміні чергового викладача
-        self.duty_teacher.trace_add("write", lambda *args: self.check_required_fields())
+        self.duty_teacher.trace_add("write", lambda *args: self.schedule_required_fields_check())
         self.duty_teacher_entry = ttk.Entry(duty_teacher_frame, textvariable=self.duty_teacher, width=20, font=DEFAULT_FONT)
         self.duty_teacher_entry.grid(row=0, column=1, sticky=tk.W, padx=5)
         
@@ -557,9 +536,9 @@ class MainApplication(tk.Tk):
         self.teacher_listbox.grid_remove()  # Спочатку приховуємо
         
         # Прив'язуємо події для автозаповнення
-        self.duty_teacher.trace("w", lambda name, index, mode: self.update_teacher_list(
-                                                                entry_var=self.duty_teacher, 
-                                                                listbox=self.teacher_listbox))
+        self.duty_teacher.trace_add("write", lambda *args: self.debouncer.call(
+                                                                "duty_teacher", self.update_teacher_list,
+                                                                None, None, None, self.duty_teacher, self.teacher_listbox))
         self.teacher_listbox.bind("<<ListboxSelect>>", lambda event: self.on_teacher_select(event))
         
         # Черговий викладач в гуртожитку з автозаповненням
@@ -569,7 +548,7 @@ class MainApplication(tk.Tk):
         ttk.Label(dorm_teacher_frame, text="Черговий викладач в гуртожитку:").grid(row=0, column=0, sticky=tk.W, padx=5)
         self.dorm_teacher = tk.StringVar()
         # Додаємо перевірку полів при зміні викладача гуртожитку
-        self.dorm_teacher.trace_add("write", lambda *args: self.check_required_fields())
+        self.dorm_teacher.trace_add("write", lambda *args: self.schedule_required_fields_check())
         self.dorm_teacher_entry = ttk.Entry(dorm_teacher_frame, textvariable=self.dorm_teacher, width=20, font=DEFAULT_FONT)
         self.dorm_teacher_entry.grid(row=0, column=1, sticky=tk.W, padx=5)
         
@@ -579,9 +558,9 @@ class MainApplication(tk.Tk):
         self.dorm_teacher_listbox.grid_remove()  # Спочатку приховуємо
         
         # Прив'язуємо події для автозаповнення
-        self.dorm_teacher.trace("w", lambda name, index, mode: self.update_teacher_list(
-                                                                    entry_var=self.dorm_teacher, 
-                                                                    listbox=self.dorm_teacher_listbox))
+        self.dorm_teacher.trace_add("write", lambda *args: self.debouncer.call(
+                                                                    "dorm_teacher", self.update_teacher_list,
+                                                                    None, None, None, self.dorm_teacher, self.dorm_teacher_listbox))
         self.dorm_teacher_listbox.bind("<<ListboxSelect>>", 
                                        lambda event: self.on_teacher_select(event, 
                                                                            self.dorm_teacher, 
@@ -616,56 +595,49 @@ class MainApplication(tk.Tk):
         # Отримуємо поточну дату
         selected_date = self.date_entry.get_date()
         
-        # Форматуємо дату словами
-        months = ["січня", "лютого", "березня", "квітня", "травня", "червня", 
-                 "липня", "серпня", "вересня", "жовтня", "листопада", "грудня"]
-        date_text_str = f"{selected_date.day} {months[selected_date.month-1]} {selected_date.year} року"
-        self.date_text.set(date_text_str)
-        
-        # Визначаємо день тижня
-        weekdays = ["понеділок", "вівторок", "середа", "четвер", "п'ятниця", "субота", "неділя"]
-        weekday_idx = selected_date.weekday()  # 0 - понеділок, 6 - неділя
-        self.weekday_text.set(weekdays[weekday_idx])
+        # Форматуємо дату словами та визначаємо день тижня (так само, як пакетне формування)
+        self.date_text.set(format_date_text(selected_date))
+        self.weekday_text.set(weekday_name(selected_date))
         
         # Перевіряємо чи всі поля заповнені
-        self.check_required_fields()
+        self.schedule_required_fields_check()
+    
+    @property
+    def teachers_list(self):
+        return self._teachers_list
+    
+    @teachers_list.setter
+    def teachers_list(self, teachers):
+        # Індекс для автодоповнення береться зі спільного SearchService і
+        # перебудовується тільки тоді, коли список викладачів змінився
+        self._teachers_list = list(teachers)
+        self.teacher_index = SearchService().get_index('teachers', self._teachers_list)
+        # Окрема сесія пошуку для кожного поля (чергового та чергового в гуртожитку)
+        self._teacher_sessions = {}
     
     def update_teacher_list(self, name=None, index=None, mode=None, entry_var=None, listbox=None):
         if entry_var is None:
             entry_var = self.duty_teacher
             listbox = self.teacher_listbox
             
-        typed = entry_var.get().lower()
-        print(f"Пошук викладачів за текстом: '{typed}'")
-        print(f"Кількість викладачів у списку: {len(self.teachers_list)}")
+        typed = entry_var.get()
         
         if typed == '':
             listbox.grid_remove()
         else:
             listbox.grid()
-            listbox.delete(0, tk.END)
             
             # Перевіряємо, що список викладачів не порожній
             if not self.teachers_list:
-                print("Список викладачів порожній!")
-                listbox.insert(tk.END, "Список викладачів порожній")
+                sync_listbox(listbox, ["Список викладачів порожній"])
                 return
             
-            # Виводимо перші 5 викладачів для відлагодження
-            print(f"Перші 5 викладачів: {self.teachers_list[:5] if len(self.teachers_list) >= 5 else self.teachers_list}")
-                
-            found_count = 0
-            for teacher in self.teachers_list:
-                try:
-                    # Спробуємо перетворити на рядок та порівняти
-                    teacher_str = str(teacher)
-                    if typed in teacher_str.lower():
-                        listbox.insert(tk.END, teacher_str)
-                        found_count += 1
-                except Exception as e:
-                    print(f"Помилка при обробці викладача: {e}")
-            
-            print(f"Знайдено {found_count} викладачів, що відповідають пошуку")
+            # Пошук продовжує попередній запит цього поля, а список оновлюється
+            # тільки в рядках, що змінилися
+            session = self._teacher_sessions.get(str(listbox))
+            if session is None:
+                session = self._teacher_sessions[str(listbox)] = SearchSession(self.teacher_index)
+            sync_listbox(listbox, session.search(typed))
     
     def on_teacher_select(self, event, entry_var=None, listbox=None):
         if entry_var is None:
@@ -675,8 +647,14 @@ class MainApplication(tk.Tk):
         if listbox.curselection():
             selected = listbox.get(listbox.curselection())
             entry_var.set(selected)
+            # Вибір зі списку не потребує нового пошуку
+            self.debouncer.cancel("dorm_teacher" if entry_var is self.dorm_teacher else "duty_teacher")
             listbox.grid_remove()
     
+    def schedule_required_fields_check(self):
+        """Одна перевірка обов'язкових полів після серії змін"""
+        self.debouncer.call("required_fields", self.check_required_fields, delay=VALIDATION_DELAY)
+    
     def check_required_fields(self):
         """Перевіряє чи всі обов'язкові поля заповнені"""
         # Перевіряємо, чи всі необхідні атрибути існують
@@ -722,6 +700,7 @@ class MainApplication(tk.Tk):
         return True, "Чергова група прийнята"
     
     def open_handbook(self):
+        from final_handbook_fix import HandbookForm
         handbook = HandbookForm(self)
         handbook.grab_set()  # Make window modal
     
@@ -760,6 +739,7 @@ class MainApplication(tk.Tk):
         replacement_window.configure(bg=APP_BG_COLOR)
         
         # Створюємо форму замін як фрейм всередині вікна
+        from replacement_form import ReplacementForm
         replacement_form = ReplacementForm(replacement_window, date_text, weekday, week_type, 
                                            duty_group, duty_teacher, dorm_teacher, 
                                            self.replacements_dir, academic_year)
@@ -769,50 +749,84 @@ class MainApplication(tk.Tk):
     
     def refresh_database_data(self):
         """Оновлення даних з бази даних без перезапуску програми"""
+        # Повторне натискання під час оновлення нічого не робить
+        if self.refresh_task is not None and not self.refresh_task.finished:
+            return
+        
+        self.refresh_btn.config(state=tk.DISABLED)
+        self.set_status("Оновлення даних з бази даних...")
+        self.refresh_task = self.loader.submit(self._refresh_in_background, pass_task=True,
+                                               on_done=self._on_refresh_done,
+                                               on_error=self._on_refresh_error,
+                                               on_progress=lambda message, value: self.set_status(message),
+                                               name="refresh_data")
+    
+    def _refresh_in_background(self, task):
+        """Виконується у фоновому потоці: повертає (успіх, довідник, оновлені таблиці)"""
+        db = DatabaseManager()
+        
+        # Оновлюємо дані в базі даних
+        task.report_progress("Перевірка змін у базі даних...")
+        if not db.refresh_data():
+            return False, None, []
+        task.check_cancelled()
+        
+        # Завантажуємо всі довідкові таблиці одним набором
+        task.report_progress("Завантаження довідкових даних...")
+        reference = db.load_reference_bundle()
+        return True, reference, list(db.last_changed_tables)
+    
+    def _on_refresh_done(self, result):
+        self.refresh_btn.config(state=tk.NORMAL)
+        DatabaseManager().show_pending_messages()
+        success, reference, changed_tables = result
+        
+        if not success:
+            self.set_status("Не вдалося оновити дані")
+            messagebox.showwarning("Помилка оновлення", 
+                                 "Не вдалося оновити дані з бази даних.\n"
+                                 "Перевірте підключення до бази даних.")
+            return
+        
         try:
-            # Показуємо повідомлення про початок оновлення
-            messagebox.showinfo("Оновлення даних", "Оновлення даних з бази даних...")
+            self.reference = reference
             
-            # Створюємо DatabaseManager для оновлення даних
-            db = DatabaseManager()
+            # Оновлюємо список викладачів
+            old_teachers_count = len(self.teachers_list)
+            self.teachers_list = list(reference.teachers)
             
-            # Оновлюємо дані в базі даних
-            if db.refresh_data():
-                # Оновлюємо список викладачів
-                old_teachers_count = len(self.teachers_list)
-                self.teachers_list = db.get_teachers()
-                
-                # Оновлюємо віджети форми
-                self.update_main_form_widgets()
-                
-                # Показуємо інформацію про зміни
-                changes = []
-                if len(self.teachers_list) != old_teachers_count:
-                    changes.append(f"Викладачі: {old_teachers_count} → {len(self.teachers_list)}")
-                
-                # Отримуємо кількість відділень та груп
-                departments = db.get_departments()
-                all_groups = db.get_all_groups()
-                total_groups = sum(len(groups) for groups in all_groups.values())
-                
-                changes.append(f"Відділення: {len(departments)}")
-                changes.append(f"Групи: {total_groups}")
-                
-                if changes:
-                    change_text = "Поточна структура даних:\n" + "\n".join(changes)
-                else:
-                    change_text = "Структура даних оновлена"
-                
-                messagebox.showinfo("Оновлення завершено", 
-                                  f"Дані успішно оновлено з бази даних!\n\n{change_text}")
+            # Оновлюємо віджети форми
+            self.update_main_form_widgets()
+            
+            # Показуємо інформацію про зміни
+            changes = []
+            if len(self.teachers_list) != old_teachers_count:
+                changes.append(f"Викладачі: {old_teachers_count} → {len(self.teachers_list)}")
+            
+            # Отримуємо кількість відділень та груп
+            changes.append(f"Відділення: {len(reference.departments)}")
+            changes.append(f"Групи: {len(reference.groups)}")
+            
+            # Показуємо, які таблиці було перезавантажено
+            if changed_tables:
+                changes.append(f"Оновлені таблиці: {', '.join(changed_tables)}")
             else:
-                messagebox.showwarning("Помилка оновлення", 
-                                     "Не вдалося оновити дані з бази даних.\n"
-                                     "Перевірте підключення до бази даних.")
-        
+                changes.append("Змін у базі даних не виявлено")
+            
+            change_text = "Поточна структура даних:\n" + "\n".join(changes)
+            
+            self.set_status("Дані оновлено")
+            messagebox.showinfo("Оновлення завершено", 
+                              f"Дані успішно оновлено з бази даних!\n\n{change_text}")
         except Exception as e:
             messagebox.showerror("Помилка", f"Помилка при оновленні даних: {e}")
     
+    def _on_refresh_error(self, error):
+        self.refresh_btn.config(state=tk.NORMAL)
+        DatabaseManager().show_pending_messages()
+        self.set_status("Не вдалося оновити дані")
+        messagebox.showerror("Помилка", f"Помилка при оновленні даних: {error}")
+    
     def update_main_form_widgets(self):
         """Оновлення віджетів головної форми після оновлення даних"""
         try:
@@ -0,0 +1,88 @@
+from types import MappingProxyType
+
+
+class ReferenceBundle:
+    """
+    Незмінний набір довідкових даних (відділення, групи, викладачі, аудиторії,
+    дисципліни) разом з похідними словниками, побудованими в пам'яті.
+    Завантажується одним проходом через DatabaseManager.load_reference_bundle()
+    і використовується спільно всіма формами.
+    """
+    __slots__ = (
+        'departments', 'department_names', 'department_ids', 'department_structure',
+        'groups', 'groups_by_department', 'group_to_department', 'group_department_ids',
+        'teachers', 'audiences', 'disciplines'
+    )
+
+    def __init__(self, department_rows, group_rows, teachers, audiences, disciplines):
+        """
+        Args:
+            department_rows: Пари (ID, назва) відділень, впорядковані за ID
+            group_rows: Пари (назва групи, ID відділення)
+            teachers, audiences, disciplines: Списки назв
+        """
+        department_names = {}
+        for dept_id, dept_name in department_rows:
+            department_names[dept_id] = dept_name
+
+        # Групи за відділеннями (в тому числі відділення без груп)
+        groups_by_department = {name: [] for name in department_names.values()}
+        group_to_department = {}
+        group_department_ids = {}
+        for group_name, dept_id in group_rows:
+            # Якщо відділення невідоме, додаємо його з номером
+            dept_name = department_names.get(dept_id, f"Відділення {dept_id}")
+            groups_by_department.setdefault(dept_name, []).append(group_name)
+            group_to_department[group_name] = dept_name
+            group_department_ids[group_name] = dept_id
+
+        active_dept_ids = set(group_department_ids.values())
+        structure = tuple(
+            MappingProxyType({
+                "id": dept_id,
+                "name": dept_name,
+                "order": order,
+                "has_groups": dept_id in active_dept_ids
+            })
+            for order, (dept_id, dept_name) in enumerate(department_names.items(), 1)
+        )
+
+        self._set('departments', tuple(department_names.values()))
+        self._set('department_names', MappingProxyType(department_names))
+        self._set('department_ids', MappingProxyType({name: dept_id for dept_id, name in department_names.items()}))
+        self._set('department_structure', structure)
+        self._set('groups', tuple(group_name for group_name, _ in group_rows))
+        self._set('groups_by_department', MappingProxyType(
+            {dept: tuple(groups) for dept, groups in groups_by_department.items()}))
+        self._set('group_to_department', MappingProxyType(group_to_department))
+        self._set('group_department_ids', MappingProxyType(group_department_ids))
+        self._set('teachers', tuple(teachers))
+        self._set('audiences', tuple(audiences))
+        self._set('disciplines', tuple(disciplines))
+
+    def _set(self, name, value):
+        object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("ReferenceBundle є незмінним об'єктом")
+
+    def __delattr__(self, name):
+        raise AttributeError("ReferenceBundle є незмінним об'єктом")
+
+    def get_department_of_group(self, group_name):
+        """Назва відділення групи або None, якщо група невідома"""
+        return self.group_to_department.get(group_name)
+
+    def counts(self):
+        """Кількість записів кожного типу (для повідомлень про оновлення)"""
+        return {
+            "departments": len(self.departments),
+            "groups": len(self.groups),
+            "teachers": len(self.teachers),
+            "audiences": len(self.audiences),
+            "disciplines": len(self.disciplines)
+        }
+
+    def __repr__(self):
+        counts = ", ".join(f"{key}={value}" for key, value in self.counts().items())
+        return f"ReferenceBundle({counts})"
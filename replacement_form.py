@@ -1,22 +1,18 @@
 import os
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-from docx import Document
-from docx.shared import Pt, Cm
-from docx.enum.text import WD_ALIGN_PARAGRAPH
-from docx.enum.table import WD_ALIGN_VERTICAL
-from docx.oxml import parse_xml, OxmlElement
-from docx.oxml.ns import nsdecls
 import datetime
 import re
 from db_manager import DatabaseManager
+from document_engine import (DocumentEngine, ReplacementDay, default_base_date, output_path,
+                             parse_date_from_text, saturday_schedule_day)
+from search_index import SearchSession
+from search_service import SearchService
+from ui_utils import Debouncer, sync_listbox
 
 # Константи
-MONTHS_UA = {
-    'січня': 1, 'лютого': 2, 'березня': 3, 'квітня': 4,
-    'травня': 5, 'червня': 6, 'липня': 7, 'серпня': 8,
-    'вересня': 9, 'жовтня': 10, 'листопада': 11, 'грудня': 12
-}
+# Пауза в наборі (мс), після якої оновлюється список дисциплін
+TYPING_DELAY = 150
 
 class ReplacementForm(ttk.Frame):
     def __init__(self, parent, date_text=None, weekday=None, week_type=None, 
@@ -41,11 +37,15 @@ class ReplacementForm(ttk.Frame):
         self.db = DatabaseManager()
         
         # Ледаче завантаження даних (завантажуються тільки при потребі)
-        self._departments = None
-        self._all_groups = None
-        self._audiences = None
-        self._disciplines = None
-        self._groups = None
+        # Всі довідкові таблиці приходять одним набором, спільним для всіх форм
+        self._reference = None
+        self._discipline_session = None
+        
+        # Індекси пошуку спільні для всіх форм
+        self.search_service = SearchService()
+        
+        # Серії натискань клавіш об'єднуються в одне оновлення списку
+        self.debouncer = Debouncer(self, delay=TYPING_DELAY)
         
         # Тип практики (Виробнича або Переддипломна)
         self.practice_type = tk.StringVar(value="Виробнича")
@@ -60,50 +60,65 @@ class ReplacementForm(ttk.Frame):
         # Ініціалізуємо відображення замін
         self.update_replacements_display()
     
+    @property
+    def reference(self):
+        """Ледаче завантаження набору довідкових даних"""
+        if self._reference is None:
+            self._reference = self.db.load_reference_bundle()
+        return self._reference
+    
     @property
     def departments(self):
-        """Ледаче завантаження відділень"""
-        if self._departments is None:
-            self._departments = self.db.get_departments()
-        return self._departments
+        """Список відділень"""
+        return self.reference.departments
     
     @property
     def all_groups(self):
-        """Ледаче завантаження всіх груп"""
-        if self._all_groups is None:
-            self._all_groups = self.db.get_all_groups()
-        return self._all_groups
+        """Словник всіх груп за відділеннями"""
+        return self.reference.groups_by_department
     
     @property
     def audiences(self):
-        """Ледаче завантаження аудиторій"""
-        if self._audiences is None:
-            self._audiences = self.db.get_audiences()
-        return self._audiences
+        """Список аудиторій"""
+        return self.reference.audiences
     
     @property
     def disciplines(self):
-        """Ледаче завантаження дисциплін"""
-        if self._disciplines is None:
-            self._disciplines = self.db.get_disciplines()
-        return self._disciplines
+        """Список дисциплін"""
+        return self.reference.disciplines
     
     @property
     def groups(self):
-        """Ледаче завантаження груп за відділеннями"""
-        if self._groups is None:
-            self._groups = {}
-            for dept in self.departments:
-                self._groups[dept] = self.db.get_groups_by_department(dept)
-        return self._groups
+        """Групи за відділеннями"""
+        return self.reference.groups_by_department
+    
+    @property
+    def discipline_index(self):
+        """Індекс для пошуку дисциплін (з урахуванням розкладки та помилок)"""
+        return self.search_service.get_index('disciplines', self.disciplines)
+    
+    @property
+    def group_index(self):
+        """Індекс для пошуку груп (всіх відділень)"""
+        return self.search_service.get_index('groups', self.reference.groups)
+    
+    @property
+    def audience_index(self):
+        """Індекс для пошуку аудиторій"""
+        return self.search_service.get_index('audiences', self.audiences)
+    
+    @property
+    def discipline_session(self):
+        """Сесія пошуку поля дисципліни (звуження результатів під час набору)"""
+        index = self.discipline_index
+        if self._discipline_session is None or self._discipline_session.index is not index:
+            self._discipline_session = SearchSession(index)
+        return self._discipline_session
     
     def _clear_data_cache(self):
         """Очищення кешу даних"""
-        self._departments = None
-        self._all_groups = None
-        self._audiences = None
-        self._disciplines = None
-        self._groups = None
+        self._reference = None
+        self._discipline_session = None
     
     def create_widgets(self):
         # Створюємо Canvas та Scrollbar для прокручування всього вмісту
@@ -187,6 +202,9 @@ class ReplacementForm(ttk.Frame):
         self.group_var = tk.StringVar()
         self.group_combo = ttk.Combobox(input_frame, textvariable=self.group_var, width=12, font=("Arial", 10))
         self.group_combo.grid(row=0, column=1, padx=5, pady=5, sticky=tk.W+tk.E)
+        # Список групи звужується за введеним текстом
+        self.group_var.trace_add("write", lambda *args: self.debouncer.call(
+            "group", self.filter_group_values))
         
         # Номер пари
         ttk.Label(input_frame, text="№ пари *:", font=("Arial", 10)).grid(row=0, column=2, padx=5, pady=5, sticky=tk.W)
@@ -205,7 +223,8 @@ class ReplacementForm(ttk.Frame):
         self.discipline_listbox.grid_remove()  # Спочатку приховуємо
         
         # Прив'язуємо події для автозаповнення
-        self.discipline_var.trace("w", self.update_discipline_list)
+        self.discipline_var.trace_add("write", lambda *args: self.debouncer.call(
+            "discipline", self.update_discipline_list))
         self.discipline_listbox.bind("<<ListboxSelect>>", self.on_discipline_select)
         
         # Вибір аудиторії
@@ -213,6 +232,8 @@ class ReplacementForm(ttk.Frame):
         self.audience_var = tk.StringVar()
         self.audience_combo = ttk.Combobox(input_frame, textvariable=self.audience_var, width=12, values=self.audiences, font=("Arial", 10))
         self.audience_combo.grid(row=0, column=7, padx=5, pady=5, sticky=tk.W+tk.E)
+        self.audience_var.trace_add("write", lambda *args: self.debouncer.call(
+            "audience", self.filter_audience_values))
         
         # Створюємо окремий фрейм для кнопки
         button_frame = ttk.Frame(replacement_frame)
@@ -457,34 +478,7 @@ class ReplacementForm(ttk.Frame):
         Returns:
             str: Назва дня тижня українською мовою
         """
-        if base_date is None:
-            # Якщо базова дата не задана, використовуємо початок навчального року
-            # Припускаємо, що навчальний рік починається 1 вересня
-            current_year = target_date.year
-            if target_date.month < 9:  # Якщо до вересня, то попередній навчальний рік
-                current_year -= 1
-            base_date = datetime.date(current_year, 9, 1)
-            
-            # Знаходимо перший понеділок після 1 вересня
-            while base_date.weekday() != 0:  # 0 = понеділок
-                base_date += datetime.timedelta(days=1)
-        
-        # Обчислюємо кількість тижнів від базової дати до цільової дати
-        days_diff = (target_date - base_date).days
-        weeks_passed = days_diff // 7
-        
-        # Цикл: понеділок(0) → вівторок(1) → середа(2) → четвер(3) → п'ятниця(4) → знову понеділок
-        day_cycle = weeks_passed % 5
-        
-        days_ua = {
-            0: "понеділок",
-            1: "вівторок", 
-            2: "середа",
-            3: "четвер",
-            4: "п'ятниця"
-        }
-        
-        return days_ua[day_cycle]
+        return saturday_schedule_day(target_date, base_date)
     
     def is_saturday(self, date_str=None):
         """Перевіряє, чи є задана дата суботою"""
@@ -498,54 +492,17 @@ class ReplacementForm(ttk.Frame):
     
     def _parse_date_from_text(self, date_text):
         """Парсить дату з тексту формату 'день місяць, день_тижня'"""
-        try:
-            date_parts = date_text.split()
-            if len(date_parts) >= 2:
-                day = int(date_parts[0])
-                month_name = date_parts[1].rstrip(',')
-                
-                if month_name in MONTHS_UA:
-                    month = MONTHS_UA[month_name]
-                    current_year = datetime.date.today().year
-                    return datetime.date(current_year, month, day)
-            return None
-        except:
-            return None
+        return parse_date_from_text(date_text)
     
     def set_default_base_date(self):
         """Встановлює базову дату за замовчуванням"""
         try:
-            # Отримуємо поточну дату з форми
-            if hasattr(self, 'date_text') and self.date_text:
-                target_date = self._parse_date_from_text(self.date_text)
-                if target_date:
-                    # Знаходимо початок навчального року
-                    if target_date.month < 9:
-                        academic_year_start = target_date.year - 1
-                    else:
-                        academic_year_start = target_date.year
-                    
-                    base_date = datetime.date(academic_year_start, 9, 1)
-                    # Знаходимо перший понеділок
-                    while base_date.weekday() != 0:
-                        base_date += datetime.timedelta(days=1)
-                    
-                    self.base_date_var.set(base_date.strftime("%d.%m.%Y"))
-                    return
-            
-            # Якщо не вдалося парсити дату, використовуємо поточний навчальний рік
-            today = datetime.date.today()
-            if today.month < 9:
-                academic_year_start = today.year - 1
-            else:
-                academic_year_start = today.year
-            
-            base_date = datetime.date(academic_year_start, 9, 1)
-            while base_date.weekday() != 0:
-                base_date += datetime.timedelta(days=1)
-            
+            # Початок навчального року дати з форми, або поточного, якщо дату не вдалося розібрати
+            date_text = getattr(self, "date_text", None)
+            target_date = self._parse_date_from_text(date_text) if date_text else None
+            base_date = default_base_date(target_date or datetime.date.today())
             self.base_date_var.set(base_date.strftime("%d.%m.%Y"))
-        except:
+        except Exception:
             # У випадку помилки встановлюємо дату за замовчуванням
             self.base_date_var.set("01.09.2024")
     
@@ -595,31 +552,48 @@ class ReplacementForm(ttk.Frame):
         else:
             self.group_combo['values'] = []
     
+    def filter_group_values(self, *args):
+        """Групи відділення, що відповідають введеному тексту (за релевантністю)"""
+        dept_groups = self.groups.get(self.dept_var.get(), ())
+        typed = self.group_var.get()
+        if not typed.strip() or typed in dept_groups:
+            # Порожнє поле або вже вибрана група - весь список відділення
+            self.group_combo['values'] = dept_groups
+            return
+        
+        allowed = set(dept_groups)
+        self.group_combo['values'] = [group for group in self.group_index.search(typed, limit=None)
+                                      if group in allowed]
+    
+    def filter_audience_values(self, *args):
+        """Аудиторії, що відповідають введеному тексту (за релевантністю)"""
+        typed = self.audience_var.get()
+        if not typed.strip() or typed in self.audiences:
+            self.audience_combo['values'] = self.audiences
+            return
+        
+        self.audience_combo['values'] = self.audience_index.search(typed, limit=None)
+    
     def update_discipline_list(self, *args):
-        typed = self.discipline_var.get().lower()
-        print(f"\n\nВведено текст: '{typed}'")
-        print(f"Кількість дисциплін у списку: {len(self.disciplines)}")
-        print(f"Перші 5 дисциплін: {self.disciplines[:5] if len(self.disciplines) >= 5 else self.disciplines}")
+        typed = self.discipline_var.get()
         
         if typed == '':
             self.discipline_listbox.grid_remove()
-            print("Список приховано, бо введений текст порожній")
         else:
             # Позиціонуємо список під полем вводу
             x, y, width, height = self.discipline_entry.winfo_x(), self.discipline_entry.winfo_y(), self.discipline_entry.winfo_width(), self.discipline_entry.winfo_height()
             
             # Встановлюємо список точно під полем вводу
             self.discipline_listbox.grid(row=1, column=5, padx=10, sticky=tk.W+tk.E)
-            self.discipline_listbox.delete(0, tk.END)
             
             # Збільшуємо ширину списку, щоб він був не менший за поле вводу
             self.discipline_listbox.config(width=max(40, width // 8))  # Ширина не менше 40 символів
             
-            matching_disciplines = []
-            for discipline in self.disciplines:
-                if typed in discipline.lower():
-                    matching_disciplines.append(discipline)
-                    self.discipline_listbox.insert(tk.END, discipline)
+            # Збіги впорядковані за релевантністю, з урахуванням розкладки та помилок.
+            # Якщо запит доповнює попередній, пошук звужує попередні збіги,
+            # а список оновлюється тільки в рядках, що змінилися
+            matching_disciplines = self.discipline_session.search(typed, limit=None)
+            sync_listbox(self.discipline_listbox, matching_disciplines)
             
             # Якщо знайдено дисципліни, відображаємо список
             if matching_disciplines:
@@ -629,15 +603,13 @@ class ReplacementForm(ttk.Frame):
                 self.discipline_listbox.config(height=height)
             else:
                 self.discipline_listbox.grid_remove()
-            
-            print(f"Знайдено {len(matching_disciplines)} дисциплін, що відповідають запиту")
-            if matching_disciplines:
-                print(f"Знайдені дисципліни: {matching_disciplines}")
     
     def on_discipline_select(self, event):
         if self.discipline_listbox.curselection():
             selected = self.discipline_listbox.get(self.discipline_listbox.curselection())
             self.discipline_var.set(selected)
+            # Вибір зі списку не потребує нового пошуку
+            self.debouncer.cancel("discipline")
             self.discipline_listbox.grid_remove()
     
     def refresh_data(self):
@@ -646,41 +618,29 @@ class ReplacementForm(ttk.Frame):
             # Показуємо повідомлення про початок оновлення
             messagebox.showinfo("Оновлення даних", "Оновлення даних з бази даних...")
             
+            # Зберігаємо старі дані для порівняння
+            old_counts = self.reference.counts()
+            
             # Оновлюємо дані в базі даних
             if self.db.refresh_data():
-                # Очищаємо локальний кеш
+                # Очищаємо локальний кеш і завантажуємо свіжий набір даних
                 self._clear_data_cache()
-                
-                # Зберігаємо старі дані для порівняння
-                old_departments = list(self.departments) if self._departments else []
-                old_groups = dict(self.groups) if self._groups else {}
-                
-                # Оновлюємо список аудиторій
-                old_audiences = self.audiences.copy()
-                self.audiences = self.db.get_audiences()
-                
-                # Оновлюємо список дисциплін
-                old_disciplines = self.disciplines.copy()
-                self.disciplines = self.db.get_disciplines()
+                new_counts = self.reference.counts()
                 
                 # Оновлюємо віджети форми
                 self.update_form_widgets()
                 
                 # Показуємо інформацію про зміни
                 changes = []
-                if len(self.departments) != len(old_departments):
-                    changes.append(f"Відділення: {len(old_departments)} → {len(self.departments)}")
-                
-                total_old_groups = sum(len(groups) for groups in old_groups.values())
-                total_new_groups = sum(len(groups) for groups in self.groups.values())
-                if total_new_groups != total_old_groups:
-                    changes.append(f"Групи: {total_old_groups} → {total_new_groups}")
-                
-                if len(self.audiences) != len(old_audiences):
-                    changes.append(f"Аудиторії: {len(old_audiences)} → {len(self.audiences)}")
-                
-                if len(self.disciplines) != len(old_disciplines):
-                    changes.append(f"Дисципліни: {len(old_disciplines)} → {len(self.disciplines)}")
+                labels = {
+                    "departments": "Відділення",
+                    "groups": "Групи",
+                    "audiences": "Аудиторії",
+                    "disciplines": "Дисципліни"
+                }
+                for key, label in labels.items():
+                    if new_counts[key] != old_counts[key]:
+                        changes.append(f"{label}: {old_counts[key]} → {new_counts[key]}")
                 
                 if changes:
                     change_text = "Виявлено зміни:\n" + "\n".join(changes)
@@ -798,642 +758,65 @@ class ReplacementForm(ttk.Frame):
         # Оновлюємо відображення списку замін
         self.update_replacements_display()
     
+    def build_replacement_day(self):
+        """Дані бланку з полів форми (без залежності документа від Tk)"""
+        base_date = None
+        if self.is_saturday():
+            base_parts = self.base_date_var.get().split('.')
+            if len(base_parts) == 3:
+                base_date = datetime.date(int(base_parts[2]), int(base_parts[1]), int(base_parts[0]))
+        
+        return ReplacementDay(
+            date_text=self.date_text,
+            weekday=self.weekday,
+            week_type=self.week_type,
+            duty_group=self.duty_group_text,
+            duty_teacher=self.duty_teacher_text,
+            dorm_teacher=self.dorm_teacher_text,
+            replacements=self.replacements,
+            edu_practice=self.edu_practice_var.get().strip(),
+            practice_type=self.practice_type.get(),
+            practice_info=self.practice_info_var.get().strip(),
+            base_date=base_date
+        )
+    
     def generate_form(self):
-        # Використовуємо дані, які були передані при створенні форми
-        date_text = self.date_text
-        weekday = self.weekday
-        week_type = self.week_type
-        duty_group = self.duty_group_text
-        duty_teacher = self.duty_teacher_text
-        dorm_teacher = self.dorm_teacher_text
-        
-        # Отримуємо дані про практику
-        edu_practice = self.edu_practice_var.get().strip()
-        practice_type_text = self.practice_type.get()
-        practice_info = self.practice_info_var.get().strip()
-        
         # Якщо немає реальних замін, повідомляємо користувача
         if not self.replacements:
             messagebox.showinfo("Інформація", "Додайте хоча б одну заміну для формування бланку")
             return
         
         try:
-            # Створюємо документ Word
-            doc = Document()
-            
-            # Встановлюємо шрифт для всього документа
-            style = doc.styles['Normal']
-            font = style.font
-            font.name = 'Times New Roman'
-            font.size = Pt(12)
-            
-            # Налаштовуємо поля сторінки
-            sections = doc.sections
-            for section in sections:
-                section.top_margin = Cm(1)
-                section.bottom_margin = Cm(1)
-                section.left_margin = Cm(1.5)
-                section.right_margin = Cm(1.5)
-            
-            # Додаємо заголовок "ЗАТВЕРДЖУЮ"
-            header_table = doc.add_table(rows=1, cols=2)
-            header_table.style = 'Normal Table'
-            
-            for row in header_table.rows:
-                for cell in row.cells:
-                    tc = cell._tc
-                    tcPr = tc.get_or_add_tcPr()
-                    tcBorders = tcPr.first_child_found_in("w:tcBorders")
-                    if tcBorders:
-                        tcBorders.getparent().remove(tcBorders)
-            
-            # Права частина (ЗАТВЕРДЖУЮ)
-            right_cell = header_table.rows[0].cells[1]
-            right_para = right_cell.paragraphs[0]
-            right_para.alignment = WD_ALIGN_PARAGRAPH.RIGHT
-            right_run = right_para.add_run("ЗАТВЕРДЖУЮ")
-            right_run.bold = True
-            right_run.font.size = Pt(8)
-            right_para.paragraph_format.space_after = Pt(0)
-            right_para.paragraph_format.line_spacing = 1.0
-            
-            position_para = right_cell.add_paragraph()
-            position_para.alignment = WD_ALIGN_PARAGRAPH.RIGHT
-            position_run = position_para.add_run("Заступник директора з навчальної роботи")
-            position_run.font.size = Pt(8)
-            position_para.paragraph_format.space_after = Pt(0)
-            position_para.paragraph_format.line_spacing = 1.0
-            
-            initials_para = right_cell.add_paragraph()
-            initials_para.alignment = WD_ALIGN_PARAGRAPH.RIGHT
-            initials_run = initials_para.add_run("Балдич Л. В.")
-            initials_run.font.size = Pt(8)
-            initials_para.paragraph_format.space_after = Pt(0)
-            initials_para.paragraph_format.line_spacing = 1.0
-            
-            # Додаємо заголовок документа
-            title_para = doc.add_paragraph()
-            title_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
-            title_run = title_para.add_run("Зміни до розкладу занять")
-            title_run.bold = True
-            title_run.font.size = Pt(15)
-            title_para.paragraph_format.space_after = Pt(3)
-            title_para.paragraph_format.line_spacing = 1.0
-            
-            # Додаємо дату
-            date_para = doc.add_paragraph()
-            date_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
-            date_parts = date_text.split()
-            
-            # Формуємо текст дати
-            if len(date_parts) >= 2:
-                short_date = f"{date_parts[0]} {date_parts[1]}"
-            else:
-                short_date = date_text
-            
-            # Перевіряємо чи це субота
-            if self.is_saturday():
-                # Визначаємо за яким днем тижня проводяться пари
-                target_date = self._parse_date_from_text(date_text)
-                if target_date:
-                    # Парсимо базову дату
-                    base_date_str = self.base_date_var.get()
-                    if base_date_str:
-                        base_parts = base_date_str.split('.')
-                        if len(base_parts) == 3:
-                            base_date = datetime.date(int(base_parts[2]), int(base_parts[1]), int(base_parts[0]))
-                            schedule_day = self.get_saturday_schedule_day(target_date, base_date)
-                            # Форматуємо текст для суботи
-                            date_run = date_para.add_run(f"на {short_date}, суботу, за {schedule_day}\nзаняття за {week_type.lower()}")
-                        else:
-                            # Якщо не вдалося парсити базову дату, використовуємо стандартний формат
-                            date_run = date_para.add_run(f"на {short_date}, {weekday}\nнавчання за {week_type.lower()}")
-                    else:
-                        # Якщо базова дата не встановлена, використовуємо стандартний формат
-                        date_run = date_para.add_run(f"на {short_date}, {weekday}\nнавчання за {week_type.lower()}")
-                else:
-                    # Якщо не вдалося парсити дату, використовуємо стандартний формат
-                    date_run = date_para.add_run(f"на {short_date}, {weekday}\nнавчання за {week_type.lower()}")
-            else:
-                # Для звичайних днів тижня (не субота)
-                date_run = date_para.add_run(f"на {short_date}, {weekday}\nнавчання за {week_type.lower()}")
-            
-            date_run.bold = True
-            date_run.font.size = Pt(15)
-            date_para.paragraph_format.space_after = Pt(3)
-            date_para.paragraph_format.line_spacing = 1.0
+            day = self.build_replacement_day()
+            engine = DocumentEngine.from_reference(self.reference)
             
-            # Отримуємо структуру відділень
-            dept_structure = self.db.get_department_structure()
-            departments = [dept["name"] for dept in dept_structure]
-            
-            if not departments:
+            if not engine.departments:
                 messagebox.showinfo("Інформація", "Немає відділень у базі даних")
                 return
             
-            # Розподіляємо заміни по відділеннях
-            dept_replacements = {dept: [] for dept in departments}
-            
-            for replacement in self.replacements:
-                group = replacement["group"]
-                for dept, groups in self.groups.items():
-                    if group in groups:
-                        if dept in dept_replacements:
-                            dept_replacements[dept].append(replacement)
-                        break
-            
-            # Визначаємо структуру
-            general_edu_name = "Загальноосвітньої підготовки"
-            has_general_edu = any(general_edu_name in dept["name"] for dept in dept_structure)
-            
-            ordered_departments = []
-            general_edu_dept = None
-            
-            for dept_info in sorted(dept_structure, key=lambda x: x["order"]):
-                if general_edu_name in dept_info["name"]:
-                    general_edu_dept = dept_info["name"]
-                else:
-                    ordered_departments.append(dept_info["name"])
-            
-            # Розраховуємо кількість рядків для таблиці
-            total_rows = 0
-            
-            # Рядки для Загальноосвітньої підготовки
-            if has_general_edu and general_edu_dept:
-                total_rows += 1  # Заголовок
-                gen_edu_repls = dept_replacements.get(general_edu_dept, [])
-                total_rows += max(1, len(gen_edu_repls))  # Мінімум 1 порожній рядок
-            
-            # Рядки для інших відділень (по 2 в рядку)
-            num_departments = len(ordered_departments)
-            num_rows = (num_departments + 1) // 2
-            
-            for row_idx in range(num_rows):
-                total_rows += 1  # Заголовки
-                
-                # Рахуємо максимум замін в цьому рядку
-                max_repls = 0
-                for col_idx in range(2):
-                    dept_idx = row_idx * 2 + col_idx
-                    if dept_idx < num_departments:
-                        dept_name = ordered_departments[dept_idx]
-                        dept_repls = dept_replacements.get(dept_name, [])
-                        max_repls = max(max_repls, len(dept_repls))
-                
-                total_rows += max(1, max_repls)
-            
-            # Рядки для практик та чергових
-            total_rows += 5  # 2 для практик + 3 для чергових
-            
-            # Створюємо таблицю
-            main_table = doc.add_table(rows=total_rows, cols=6)
-            main_table.style = 'Table Grid'
-            main_table.autofit = False
-            main_table.allow_autofit = False
-            
-            # Встановлюємо ширину колонок
-            from docx.oxml.ns import nsdecls
-            tbl = main_table._element
-            tblPr = tbl.tblPr
-            tblW = parse_xml(f'<w:tblW {nsdecls("w")} w:w="0" w:type="auto"/>')
-            tblPr.append(tblW)
-            
-            tblGrid = tbl.tblGrid
-            if tblGrid is not None:
-                tbl.remove(tblGrid)
-            
-            col_widths = [
-                int(1.5 * 567), int(1.0 * 567), int(6.5 * 567),
-                int(1.5 * 567), int(1.0 * 567), int(6.5 * 567),
-            ]
-            
-            tblGrid_xml = '<w:tblGrid %s>' % nsdecls('w')
-            for width in col_widths:
-                tblGrid_xml += f'<w:gridCol w:w="{width}"/>'
-            tblGrid_xml += '</w:tblGrid>'
-            
-            new_tblGrid = parse_xml(tblGrid_xml)
-            tbl.insert(1, new_tblGrid)
-            
-            # Видаляємо всі межі та встановлюємо ширину
-            for row in main_table.rows:
-                for col_idx, cell in enumerate(row.cells):
-                    tc = cell._tc
-                    tcPr = tc.get_or_add_tcPr()
-                    
-                    tcBorders = tcPr.first_child_found_in("w:tcBorders")
-                    if tcBorders is not None:
-                        tcBorders.getparent().remove(tcBorders)
-                    
-                    width = col_widths[col_idx]
-                    tcW = parse_xml(f'<w:tcW {nsdecls("w")} w:w="{width}" w:type="dxa"/>')
-                    tcPr.append(tcW)
-            
-            # Функції для роботи з таблицею
-            def add_borders(cell, top=False, bottom=False, left=False, right=False):
-                tc = cell._tc
-                tcPr = tc.get_or_add_tcPr()
-                
-                borders_xml = '<w:tcBorders %s>' % nsdecls('w')
-                if top:
-                    borders_xml += '<w:top w:val="single" w:sz="4" w:space="0" w:color="000000"/>'
-                else:
-                    borders_xml += '<w:top w:val="nil"/>'
-                if bottom:
-                    borders_xml += '<w:bottom w:val="single" w:sz="4" w:space="0" w:color="000000"/>'
-                else:
-                    borders_xml += '<w:bottom w:val="nil"/>'
-                if left:
-                    borders_xml += '<w:left w:val="single" w:sz="4" w:space="0" w:color="000000"/>'
-                else:
-                    borders_xml += '<w:left w:val="nil"/>'
-                if right:
-                    borders_xml += '<w:right w:val="single" w:sz="4" w:space="0" w:color="000000"/>'
-                else:
-                    borders_xml += '<w:right w:val="nil"/>'
-                borders_xml += '</w:tcBorders>'
-                
-                tcBorders = parse_xml(borders_xml)
-                tcPr.append(tcBorders)
-            
-            def add_text_to_cell(cell, text, bold=False, gray_fill=False, align_left=False):
-                cell.text = text
-                paragraph = cell.paragraphs[0]
-                if align_left:
-                    paragraph.alignment = WD_ALIGN_PARAGRAPH.LEFT
-                else:
-                    paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
-                if paragraph.runs:
-                    run = paragraph.runs[0]
-                    if bold:
-                        run.bold = True
-                    run.font.size = Pt(11)
-                cell.vertical_alignment = WD_ALIGN_VERTICAL.CENTER
-                
-                if gray_fill:
-                    shading_elm = parse_xml(f'<w:shd {nsdecls("w")} w:fill="D3D3D3"/>')
-                    cell._tc.get_or_add_tcPr().append(shading_elm)
-            
-            # Заповнюємо таблицю
-            current_row = 0
-            
-            # Загальноосвітня підготовка
-            if has_general_edu and general_edu_dept:
-                header_cell = main_table.cell(current_row, 0)
-                for col in range(1, 6):
-                    header_cell.merge(main_table.cell(current_row, col))
-                
-                add_text_to_cell(header_cell, general_edu_dept, bold=True, gray_fill=True)
-                add_borders(header_cell, top=True, bottom=True, left=True, right=True)
-                current_row += 1
-                
-                # Заміни для Загальноосвітньої підготовки
-                gen_edu_repls = dept_replacements.get(general_edu_dept, [])
-                
-                # Групуємо за групами
-                grouped = {}
-                for repl in gen_edu_repls:
-                    group = repl["group"]
-                    if group not in grouped:
-                        grouped[group] = []
-                    grouped[group].append(repl)
-                
-                if grouped:
-                    # Розподіляємо групи по колонках (ліва та права частина)
-                    sorted_groups = sorted(grouped.keys())
-                    groups_left = []
-                    groups_right = []
-                    
-                    for idx, group_name in enumerate(sorted_groups):
-                        if idx % 2 == 0:
-                            groups_left.append(group_name)
-                        else:
-                            groups_right.append(group_name)
-                    
-                    # Розгортаємо заміни для лівої частини
-                    left_repls = []
-                    for group_name in groups_left:
-                        for idx, repl in enumerate(grouped[group_name]):
-                            left_repls.append({
-                                'group': group_name if idx == 0 else '',
-                                'lesson': repl['lesson'],
-                                'discipline': repl.get('discipline', ''),
-                                'audience': repl.get('audience', '')
-                            })
-                    
-                    # Розгортаємо заміни для правої частини
-                    right_repls = []
-                    for group_name in groups_right:
-                        for idx, repl in enumerate(grouped[group_name]):
-                            right_repls.append({
-                                'group': group_name if idx == 0 else '',
-                                'lesson': repl['lesson'],
-                                'discipline': repl.get('discipline', ''),
-                                'audience': repl.get('audience', '')
-                            })
-                    
-                    # Заповнюємо рядки
-                    max_rows = max(len(left_repls), len(right_repls))
-                    
-                    for row_idx in range(max_rows):
-                        # Ліва частина
-                        if row_idx < len(left_repls):
-                            repl = left_repls[row_idx]
-                            
-                            # Група
-                            group_cell = main_table.cell(current_row, 0)
-                            add_text_to_cell(group_cell, repl['group'])
-                            add_borders(group_cell, left=True)
-                            
-                            # Номер пари
-                            lesson_cell = main_table.cell(current_row, 1)
-                            add_text_to_cell(lesson_cell, repl['lesson'])
-                            
-                            # Предмет
-                            text_cell = main_table.cell(current_row, 2)
-                            discipline = repl['discipline']
-                            audience = repl['audience'].strip()
-                            if discipline and audience:
-                                text = f"{discipline}, ауд. {audience}"
-                            elif discipline:
-                                text = discipline
-                            elif audience:
-                                text = f"ауд. {audience}"
-                            else:
-                                text = ""
-                            add_text_to_cell(text_cell, text, align_left=True)
-                            add_borders(text_cell, right=True)
-                        else:
-                            # Порожні комірки зліва
-                            for col in range(3):
-                                cell = main_table.cell(current_row, col)
-                                add_text_to_cell(cell, "")
-                                if col == 0:
-                                    add_borders(cell, left=True)
-                                elif col == 2:
-                                    add_borders(cell, right=True)
-                        
-                        # Права частина
-                        if row_idx < len(right_repls):
-                            repl = right_repls[row_idx]
-                            
-                            # Група
-                            group_cell = main_table.cell(current_row, 3)
-                            add_text_to_cell(group_cell, repl['group'])
-                            add_borders(group_cell, left=True)
-                            
-                            # Номер пари
-                            lesson_cell = main_table.cell(current_row, 4)
-                            add_text_to_cell(lesson_cell, repl['lesson'])
-                            
-                            # Предмет
-                            text_cell = main_table.cell(current_row, 5)
-                            discipline = repl['discipline']
-                            audience = repl['audience'].strip()
-                            if discipline and audience:
-                                text = f"{discipline}, ауд. {audience}"
-                            elif discipline:
-                                text = discipline
-                            elif audience:
-                                text = f"ауд. {audience}"
-                            else:
-                                text = ""
-                            add_text_to_cell(text_cell, text, align_left=True)
-                            add_borders(text_cell, right=True)
-                        else:
-                            # Порожні комірки справа
-                            for col in range(3, 6):
-                                cell = main_table.cell(current_row, col)
-                                add_text_to_cell(cell, "")
-                                if col == 3:
-                                    add_borders(cell, left=True)
-                                elif col == 5:
-                                    add_borders(cell, right=True)
-                        
-                        current_row += 1
-                else:
-                    # Порожній рядок
-                    for col in range(6):
-                        cell = main_table.cell(current_row, col)
-                        add_text_to_cell(cell, "")
-                        borders = {}
-                        if col == 0:
-                            borders['left'] = True
-                        if col == 5:
-                            borders['right'] = True
-                        if col == 2:
-                            borders['right'] = True
-                        if col == 3:
-                            borders['left'] = True
-                        add_borders(cell, **borders)
-                    current_row += 1
-                
-                # Нижня межа
-                for col in range(6):
-                    cell = main_table.cell(current_row - 1, col)
-                    add_borders(cell, bottom=True, left=(col==0 or col==3), right=(col==2 or col==5))
-            
-            # Інші відділення
-            for row_idx in range(num_rows):
-                # Заголовки
-                for col_idx in range(2):
-                    dept_idx = row_idx * 2 + col_idx
-                    if dept_idx < num_departments:
-                        dept_name = ordered_departments[dept_idx]
-                        
-                        start_col = col_idx * 3
-                        header_cell = main_table.cell(current_row, start_col)
-                        header_cell.merge(main_table.cell(current_row, start_col + 1))
-                        header_cell.merge(main_table.cell(current_row, start_col + 2))
-                        
-                        add_text_to_cell(header_cell, dept_name, bold=True, gray_fill=True)
-                        add_borders(header_cell, top=True, bottom=True, left=True, right=True)
-                
-                current_row += 1
-                
-                # Заміни
-                max_repls = 0
-                dept_repls_list = [[], []]
-                
-                for col_idx in range(2):
-                    dept_idx = row_idx * 2 + col_idx
-                    if dept_idx < num_departments:
-                        dept_name = ordered_departments[dept_idx]
-                        repls = dept_replacements.get(dept_name, [])
-                        
-                        # Групуємо
-                        grouped = {}
-                        for repl in repls:
-                            group = repl["group"]
-                            if group not in grouped:
-                                grouped[group] = []
-                            grouped[group].append(repl)
-                        
-                        # Розгортаємо в список
-                        flat_list = []
-                        for group_name in sorted(grouped.keys()):
-                            for idx, repl in enumerate(grouped[group_name]):
-                                flat_list.append({
-                                    'group': group_name if idx == 0 else '',
-                                    'lesson': repl['lesson'],
-                                    'discipline': repl.get('discipline', ''),
-                                    'audience': repl.get('audience', '')
-                                })
-                        
-                        dept_repls_list[col_idx] = flat_list
-                        max_repls = max(max_repls, len(flat_list))
-                
-                # Заповнюємо рядки
-                for repl_idx in range(max(1, max_repls)):
-                    for col_idx in range(2):
-                        start_col = col_idx * 3
-                        
-                        if repl_idx < len(dept_repls_list[col_idx]):
-                            repl = dept_repls_list[col_idx][repl_idx]
-                            
-                            # Група
-                            group_cell = main_table.cell(current_row, start_col)
-                            add_text_to_cell(group_cell, repl['group'])
-                            add_borders(group_cell, left=True, right=True)
-                            
-                            # Номер пари
-                            lesson_cell = main_table.cell(current_row, start_col + 1)
-                            add_text_to_cell(lesson_cell, repl['lesson'])
-                            add_borders(lesson_cell, right=True)
-                            
-                            # Предмет
-                            text_cell = main_table.cell(current_row, start_col + 2)
-                            discipline = repl['discipline']
-                            audience = repl['audience'].strip()
-                            if discipline and audience:
-                                text = f"{discipline}, ауд. {audience}"
-                            elif discipline:
-                                text = discipline
-                            elif audience:
-                                text = f"ауд. {audience}"
-                            else:
-                                text = ""
-                            add_text_to_cell(text_cell, text, align_left=True)
-                            add_borders(text_cell, right=True)
-                        else:
-                            # Порожні комірки
-                            for sub_col in range(3):
-                                cell = main_table.cell(current_row, start_col + sub_col)
-                                add_text_to_cell(cell, "")
-                                if sub_col == 0:
-                                    add_borders(cell, left=True, right=True)
-                                elif sub_col == 1:
-                                    add_borders(cell, right=True)
-                                elif sub_col == 2:
-                                    add_borders(cell, right=True)
-                    
-                    current_row += 1
-                
-                # Нижня межа
-                for col in range(6):
-                    cell = main_table.cell(current_row - 1, col)
-                    add_borders(cell, bottom=True, left=(col==0 or col==3), right=(col==2 or col==5))
-            
-            # Практики
-            practice_cell1 = main_table.cell(current_row, 0)
-            practice_cell1.merge(main_table.cell(current_row, 1))
-            practice_cell1.merge(main_table.cell(current_row, 2))
-            add_text_to_cell(practice_cell1, "НАВЧАЛЬНА ПРАКТИКА", bold=True, gray_fill=True)
-            add_borders(practice_cell1, top=True, bottom=True, left=True, right=True)
-            
-            practice_cell2 = main_table.cell(current_row, 3)
-            practice_cell2.merge(main_table.cell(current_row, 4))
-            practice_cell2.merge(main_table.cell(current_row, 5))
-            add_text_to_cell(practice_cell2, "ВИРОБНИЧА ПРАКТИКА", bold=True, gray_fill=True)
-            add_borders(practice_cell2, top=True, bottom=True, left=True, right=True)
-            
-            current_row += 1
-            
-            practice_info1 = main_table.cell(current_row, 0)
-            practice_info1.merge(main_table.cell(current_row, 1))
-            practice_info1.merge(main_table.cell(current_row, 2))
-            add_text_to_cell(practice_info1, "--------")
-            add_borders(practice_info1, top=True, bottom=True, left=True, right=True)
-            
-            practice_info2 = main_table.cell(current_row, 3)
-            practice_info2.merge(main_table.cell(current_row, 4))
-            practice_info2.merge(main_table.cell(current_row, 5))
-            add_text_to_cell(practice_info2, "--------")
-            add_borders(practice_info2, top=True, bottom=True, left=True, right=True)
-            
-            current_row += 1
-            
-            # Чергові
-            duty_cell = main_table.cell(current_row, 0)
-            for col in range(1, 6):
-                duty_cell.merge(main_table.cell(current_row, col))
-            add_text_to_cell(duty_cell, f"Чергова група: {duty_group}", bold=False, align_left=True)
-            add_borders(duty_cell, top=True, bottom=True, left=True, right=True)
-            
-            current_row += 1
-            
-            teacher_cell = main_table.cell(current_row, 0)
-            for col in range(1, 6):
-                teacher_cell.merge(main_table.cell(current_row, col))
-            add_text_to_cell(teacher_cell, f"Черговий викладач: {duty_teacher}", bold=False, align_left=True)
-            add_borders(teacher_cell, top=True, bottom=True, left=True, right=True)
-            
-            current_row += 1
-            
-            dorm_cell = main_table.cell(current_row, 0)
-            for col in range(1, 6):
-                dorm_cell.merge(main_table.cell(current_row, col))
-            add_text_to_cell(dorm_cell, f"Черговий викладач у гуртожитках: {dorm_teacher}", bold=False, align_left=True)
-            add_borders(dorm_cell, top=True, bottom=True, left=True, right=True)
+            # Заміни для невідомих груп не потрапляють до бланку - повідомляємо про це
+            unknown_groups = engine.unknown_groups(day)
+            if unknown_groups:
+                print(f"Групи без відділення: {unknown_groups}")
+                if not messagebox.askyesno(
+                        "Невідомі групи",
+                        "Не вдалося визначити відділення для груп:\n"
+                        f"{', '.join(unknown_groups)}\n\n"
+                        "Заміни для цих груп не потраплять до бланку. Продовжити формування?"):
+                    return
             
-            # Формуємо назву файлу
-            date_parts = date_text.split()
-            if len(date_parts) >= 2:
-                day = date_parts[0]
-                month = date_parts[1]
-                default_filename = f"{day} {month}.docx"
-            else:
-                default_filename = f"{date_text}.docx"
+            doc = engine.build(day)
             
             # Зберігаємо файл
             if self.replacements_dir and self.academic_year:
-                month_folders = {
-                    "січня": "01-Січень", "лютого": "02-Лютий", "березня": "03-Березень",
-                    "квітня": "04-Квітень", "травня": "05-Травень", "червня": "06-Червень",
-                    "липня": "07-Липень", "серпня": "08-Серпень", "вересня": "09-Вересень",
-                    "жовтня": "10-Жовтень", "листопада": "11-Листопад", "грудня": "12-Грудень"
-                }
-                
-                if len(date_parts) >= 2:
-                    month_folder = month_folders.get(date_parts[1], "")
-                    year_dir = os.path.join(self.replacements_dir, self.academic_year)
-                    if not os.path.exists(year_dir):
-                        os.makedirs(year_dir)
-                    
-                    month_dir = os.path.join(year_dir, month_folder)
-                    if month_folder and not os.path.exists(month_dir):
-                        os.makedirs(month_dir)
-                    
-                    if month_folder:
-                        full_path = os.path.join(month_dir, default_filename)
-                    else:
-                        full_path = os.path.join(year_dir, default_filename)
-                    
-                    doc.save(full_path)
-                    messagebox.showinfo("Успіх", f"Бланк замін збережено у файл {os.path.basename(full_path)}\nШлях: {full_path}")
-                else:
-                    year_dir = os.path.join(self.replacements_dir, self.academic_year)
-                    if not os.path.exists(year_dir):
-                        os.makedirs(year_dir)
-                    
-                    full_path = os.path.join(year_dir, default_filename)
-                    doc.save(full_path)
-                    messagebox.showinfo("Успіх", f"Бланк замін збережено у файл {os.path.basename(full_path)}\nШлях: {full_path}")
+                full_path = output_path(self.replacements_dir, self.academic_year, day.date_text)
+                doc.save(full_path)
+                messagebox.showinfo("Успіх", f"Бланк замін збережено у файл {os.path.basename(full_path)}\nШлях: {full_path}")
             else:
                 filename = filedialog.asksaveasfilename(
                     defaultextension=".docx",
                     filetypes=[("Word documents", "*.docx"), ("All files", "*.*")],
-                    initialfile=default_filename
+                    initialfile=day.filename
                 )
                 
                 if filename:
@@ -1446,81 +829,3 @@ class ReplacementForm(ttk.Frame):
             messagebox.showerror("Помилка", f"Помилка при створенні документу: {str(e)}")
             import traceback
             traceback.print_exc()
-
-            # Формуємо назву файлу у форматі "день місяць"
-            # Витягуємо день і місяць з дати
-            date_parts = date_text.split()
-            if len(date_parts) >= 2:
-                day = date_parts[0]
-                month = date_parts[1]
-                default_filename = f"{day} {month}.docx"
-            else:
-                # Якщо не вдалося розібрати дату, використовуємо всю дату
-                default_filename = f"{date_text}.docx"
-            
-            # Перевіряємо, чи передано шлях для збереження
-            if self.replacements_dir and self.academic_year:
-                # Словник для перетворення назви місяця в папку
-                month_folders = {
-                    "січня": "01-Січень",
-                    "лютого": "02-Лютий",
-                    "березня": "03-Березень",
-                    "квітня": "04-Квітень",
-                    "травня": "05-Травень",
-                    "червня": "06-Червень",
-                    "липня": "07-Липень",
-                    "серпня": "08-Серпень",
-                    "вересня": "09-Вересень",
-                    "жовтня": "10-Жовтень",
-                    "листопада": "11-Листопад",
-                    "грудня": "12-Грудень"
-                }
-                
-                if len(date_parts) >= 2:
-                    month_folder = month_folders.get(date_parts[1], "")
-                    
-                    # Створюємо шлях для збереження
-                    year_dir = os.path.join(self.replacements_dir, self.academic_year)
-                    if not os.path.exists(year_dir):
-                        os.makedirs(year_dir)
-                    
-                    # Створюємо папку місяця, якщо вона не існує
-                    month_dir = os.path.join(year_dir, month_folder)
-                    if month_folder and not os.path.exists(month_dir):
-                        os.makedirs(month_dir)
-                    
-                    # Формуємо повний шлях до файлу
-                    if month_folder:
-                        full_path = os.path.join(month_dir, default_filename)
-                    else:
-                        full_path = os.path.join(year_dir, default_filename)
-                    
-                    # Зберігаємо файл без діалогу
-                    doc.save(full_path)
-                    messagebox.showinfo("Успіх", f"Бланк замін збережено у файл {os.path.basename(full_path)}\nШлях: {full_path}")
-                else:
-                    # Якщо не вдалося визначити місяць, зберігаємо в папку року
-                    year_dir = os.path.join(self.replacements_dir, self.academic_year)
-                    if not os.path.exists(year_dir):
-                        os.makedirs(year_dir)
-                    
-                    full_path = os.path.join(year_dir, default_filename)
-                    doc.save(full_path)
-                    messagebox.showinfo("Успіх", f"Бланк замін збережено у файл {os.path.basename(full_path)}\nШлях: {full_path}")
-            else:
-                # Якщо шлях не передано, використовуємо стандартний діалог збереження
-                filename = filedialog.asksaveasfilename(
-                    initialdir=os.path.expanduser("~") + "/Desktop",
-                    initialfile=default_filename,
-                    defaultextension=".docx",
-                    filetypes=[("Word Documents", "*.docx"), ("All Files", "*.*")]
-                )
-                
-                if filename:  # Якщо користувач не скасував діалог
-                    doc.save(filename)
-                    messagebox.showinfo("Успіх", f"Бланк замін збережено у файл {os.path.basename(filename)}")
-                else:
-                    messagebox.showinfo("Інформація", "Збереження файлу скасовано")
-        
-        except Exception as e:
-            messagebox.showerror("Помилка", f"Помилка при створенні документу: {e}")
@@ -0,0 +1,296 @@
+import heapq
+import re
+
+# Максимальна кількість результатів пошуку за замовчуванням
+DEFAULT_LIMIT = 50
+
+_SPACES_RE = re.compile(r"\s+")
+
+# Різні варіанти апострофа (ʼ, ’, ` тощо) зводяться до звичайного '
+_APOSTROPHES = str.maketrans({ch: "'" for ch in "\u2019\u02bc\u2018\u0060\u00b4\u02b9\u2032"})
+
+# Відповідність клавіш англійської та української розкладок (набір не в тій розкладці)
+_LATIN_KEYS = "`qwertyuiop[]asdfghjkl;'zxcvbnm,./"
+_UKRAINIAN_KEYS = "'йцукенгшщзхїфівапролджєячсмитьбю."
+_LATIN_TO_UKRAINIAN = str.maketrans(_LATIN_KEYS, _UKRAINIAN_KEYS)
+_UKRAINIAN_TO_LATIN = str.maketrans(_UKRAINIAN_KEYS[1:], _LATIN_KEYS[1:])
+
+
+def normalize(text):
+    """Нормалізація рядка для пошуку: нижній регістр, єдиний апостроф та одинарні пробіли"""
+    return _SPACES_RE.sub(" ", str(text).casefold().translate(_APOSTROPHES)).strip()
+
+
+def layout_variants(text):
+    """Запит, перетворений так, ніби його набрали в іншій розкладці клавіатури"""
+    text = str(text).casefold()
+    variants = []
+    for table in (_LATIN_TO_UKRAINIAN, _UKRAINIAN_TO_LATIN):
+        converted = normalize(text.translate(table))
+        if converted != normalize(text) and converted not in variants:
+            variants.append(converted)
+    return variants
+
+
+def max_typos(length):
+    """Допустима кількість помилок для запиту заданої довжини"""
+    if length < 4:
+        return 0
+    if length < 8:
+        return 1
+    return 2
+
+
+def substring_distance(query, text):
+    """
+    Найменша відстань редагування (Левенштейна) між query та будь-яким
+    підрядком text: запит може збігатися з частиною назви з помилками.
+    """
+    column = list(range(len(query) + 1))
+    best = column[-1]
+    for ch in text:
+        diagonal = column[0]
+        column[0] = 0  # Збіг може починатися з будь-якої позиції
+        for i in range(1, len(column)):
+            above = column[i]
+            cost = 0 if query[i - 1] == ch else 1
+            column[i] = min(above + 1, column[i - 1] + 1, diagonal + cost)
+            diagonal = above
+        if column[-1] < best:
+            best = column[-1]
+    return best
+
+
+class SearchIndex:
+    """
+    Індекс для пошуку підрядка в списку назв (викладачі, дисципліни тощо).
+
+    Назви нормалізуються один раз при побудові індексу. Для кожного підрядка
+    довжиною від 1 до ngram символів зберігається множина номерів назв, що
+    його містять. Запит, не довший за ngram, відповідає одному словнику,
+    довший - перетину множин його n-грам з перевіркою кандидатів, тож
+    повний перебір списку при кожному натисканні клавіші не потрібен.
+    """
+
+    def __init__(self, items, ngram=3):
+        self.ngram = ngram
+        self.items = []
+        self._normalized = []
+        self._postings = {}
+        self.extend(items)
+
+    def __len__(self):
+        return len(self.items)
+
+    def extend(self, items):
+        """
+        Додавання назв в кінець індексу (наприклад, чергової сторінки довідника).
+
+        Returns:
+            range: Номери доданих назв
+        """
+        first_id = len(self.items)
+        # Списки доповнюються на місці: додавання сторінки не копіює вже проіндексовані назви
+        self.items.extend(str(item) for item in items if item is not None)
+        self._normalized.extend(normalize(item) for item in self.items[first_id:])
+        for item_id, text in enumerate(self._normalized[first_id:], first_id):
+            for size in range(1, self.ngram + 1):
+                for start in range(len(text) - size + 1):
+                    self._postings.setdefault(text[start:start + size], set()).add(item_id)
+        return range(first_id, len(self.items))
+
+    def contains(self, item_id, query):
+        """Чи містить назва з номером item_id запит"""
+        return normalize(query) in self._normalized[item_id]
+
+    def _candidates(self, query):
+        if len(query) <= self.ngram:
+            return self._postings.get(query, set())
+
+        grams = {query[i:i + self.ngram] for i in range(len(query) - self.ngram + 1)}
+        postings = sorted((self._postings.get(gram, set()) for gram in grams), key=len)
+        if not postings[0]:
+            return set()
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            candidates &= posting
+            if not candidates:
+                break
+        # Наявність всіх n-грам ще не означає наявність підрядка
+        return {item_id for item_id in candidates if query in self._normalized[item_id]}
+
+    def _rank(self, item_id, query):
+        text = self._normalized[item_id]
+        position = text.find(query)
+        if position == 0:
+            kind = 0  # Назва починається з запиту
+        elif text[position - 1] in " -.'":
+            kind = 1  # Запит збігається з початком слова
+        else:
+            kind = 2
+        return (kind, position, len(text), item_id)
+
+    def matches(self, query):
+        """Номери всіх назв, що містять нормалізований запит"""
+        return self._candidates(query) if query else set()
+
+    def _exact(self, query, limit, candidates=None):
+        if candidates is None:
+            candidates = self._candidates(query)
+        key = lambda item_id: self._rank(item_id, query)
+        if limit is None:
+            return sorted(candidates, key=key)
+        return heapq.nsmallest(limit, candidates, key=key)
+
+    def fuzzy_matches(self, query, within=None):
+        """
+        Назви, що містять нормалізований запит з не більше ніж max_typos() помилками.
+
+        Args:
+            within (iterable): Перевіряти тільки ці номери назв (див. SearchSession)
+
+        Returns:
+            dict: Номер назви -> кількість помилок
+        """
+        typos = max_typos(len(query))
+        if typos == 0:
+            return {}
+
+        if within is None:
+            # Відбір кандидатів за спільними n-грамами: кожна помилка
+            # знищує не більше size n-грам запиту
+            size = 2 if len(query) < 6 else 3
+            grams = {query[i:i + size] for i in range(len(query) - size + 1)}
+            required = max(1, len(grams) - size * typos)
+            counts = {}
+            for gram in grams:
+                for item_id in self._postings.get(gram, ()):
+                    counts[item_id] = counts.get(item_id, 0) + 1
+            within = [item_id for item_id, count in counts.items() if count >= required]
+
+        matches = {}
+        for item_id in within:
+            distance = substring_distance(query, self._normalized[item_id])
+            if distance <= typos:
+                matches[item_id] = distance
+        return matches
+
+    def _fuzzy(self, query, limit, matches=None):
+        """Назви з помилками, впорядковані за кількістю помилок та довжиною"""
+        if matches is None:
+            matches = self.fuzzy_matches(query)
+        found = sorted(matches, key=lambda item_id: (matches[item_id], len(self._normalized[item_id]), item_id))
+        if limit is not None:
+            found = found[:limit]
+        return found
+
+    def search(self, query, limit=DEFAULT_LIMIT, fuzzy=True, session=None):
+        """
+        Назви, що містять запит (без урахування регістру), впорядковані за
+        релевантністю: спочатку збіг на початку назви, потім на початку слова.
+        Далі додаються збіги для запиту, набраного в іншій розкладці
+        клавіатури, а якщо нічого не знайдено - збіги з помилками.
+
+        Args:
+            query (str): Текст запиту
+            limit (int): Максимальна кількість результатів (None - без обмеження)
+            fuzzy (bool): Шукати з урахуванням помилок, якщо точних збігів немає
+            session (SearchSession): Сесія, що звужує пошук попередніми збігами
+        """
+        normalized = normalize(query)
+        if not normalized:
+            return []
+
+        exact_matches = session.exact_matches if session is not None else self.matches
+        fuzzy_matches = session.fuzzy_matches if session is not None else self.fuzzy_matches
+        variants = [normalized] + layout_variants(query)
+
+        found = []
+        seen = set()
+        for variant in variants:
+            for item_id in self._exact(variant, limit, exact_matches(variant)):
+                if item_id not in seen:
+                    seen.add(item_id)
+                    found.append(item_id)
+
+        if not found and fuzzy:
+            for variant in variants:
+                found = self._fuzzy(variant, limit, fuzzy_matches(variant))
+                if found:
+                    break
+
+        if limit is not None:
+            found = found[:limit]
+        return [self.items[item_id] for item_id in found]
+
+
+class SearchSession:
+    """
+    Послідовні запити одного поля вводу.
+
+    Для кожного варіанта запиту (сам запит та запит в іншій розкладці)
+    зберігаються номери назв, що його містять, та збіги з помилками. Якщо
+    новий варіант містить попередній (користувач дописує текст), збіги
+    шукаються тільки серед попередніх збігів, а не по всьому індексу: назва
+    не може містити довший запит, не містячи коротшого, а кількість помилок
+    для довшого запиту не менша. Збіги з помилками звужуються тільки при
+    тій самій допустимій кількості помилок.
+    """
+
+    def __init__(self, index):
+        self.index = index
+        self.reset()
+
+    def reset(self):
+        self._size = len(self.index)
+        self._exact = {}
+        self._fuzzy = {}
+        self._previous_exact = {}
+        self._previous_fuzzy = {}
+
+    def _begin(self):
+        """Новий запит: збіги попереднього запиту стають базою для звуження"""
+        if len(self.index) != self._size:
+            # До індексу додано назви - попередні збіги неповні
+            self.reset()
+        self._previous_exact, self._exact = self._exact, {}
+        self._previous_fuzzy, self._fuzzy = self._fuzzy, {}
+
+    @staticmethod
+    def _narrowest(previous, variant):
+        """Найменша множина збігів попереднього варіанта, що міститься в variant"""
+        base = None
+        for key, matches in previous.items():
+            if key and key in variant and (base is None or len(matches) < len(base)):
+                base = matches
+        return base
+
+    def exact_matches(self, variant):
+        """Номери назв, що містять нормалізований варіант запиту"""
+        if variant not in self._exact:
+            base = self._narrowest(self._previous_exact, variant)
+            if base is None:
+                self._exact[variant] = self.index.matches(variant)
+            else:
+                texts = self.index._normalized
+                self._exact[variant] = {item_id for item_id in base if variant in texts[item_id]}
+        return self._exact[variant]
+
+    def fuzzy_matches(self, variant):
+        """Збіги варіанта запиту з помилками (номер назви -> кількість помилок)"""
+        if variant not in self._fuzzy:
+            typos = max_typos(len(variant))
+            previous = {key: matches for key, (key_typos, matches) in self._previous_fuzzy.items()
+                        if key_typos == typos}
+            base = self._narrowest(previous, variant)
+            self._fuzzy[variant] = (typos, self.index.fuzzy_matches(variant, base))
+        return self._fuzzy[variant][1]
+
+    def matches(self, query):
+        """Номери всіх назв, що містять запит (без ранжування)"""
+        self._begin()
+        return self.exact_matches(normalize(query))
+
+    def search(self, query, limit=DEFAULT_LIMIT, fuzzy=True):
+        self._begin()
+        return self.index.search(query, limit, fuzzy, session=self)
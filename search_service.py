@@ -0,0 +1,135 @@
+import threading
+from db_manager import DatabaseManager, HANDBOOK_TABLES
+from search_index import SearchIndex
+
+# Довідники, для яких будуються індекси пошуку:
+# назва -> (атрибут ReferenceBundle, таблиця бази даних)
+SEARCH_ENTITIES = {
+    'teachers': ('teachers', 'teachers'),
+    'disciplines': ('disciplines', 'discpline'),
+    'groups': ('groups', 'groups'),
+    'audiences': ('audiences', 'audiences')
+}
+
+# Індекси записів довідника (форма "Довідник") зберігаються окремо від
+# індексів ReferenceBundle: їх номери відповідають порядку сторінок таблиці
+HANDBOOK_INDEX_KEY = "handbook_{}"
+
+
+class SearchService:
+    """
+    Спільні для всієї програми індекси пошуку (викладачі, дисципліни, групи,
+    аудиторії та записи форми "Довідник"). Реалізує патерн Singleton, як і
+    DatabaseManager: індекс будується один раз і використовується всіма
+    формами, а після змін у базі даних перебудовується тільки індекс
+    довідника, таблиця якого змінилася.
+    """
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __new__(cls):
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = super(SearchService, cls).__new__(cls)
+                cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if self._initialized:
+            return
+        self._initialized = True
+        self._lock = threading.RLock()
+        self._indexes = {}
+        # Список назв, з якого побудовано індекс (порівнюється за ідентичністю)
+        self._sources = {}
+        self.rebuilds = {entity: 0 for entity in SEARCH_ENTITIES}
+        DatabaseManager.add_change_listener(self.on_tables_changed)
+
+    def get_index(self, entity, items=None):
+        """
+        Індекс пошуку довідника.
+
+        Args:
+            entity (str): teachers, disciplines, groups або audiences
+            items: Готовий список назв. Той самий об'єкт списку (наприклад, з
+                   поточного ReferenceBundle) повертає індекс без перевірок, тому
+                   виклик при кожному натисканні клавіші не перебирає назви.
+                   Новий список порівнюється з проіндексованим один раз.
+                   Без items назви беруться з DatabaseManager.load_reference_bundle()
+        """
+        with self._lock:
+            index = self._indexes.get(entity)
+            if index is not None and (items is None or items is self._sources.get(entity)):
+                return index
+
+            if items is None:
+                attribute, _ = SEARCH_ENTITIES[entity]
+                items = getattr(DatabaseManager().load_reference_bundle(), attribute)
+            elif index is not None and index.items == [str(item) for item in items if item is not None]:
+                self._sources[entity] = items
+                return index
+
+            index = SearchIndex(items)
+            self._indexes[entity] = index
+            self._sources[entity] = items
+            self.rebuilds[entity] = self.rebuilds.get(entity, 0) + 1
+            print(f"Побудовано індекс пошуку {entity}: {len(index)} записів")
+            return index
+
+    def get_page_index(self, entity, rows, offset):
+        """
+        Індекс записів довідника, що завантажується сторінками.
+
+        Індекс спільний для всіх відкриттів довідника: якщо таблиця не
+        змінювалася, сторінки вже проіндексовані і повторно не обробляються.
+
+        Args:
+            entity (str): Довідник (department, groups, teachers, audiences, discipline)
+            rows (list): Всі завантажені записи (ID, назва) у порядку сторінок
+            offset (int): Номер першого запису нової сторінки в rows
+
+        Returns:
+            SearchIndex: Індекс, номери назв якого відповідають номерам записів у rows
+        """
+        key = HANDBOOK_INDEX_KEY.format(entity)
+        names = [_row_name(row) for row in rows[offset:]]
+        with self._lock:
+            index = self._indexes.get(key)
+            if index is not None and index.items[offset:offset + len(names)] == names:
+                return index
+            if index is not None and len(index) == offset:
+                index.extend(names)
+                return index
+
+            # Перше відкриття або таблиця змінилася під час завантаження
+            index = SearchIndex(_row_name(row) for row in rows)
+            self._indexes[key] = index
+            self._sources.pop(key, None)
+            self.rebuilds[key] = self.rebuilds.get(key, 0) + 1
+            return index
+
+    def invalidate(self, entity=None):
+        """Скидання індексу довідника (або всіх індексів)"""
+        with self._lock:
+            if entity is None:
+                self._indexes.clear()
+                self._sources.clear()
+            else:
+                self._indexes.pop(entity, None)
+                self._sources.pop(entity, None)
+
+    def on_tables_changed(self, tables):
+        """Обробник змін у базі даних: скидаються тільки індекси змінених таблиць"""
+        tables = set(tables)
+        for entity, (_, table) in SEARCH_ENTITIES.items():
+            if table in tables:
+                self.invalidate(entity)
+        for entity, table in HANDBOOK_TABLES.items():
+            if table in tables:
+                self.invalidate(HANDBOOK_INDEX_KEY.format(entity))
+
+
+def _row_name(row):
+    # Запис без назви залишає порожній рядок, щоб номери в індексі
+    # збігалися з номерами записів
+    return "" if row[1] is None else str(row[1])
@@ -0,0 +1,62 @@
+import datetime
+import os
+import sys
+import time
+
+# Звіт про час запуску вмикається змінною середовища або ключем командного рядка:
+#   CRISCO_STARTUP_REPORT=1 python main.py
+#   Crisco_Optimized.exe --startup-report
+STARTUP_REPORT_ENV = "CRISCO_STARTUP_REPORT"
+STARTUP_REPORT_FLAG = "--startup-report"
+STARTUP_REPORT_FILE = "startup_report.txt"
+
+
+class StartupTimer:
+    """
+    Вимірювання етапів запуску програми (імпорти, створення вікна, перше
+    відображення, завантаження даних) для порівняння холодного старту.
+    """
+
+    def __init__(self, enabled=None):
+        self.started = time.perf_counter()
+        self.marks = []
+        self.reported = False
+        if enabled is None:
+            enabled = os.environ.get(STARTUP_REPORT_ENV, "") not in ("", "0") or STARTUP_REPORT_FLAG in sys.argv
+        self.enabled = enabled
+
+    def mark(self, label):
+        """Фіксація моменту завершення етапу"""
+        self.marks.append((label, time.perf_counter() - self.started))
+
+    def elapsed(self):
+        """Час від початку запуску в секундах"""
+        return time.perf_counter() - self.started
+
+    def format_report(self):
+        lines = ["Час запуску програми:"]
+        previous = 0.0
+        for label, moment in self.marks:
+            lines.append(f"  {label:40} {moment * 1000:8.1f} мс  (+{(moment - previous) * 1000:.1f} мс)")
+            previous = moment
+        return "\n".join(lines)
+
+    def report(self):
+        """
+        Виведення звіту (один раз). У скомпільованій програмі консолі немає,
+        тому звіт також дописується у файл startup_report.txt поруч з EXE.
+        """
+        if not self.enabled or self.reported:
+            return None
+        self.reported = True
+
+        text = self.format_report()
+        print(text)
+        if getattr(sys, 'frozen', False):
+            try:
+                report_path = os.path.join(os.path.dirname(sys.executable), STARTUP_REPORT_FILE)
+                with open(report_path, "a", encoding="utf-8") as f:
+                    f.write(f"[{datetime.datetime.now().isoformat(timespec='seconds')}]\n{text}\n\n")
+            except Exception as e:
+                print(f"Не вдалося записати звіт про запуск: {e}")
+        return text
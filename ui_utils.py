@@ -0,0 +1,93 @@
+import tkinter as tk
+
+
+def sync_listbox(listbox, items):
+    """
+    Оновлення вмісту Listbox до списку items з мінімальною кількістю змін:
+    спільні початок та кінець списку залишаються, видаляються та вставляються
+    тільки рядки, що відрізняються.
+
+    Returns:
+        bool: True, якщо вміст змінився
+    """
+    items = [str(item) for item in items]
+    current = list(listbox.get(0, tk.END))
+    if current == items:
+        return False
+
+    # Спільний початок
+    start = 0
+    limit = min(len(current), len(items))
+    while start < limit and current[start] == items[start]:
+        start += 1
+
+    # Спільний кінець (не перетинається з початком)
+    end_current, end_items = len(current), len(items)
+    while end_current > start and end_items > start and current[end_current - 1] == items[end_items - 1]:
+        end_current -= 1
+        end_items -= 1
+
+    if end_current > start:
+        listbox.delete(start, end_current - 1)
+    if end_items > start:
+        listbox.insert(start, *items[start:end_items])
+    return True
+
+
+class Debouncer:
+    """
+    Об'єднання серії швидких викликів в один виклик через after().
+
+    Кожен виклик call() з тим самим ключем переносить запуск функції на
+    delay мілісекунд, тож під час швидкого набору або вставки тексту
+    функція виконується один раз - після паузи.
+    """
+
+    def __init__(self, widget, delay=150):
+        self.widget = widget
+        self.delay = delay
+        self._pending = {}
+
+    def call(self, key, func, *args, delay=None):
+        """Запланувати func(*args), скасувавши попередній запланований виклик з цим ключем"""
+        self.cancel(key)
+        delay = self.delay if delay is None else delay
+        try:
+            self._pending[key] = (self.widget.after(delay, self._fire, key), func, args)
+        except tk.TclError:
+            # Віджет вже знищено
+            pass
+
+    def cancel(self, key):
+        """Скасування запланованого виклику"""
+        pending = self._pending.pop(key, None)
+        if pending is not None:
+            try:
+                self.widget.after_cancel(pending[0])
+            except tk.TclError:
+                pass
+
+    def cancel_all(self):
+        for key in list(self._pending):
+            self.cancel(key)
+
+    def flush(self, key):
+        """Негайне виконання запланованого виклику (якщо він є)"""
+        pending = self._pending.get(key)
+        if pending is not None:
+            self.widget.after_cancel(pending[0])
+            self._fire(key)
+
+    def is_pending(self, key):
+        return key in self._pending
+
+    def _fire(self, key):
+        pending = self._pending.pop(key, None)
+        if pending is None:
+            return
+        _, func, args = pending
+        try:
+            func(*args)
+        except tk.TclError as e:
+            # Вікно закрили до виконання відкладеного виклику
+            print(f"Відкладений виклик {key} пропущено: {e}")
@@ -0,0 +1,156 @@
+import tkinter as tk
+from tkinter import ttk
+import tkinter.font as tkfont
+
+from ui_utils import sync_listbox
+
+
+class VirtualList(ttk.Frame):
+    """
+    Список, що відображає тільки видиму частину рядків.
+
+    Всі записи зберігаються в пам'яті (items), а в Listbox знаходиться лише
+    вікно з rows рядків, починаючи з offset. Прокрутка змінює тільки це
+    вікно, тому відкриття таблиці з тисячами записів не потребує тисяч
+    викликів insert. Номери в curselection() - номери записів в items,
+    як у звичайного Listbox з усіма рядками.
+    """
+
+    def __init__(self, master, rows=20, text=str, on_end=None, **listbox_options):
+        """
+        Args:
+            master: Батьківський віджет
+            rows (int): Початкова кількість видимих рядків
+            text (callable): Перетворення запису на текст рядка
+            on_end (callable): Викликається, коли видно останній запис (довантаження даних)
+            listbox_options: Параметри tk.Listbox (шрифт, кольори тощо)
+        """
+        super().__init__(master)
+        self.items = []
+        self.text = text
+        self.on_end = on_end
+        self.offset = 0
+        self.rows = max(1, rows)
+        self.selected = None
+
+        self.listbox = tk.Listbox(self, height=self.rows, exportselection=False, **listbox_options)
+        self.listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        self.scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self.yview)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        # Висота рядка Listbox: висота шрифту та рамка виділення
+        font = tkfont.Font(font=self.listbox.cget("font"))
+        self._line_height = font.metrics("linespace") + 1 + 2 * int(self.listbox.cget("selectborderwidth"))
+        self._padding = 2 * (int(self.listbox.cget("borderwidth")) + int(self.listbox.cget("highlightthickness")))
+
+        self.listbox.bind("<Configure>", self._on_resize)
+        self.listbox.bind("<<ListboxSelect>>", self._on_select)
+        self.listbox.bind("<MouseWheel>", self._on_mousewheel)
+        self.listbox.bind("<Button-4>", lambda event: self._scroll_units(-3))
+        self.listbox.bind("<Button-5>", lambda event: self._scroll_units(3))
+        self.listbox.bind("<Up>", lambda event: self._move_selection(-1))
+        self.listbox.bind("<Down>", lambda event: self._move_selection(1))
+        self.listbox.bind("<Prior>", lambda event: self._move_selection(-self.rows))
+        self.listbox.bind("<Next>", lambda event: self._move_selection(self.rows))
+        self.listbox.bind("<Home>", lambda event: self._move_selection(-len(self.items)))
+        self.listbox.bind("<End>", lambda event: self._move_selection(len(self.items)))
+
+    def set_items(self, items):
+        """Новий набір записів (прокрутка та виділення скидаються)"""
+        self.items = items
+        self.offset = 0
+        self.selected = None
+        self._render()
+
+    def refresh(self):
+        """Перемалювання після додавання записів в items (прокрутка та виділення зберігаються)"""
+        self._set_offset(self.offset)
+
+    def show_message(self, message):
+        """Службове повідомлення замість записів (наприклад, "Завантаження...")"""
+        self.items = []
+        self.offset = 0
+        self.selected = None
+        sync_listbox(self.listbox, [message])
+        self.scrollbar.set(0.0, 1.0)
+
+    def curselection(self):
+        """Номер вибраного запису в items (як у tk.Listbox)"""
+        if self.selected is None or self.selected >= len(self.items):
+            return ()
+        return (self.selected,)
+
+    def select(self, index):
+        """Виділення запису з прокруткою до нього"""
+        if not self.items:
+            return
+        self.selected = min(max(index, 0), len(self.items) - 1)
+        self.see(self.selected)
+
+    def see(self, index):
+        """Прокрутка так, щоб запис index був видимим"""
+        if index < self.offset:
+            self._set_offset(index)
+        elif index >= self.offset + self.rows:
+            self._set_offset(index - self.rows + 1)
+        else:
+            self._render()
+
+    def yview(self, *args):
+        """Команда скролбара: moveto <частка> або scroll <кількість> units|pages"""
+        if not args:
+            return
+        if args[0] == "moveto":
+            self._set_offset(round(float(args[1]) * len(self.items)))
+        elif args[0] == "scroll":
+            step = self.rows if args[2] == "pages" else 1
+            self._set_offset(self.offset + int(args[1]) * step)
+
+    def _set_offset(self, offset):
+        self.offset = min(max(offset, 0), max(len(self.items) - self.rows, 0))
+        self._render()
+
+    def _render(self):
+        """Заповнення Listbox тільки видимими записами"""
+        window = self.items[self.offset:self.offset + self.rows]
+        sync_listbox(self.listbox, [self.text(item) for item in window])
+
+        self.listbox.selection_clear(0, tk.END)
+        if self.selected is not None and self.offset <= self.selected < self.offset + len(window):
+            self.listbox.selection_set(self.selected - self.offset)
+            self.listbox.activate(self.selected - self.offset)
+
+        total = len(self.items)
+        if total <= self.rows:
+            self.scrollbar.set(0.0, 1.0)
+        else:
+            self.scrollbar.set(self.offset / total, (self.offset + len(window)) / total)
+
+        if self.on_end is not None and total and self.offset + len(window) >= total:
+            self.on_end()
+
+    def _on_resize(self, event):
+        rows = max(1, (event.height - self._padding) // self._line_height)
+        if rows != self.rows:
+            self.rows = rows
+            self._set_offset(self.offset)
+
+    def _on_select(self, event):
+        selection = self.listbox.curselection()
+        if selection:
+            self.selected = self.offset + selection[0]
+
+    def _on_mousewheel(self, event):
+        # Windows: delta кратна 120, macOS: невеликі значення
+        units = -event.delta // 120 if abs(event.delta) >= 120 else -event.delta
+        return self._scroll_units(units * 3)
+
+    def _scroll_units(self, units):
+        self._set_offset(self.offset + units)
+        return "break"
+
+    def _move_selection(self, step):
+        if self.items:
+            self.select(self.offset if self.selected is None else self.selected + step)
+        return "break"